@@ -0,0 +1,156 @@
+"""
+Microbenchmark of the extractor matching rules.
+
+Times the per-page cost of the extractors that match text (director
+fallback patterns, genre keywords, voice actor filter of character pages)
+in their old form, one uncompiled re.search / `in` scan per rule, against
+the current extractors (patterns precompiled in scraper/matchers.py), and
+checks that both give the same result on every page.
+
+The corpus is either a directory of .html files, an HTTP cache directory
+written by the scrapers (scraper/.http_cache), or by default the generated
+corpus of benchmarks/corpus.py.
+
+Usage (from the repository root):
+    python benchmarks/bench_extractors.py
+    python benchmarks/bench_extractors.py --corpus scraper/.http_cache
+"""
+import argparse
+import re
+import sys
+import time
+
+from bench_parsers import SCRAPER_DIR, add_corpus_arguments, corpus_label, load_corpus
+
+sys.path.insert(0, SCRAPER_DIR)
+
+from ghibli_scraper import GhibliScraper  # noqa: E402
+from parser_backends import DEFAULT_PARSER, make_soup  # noqa: E402
+from wiki_page import WikiPage  # noqa: E402
+
+
+# ====================================================
+# Aturan lama, disalin apa adanya sebagai pembanding
+# ====================================================
+def legacy_director(scraper, page):
+    director = page.infobox_value(['director', 'directed'], prefer_link=True)
+    if director is not None:
+        return director
+    for text in page.paragraphs[:3]:
+        match = re.search(r'directed by ([A-Z][a-zA-Z\s]+?)(?:\.|,|\sand\s)', text, re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+        match = re.search(r'(?:a |the )?film by ([A-Z][a-zA-Z\s]+?)(?:\.|,|\sand\s)', text, re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def legacy_genre_hints(scraper, page):
+    text = page.content.get_text(" ", strip=True).lower() if page.content else ""
+    default_genres = []
+    if 'adventure' in text or 'journey' in text:
+        default_genres.append('Adventure')
+    if 'fantasy' in text or 'magic' in text or 'spirit' in text:
+        default_genres.append('Fantasy')
+    if 'romance' in text or 'love' in text:
+        default_genres.append('Romance')
+    if 'war' in text or 'battle' in text:
+        default_genres.append('Drama')
+    if 'anime' not in [g.lower() for g in default_genres]:
+        default_genres.append('Animation')
+    return default_genres[:3]
+
+
+def legacy_genres(scraper, page):
+    genres = []
+    for genre_text in page.infobox_values(['genre']):
+        genres_split = re.split(r'[,/;]', genre_text)
+        genres.extend([g.strip() for g in genres_split if g.strip()])
+    if not genres:
+        for cat_text in page.categories:
+            if any(keyword in cat_text.lower() for keyword in ['adventure', 'fantasy', 'drama', 'romance', 'anime']):
+                if 'films' not in cat_text.lower() and 'movies' not in cat_text.lower():
+                    genres.append(cat_text)
+    if not genres and page.content:
+        genres = legacy_genre_hints(scraper, page)
+    return genres if genres else ['Animation', 'Fantasy']
+
+
+def legacy_character_description(scraper, page):
+    for text in page.paragraphs:
+        if len(text) < 50:
+            continue
+        if text.count('(') >= 2 and text.count(',') >= 2 and len(text) < 200:
+            continue
+        if any(keyword in text for keyword in scraper.VOICE_KEYWORDS) and len(text) < 200:
+            continue
+        return text[:600]
+    return None
+
+
+# name -> (old rule, current extractor)
+CASES = {
+    'director': (legacy_director, lambda scraper, page: scraper.extract_director(page)),
+    'genres': (legacy_genres, lambda scraper, page: scraper.extract_genres(page)),
+    'genre_hints': (legacy_genre_hints, lambda scraper, page: scraper.genre_hints(page)),
+    'character_description': (legacy_character_description,
+                              lambda scraper, page: scraper.extract_character_description(page)),
+}
+
+
+def time_case(func, scraper, soups, repeat):
+    """Seconds spent in func over every page, and its results"""
+    seconds = 0.0
+    results = []
+    for _ in range(repeat):
+        results = []
+        for soup in soups:
+            # A fresh WikiPage so cached properties are paid by every run
+            page = WikiPage(soup)
+            start = time.perf_counter()
+            results.append(func(scraper, page))
+            seconds += time.perf_counter() - start
+    return seconds, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the extractor matchers on saved pages")
+    add_corpus_arguments(parser)
+    parser.add_argument('--cases', nargs='+', default=list(CASES), choices=list(CASES),
+                        help="extractors to time (default: all)")
+    parser.add_argument('--repeat', type=int, default=20, help="run every extractor this many times per page")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus, args.films, args.seed)
+    if not pages:
+        print(f"[ERROR] no pages found in {args.corpus}")
+        return 1
+    print(f"[*] Corpus: {len(pages)} pages from {corpus_label(args)}, {args.repeat} runs each")
+
+    scraper = GhibliScraper(parser=DEFAULT_PARSER)
+    names = list(pages)
+    soups = [make_soup(pages[name], DEFAULT_PARSER) for name in names]
+
+    runs = len(soups) * args.repeat
+    mismatch = False
+    print()
+    print(f"{'extractor':<22} {'before us/page':>15} {'after us/page':>14} {'speedup':>8}")
+    for name in args.cases:
+        legacy, current = CASES[name]
+        before, expected = time_case(legacy, scraper, soups, args.repeat)
+        after, results = time_case(current, scraper, soups, args.repeat)
+        speedup = before / after if after else float('inf')
+        print(f"{name:<22} {before / runs * 1e6:>15.1f} {after / runs * 1e6:>14.1f} {speedup:>7.2f}x")
+        diffs = [name for name, a, b in zip(names, expected, results) if a != b]
+        if diffs:
+            mismatch = True
+            print(f"[!] {name}: result differs on {len(diffs)} page(s): {', '.join(diffs[:5])}")
+    if not mismatch:
+        print()
+        print("[+] Every extractor gives the same result as before")
+    return 1 if mismatch else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Parse benchmark for the HTML parser backends.
+
+Parses a corpus of saved fandom pages with every installed backend, both
+as whole pages and with targeted region parsing, reports pages/sec and peak
+RSS, and checks that every run extracts the same films.json fields as a
+full html.parser parse. Each run happens in its own process so the peak RSS
+numbers do not mix.
+
+The corpus is either a directory of .html files, an HTTP cache directory
+written by the scrapers (scraper/.http_cache), or by default the generated
+corpus of benchmarks/corpus.py.
+
+Usage (from the repository root):
+    python benchmarks/bench_parsers.py
+    python benchmarks/bench_parsers.py --corpus scraper/.http_cache
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SCRAPER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scraper')
+sys.path.insert(0, SCRAPER_DIR)
+
+from corpus import generate_corpus  # noqa: E402
+from parser_backends import DEFAULT_PARSER, PARSER_BACKENDS, available_backends  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is in KB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def load_corpus(path=None, films=12, seed=0):
+    """
+    Page name -> body of the pages in a corpus directory, or of the generated
+    corpus when path is None.
+    """
+    if path is None:
+        return generate_corpus(films=films, seed=seed)
+    objects = os.path.join(path, 'objects')
+    if os.path.isdir(objects):
+        paths = [os.path.join(objects, name) for name in os.listdir(objects) if not name.endswith('.tmp')]
+    else:
+        paths = []
+        for root, _, files in os.walk(path):
+            paths.extend(os.path.join(root, name) for name in files if name.endswith(('.html', '.htm')))
+    pages = {}
+    for page_path in sorted(paths):
+        with open(page_path, 'rb') as f:
+            pages[os.path.relpath(page_path, path)] = f.read()
+    return pages
+
+
+def add_corpus_arguments(parser):
+    """Register the corpus options shared by the parser and extractor benchmarks"""
+    parser.add_argument('--corpus', default=None,
+                        help="directory of .html files or an HTTP cache directory (default: generated corpus)")
+    parser.add_argument('--films', type=int, default=12, help="films of the generated corpus (default: 12)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the generated corpus (default: 0)")
+
+
+def corpus_label(args):
+    return args.corpus or f"the generated corpus ({args.films} films, seed {args.seed})"
+
+
+def run_backend(backend, targeted, pages, repeat):
+    """Parse the corpus with one backend (runs in a child process)"""
+    sys.path.insert(0, SCRAPER_DIR)
+    from ghibli_scraper import GhibliScraper
+    from parser_backends import make_soup
+    from wiki_page import WikiPage
+
+    scraper = GhibliScraper(parser=backend, full_parse=not targeted)
+    rss_before = peak_rss_mb()
+
+    parse_seconds = 0.0
+    extract_seconds = 0.0
+    fields = {}
+    for _ in range(repeat):
+        for name, content in pages.items():
+            start = time.perf_counter()
+            soup = make_soup(content, backend, targeted=targeted)
+            parse_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            page = WikiPage(soup)
+            # What parse_page(url, 'extract_movie_record') returns during a crawl
+            record = scraper.extract_movie_record(page)
+            extract_seconds += time.perf_counter() - start
+            fields[name] = dict(record['fields'], characters=record['character_links'])
+
+    parsed = len(pages) * repeat
+    return {
+        'backend': backend,
+        'mode': 'targeted' if targeted else 'full',
+        'pages': parsed,
+        'parse_seconds': parse_seconds,
+        'extract_seconds': extract_seconds,
+        'pages_per_sec': parsed / parse_seconds if parse_seconds else 0.0,
+        'rss_before_mb': rss_before,
+        'peak_rss_mb': peak_rss_mb(),
+        'fields': fields,
+    }
+
+
+def compare_fields(reference, other):
+    """List of (page, field) pairs where other differs from reference"""
+    diffs = []
+    for page, ref_record in reference.items():
+        record = other.get(page, {})
+        for field, value in ref_record.items():
+            if record.get(field) != value:
+                diffs.append((page, field))
+    return diffs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTML parser backends on saved pages")
+    add_corpus_arguments(parser)
+    parser.add_argument('--backends', nargs='+', default=None, choices=list(PARSER_BACKENDS),
+                        help="backends to run (default: every installed backend)")
+    parser.add_argument('--modes', nargs='+', default=['full', 'targeted'], choices=['full', 'targeted'],
+                        help="parse whole pages, only the extractor regions, or both (default: both)")
+    parser.add_argument('--repeat', type=int, default=1, help="parse the corpus this many times")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus, args.films, args.seed)
+    if not pages:
+        print(f"[ERROR] no pages found in {args.corpus}")
+        return 1
+
+    backends = args.backends or available_backends()
+    print(f"[*] Corpus: {len(pages)} pages from {corpus_label(args)}")
+
+    results = []
+    ctx = multiprocessing.get_context('spawn')
+    runs = [(DEFAULT_PARSER, False)]
+    for backend in backends:
+        for mode in args.modes:
+            if (backend, mode == 'targeted') not in runs:
+                runs.append((backend, mode == 'targeted'))
+    for backend, targeted in runs:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            results.append(pool.submit(run_backend, backend, targeted, pages, args.repeat).result())
+
+    print()
+    print(f"{'backend':<12} {'mode':<9} {'pages/sec':>10} {'parse s':>9} {'extract s':>10} {'peak RSS MB':>12}")
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.1f}" if r['peak_rss_mb'] is not None else "n/a"
+        print(f"{r['backend']:<12} {r['mode']:<9} {r['pages_per_sec']:>10.1f} {r['parse_seconds']:>9.2f} "
+              f"{r['extract_seconds']:>10.2f} {rss:>12}")
+
+    reference = results[0]
+    mismatch = False
+    print()
+    for r in results[1:]:
+        label = f"{r['backend']} ({r['mode']})"
+        diffs = compare_fields(reference['fields'], r['fields'])
+        if diffs:
+            mismatch = True
+            print(f"[!] {label}: {len(diffs)} field(s) differ from {DEFAULT_PARSER} (full)")
+            for page, field in diffs[:10]:
+                print(f"    - {page}: {field}")
+        else:
+            print(f"[+] {label}: fields identical to {DEFAULT_PARSER} (full)")
+    return 1 if mismatch else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
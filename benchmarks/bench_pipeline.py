@@ -0,0 +1,248 @@
+"""
+End-to-end offline benchmark: crawl -> JSON -> Turtle.
+
+Serves a corpus of fandom pages from a local stub server (a generated
+corpus by default, or an HTTP cache recorded by the scrapers), runs the
+films, series and shorts scrapers against it, writes their JSON outputs and
+converts them to Turtle with GhibliRDFConverter. Each stage runs in its own
+process and reports wall time, throughput, page latency percentiles
+(fetch + parse + extract) and peak RSS.
+
+Results are compared with a stored baseline (benchmarks/baseline.json) and
+a stage slower, or heavier in memory, than the tolerance allows is reported
+as a regression. Baselines depend on the machine: record one on the box the
+benchmark runs on with --save-baseline.
+
+Usage (from the repository root):
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --corpus scraper/.http_cache
+    python benchmarks/bench_pipeline.py --save-baseline
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bench_parsers import SCRAPER_DIR, peak_rss_mb
+from corpus import generate_corpus
+from stub_server import StubWiki, pages_from_cache
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Stage -> (module, class, scrape call, record keys)
+CRAWLS = {
+    'films': ('ghibli_scraper', 'GhibliScraper', lambda s: s.scrape_all(scrape_char_details=True),
+              ['movies', 'characters', 'directors']),
+    'series': ('ghibli_scraper_series', 'GhibliSeriesScraper', lambda s: s.scrape_all(), ['series', 'characters']),
+    'shorts': ('ghibli_scraper_shorts', 'GhibliShortsScraper', lambda s: s.scrape_all(), ['shorts']),
+}
+STAGES = list(CRAWLS) + ['turtle']
+
+# Result key -> True when higher is better, compared with the baseline
+COMPARED = {'seconds': False, 'throughput': True, 'p95_ms': False, 'peak_rss_mb': False}
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, int(round(q / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def timed(func, samples):
+    """func, recording the seconds of every call in samples"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+    return wrapper
+
+
+def run_crawl(stage, base_url, out_dir, concurrency, rate, verbose):
+    """Crawl the stub with one scraper and write its JSON (runs in a child process)"""
+    sys.path.insert(0, SCRAPER_DIR)
+    import importlib
+    module, cls, scrape, keys = CRAWLS[stage]
+    scraper = getattr(importlib.import_module(module), cls)(base_url=base_url, concurrency=concurrency, rate=rate)
+    samples = []
+    scraper.parse_page = timed(scraper.parse_page, samples)
+    scraper.get_soup = timed(scraper.get_soup, samples)
+
+    output = os.path.join(out_dir, f"{stage}.json")
+    with contextlib.redirect_stdout(sys.stdout if verbose else open(os.devnull, 'w')):
+        start = time.perf_counter()
+        data = scrape(scraper)
+        crawl_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        scraper.save_to_json(output)
+        json_seconds = time.perf_counter() - start
+
+    pages = scraper.metrics.counter('http_responses_total')
+    seconds = crawl_seconds + json_seconds
+    return {
+        'stage': stage,
+        'seconds': seconds,
+        'crawl_seconds': crawl_seconds,
+        'json_seconds': json_seconds,
+        'pages': pages,
+        'records': sum(len(data.get(key, [])) for key in keys),
+        'throughput': pages / seconds if seconds else 0.0,
+        'unit': 'pages/s',
+        'p50_ms': percentile(samples, 50) * 1000 if samples else None,
+        'p95_ms': percentile(samples, 95) * 1000 if samples else None,
+        'p99_ms': percentile(samples, 99) * 1000 if samples else None,
+        'bytes_downloaded': scraper.metrics.counter('fetch_bytes_total'),
+        'output_bytes': os.path.getsize(output),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def run_turtle(out_dir, verbose):
+    """Convert the JSON outputs to Turtle (runs in a child process)"""
+    sys.path.insert(0, SCRAPER_DIR)
+    from json_to_rdf import GhibliRDFConverter
+
+    output = os.path.join(out_dir, 'ghibli-dataset.ttl')
+    with contextlib.redirect_stdout(sys.stdout if verbose else open(os.devnull, 'w')):
+        start = time.perf_counter()
+        converter = GhibliRDFConverter(
+            films_json=os.path.join(out_dir, 'films.json'),
+            series_json=os.path.join(out_dir, 'series.json'),
+            shorts_json=os.path.join(out_dir, 'shorts.json'),
+        )
+        converter.convert_all(output)
+        seconds = time.perf_counter() - start
+
+    with open(output, 'r', encoding='utf-8') as f:
+        statements = sum(1 for line in f if line.rstrip().endswith(('.', ';')))
+    return {
+        'stage': 'turtle',
+        'seconds': seconds,
+        'records': statements,
+        'throughput': statements / seconds if seconds else 0.0,
+        'unit': 'stmts/s',
+        'p50_ms': None,
+        'p95_ms': None,
+        'p99_ms': None,
+        'output_bytes': os.path.getsize(output),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regression messages of results against a baseline run"""
+    messages = []
+    previous = {r['stage']: r for r in baseline.get('results', [])}
+    for r in results:
+        base = previous.get(r['stage'])
+        if not base:
+            continue
+        if base.get('records') != r.get('records'):
+            messages.append(f"{r['stage']}: {r['records']} records, baseline had {base.get('records')}")
+        for key, higher_is_better in COMPARED.items():
+            old, new = base.get(key), r.get(key)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            if worse > tolerance:
+                messages.append(f"{r['stage']}: {key} {old:.2f} -> {new:.2f} ({change:+.0%})")
+    return messages
+
+
+def fmt(value, spec):
+    return format(value, spec) if value is not None else "n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline crawl -> JSON -> Turtle benchmark against a stub wiki")
+    parser.add_argument('--corpus', default=None,
+                        help="HTTP cache directory recorded by the scrapers (default: generated corpus)")
+    parser.add_argument('--films', type=int, default=12, help="films of the generated corpus (default: 12)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the generated corpus (default: 0)")
+    parser.add_argument('--latency', type=float, default=0.01,
+                        help="seconds the stub waits before every response (default: 0.01)")
+    parser.add_argument('--concurrency', type=int, default=4, help="scraper concurrency (default: 4)")
+    parser.add_argument('--rate', type=float, default=1000.0, help="scraper rate limit, req/s (default: 1000)")
+    parser.add_argument('--stages', nargs='+', default=STAGES, choices=STAGES, help="stages to run (default: all)")
+    parser.add_argument('--baseline', default=BASELINE, help="baseline file (default: benchmarks/baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown/growth against the baseline (default: 0.25)")
+    parser.add_argument('--verbose', action='store_true', help="show the scrapers' output")
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = pages_from_cache(args.corpus)
+        corpus = {'source': os.path.abspath(args.corpus), 'pages': len(pages)}
+    else:
+        pages = generate_corpus(films=args.films, seed=args.seed)
+        corpus = {'source': 'generated', 'films': args.films, 'seed': args.seed, 'pages': len(pages)}
+    if not pages:
+        print(f"[ERROR] no pages found in {args.corpus}")
+        return 1
+
+    stub = StubWiki(pages, latency=args.latency)
+    base_url = stub.start()
+    print(f"[*] Corpus: {len(pages)} pages ({corpus['source']}), stub at {base_url}, latency {args.latency}s")
+
+    results = []
+    ctx = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as out_dir:
+        for stage in args.stages:
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                if stage == 'turtle':
+                    future = pool.submit(run_turtle, out_dir, args.verbose)
+                else:
+                    future = pool.submit(run_crawl, stage, base_url, out_dir, args.concurrency, args.rate,
+                                         args.verbose)
+                results.append(future.result())
+    stub.stop()
+
+    print()
+    print(f"{'stage':<8} {'seconds':>8} {'throughput':>18} {'records':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'peak RSS MB':>12}")
+    for r in results:
+        rss = fmt(r['peak_rss_mb'], '.1f')
+        print(f"{r['stage']:<8} {r['seconds']:>8.2f} {r['throughput']:>10.1f} {r['unit']:<7} {r['records']:>8} "
+              f"{fmt(r['p50_ms'], '.1f'):>8} {fmt(r['p95_ms'], '.1f'):>8} {fmt(r['p99_ms'], '.1f'):>8} {rss:>12}")
+
+    run = {
+        'corpus': corpus,
+        'settings': {'latency': args.latency, 'concurrency': args.concurrency, 'rate': args.rate},
+        'results': results,
+    }
+    print()
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"[+] Saved baseline => {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("[i] No baseline yet, store one with --save-baseline")
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('corpus') != corpus or baseline.get('settings') != run['settings']:
+        print("[!] Baseline was recorded with another corpus or settings, not comparing")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for message in regressions:
+        print(f"[!] Regression: {message}")
+    if not regressions:
+        print(f"[+] No regression against the baseline (tolerance {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
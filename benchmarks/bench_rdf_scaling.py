@@ -0,0 +1,203 @@
+"""
+Scaling benchmark of the JSON -> Turtle conversion.
+
+Generates synthetic films/series/shorts JSON at several multiples of the
+real dataset (see synthetic_dataset.py), runs GhibliRDFConverter.convert_all
+on each size in its own process and reports load time, conversion time,
+peak RSS and input/output sizes against the number of records. Times and
+memory are plotted against size to a PNG when matplotlib is installed, as a
+text chart otherwise. With --stream the converter reads the records from
+disk instead of loading the JSON files, "load" is then its index pass.
+
+A size that takes longer than --timeout is stopped and reported as such,
+the larger sizes are there to show where the converter stops scaling.
+
+Usage (from the repository root):
+    python benchmarks/bench_rdf_scaling.py
+    python benchmarks/bench_rdf_scaling.py --scales 1 10 100 --plot scaling.png --json scaling.json
+    python benchmarks/bench_rdf_scaling.py --stream
+    python benchmarks/bench_rdf_scaling.py --format ntriples --workers 4
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bench_parsers import SCRAPER_DIR, peak_rss_mb
+from synthetic_dataset import DATA_DIR, generate_dataset, load_templates, write_dataset
+
+try:
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+except ImportError:
+    plt = None
+
+DEFAULT_SCALES = [1, 10, 100, 1000]
+
+
+def make_dataset(scale, out_dir, data_dir, seed):
+    """Write the synthetic dataset of one scale (runs in a child process), returns its record counts"""
+    films, series, shorts = generate_dataset(scale, load_templates(data_dir), seed=seed)
+    write_dataset(out_dir, films, series, shorts)
+    return {
+        'movies': len(films['movies']),
+        'characters': len(films['characters']) + len(series['characters']),
+        'directors': len(films['directors']),
+        'series': len(series['series']),
+        'shorts': len(shorts['shorts']),
+    }
+
+
+def run_convert(in_dir, stream, fmt, workers, results):
+    """Load and convert one dataset (runs in a child process), puts the timings on results"""
+    sys.path.insert(0, SCRAPER_DIR)
+    from json_to_rdf import FORMATS, GhibliRDFConverter
+
+    output = os.path.join(in_dir, 'ghibli-dataset' + FORMATS[fmt][1])
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        start = time.perf_counter()
+        converter = GhibliRDFConverter(
+            films_json=os.path.join(in_dir, 'films.json'),
+            series_json=os.path.join(in_dir, 'series.json'),
+            shorts_json=os.path.join(in_dir, 'shorts.json'),
+            stream=stream,
+        )
+        load_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        converter.convert_all(output, format=fmt, workers=workers)
+        convert_seconds = time.perf_counter() - start
+
+    results.put({
+        'load_seconds': load_seconds,
+        'convert_seconds': convert_seconds,
+        'output_bytes': os.path.getsize(output),
+        'peak_rss_mb': peak_rss_mb(),
+    })
+
+
+def measure(scale, args, ctx):
+    """Result row of one scale"""
+    row = {'scale': scale, 'status': 'ok'}
+    with tempfile.TemporaryDirectory() as work_dir:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            row['records'] = pool.submit(make_dataset, scale, work_dir, args.data, args.seed).result()
+        row['total_records'] = sum(row['records'].values())
+        row['input_bytes'] = sum(os.path.getsize(os.path.join(work_dir, f"{name}.json"))
+                                 for name in ('films', 'series', 'shorts'))
+
+        results = ctx.Queue()
+        process = ctx.Process(target=run_convert, args=(work_dir, args.stream, args.format, args.workers, results))
+        start = time.perf_counter()
+        process.start()
+        try:
+            row.update(results.get(timeout=args.timeout))
+        except queue.Empty:
+            row['status'] = 'timeout' if process.is_alive() else f"failed (exit {process.exitcode})"
+        row['wall_seconds'] = time.perf_counter() - start
+        if process.is_alive():
+            process.terminate()
+        process.join()
+    return row
+
+
+def text_chart(rows, key, label, width=50):
+    """Horizontal bar chart of one column against the number of records"""
+    done = [r for r in rows if r.get(key) is not None]
+    if not done:
+        return
+    top = max(r[key] for r in done) or 1
+    print(f"\n{label}")
+    for r in rows:
+        value = r.get(key)
+        bar = '#' * max(1, int(round(value / top * width))) if value is not None else ''
+        shown = f"{value:.2f}" if value is not None else r['status']
+        print(f"  {r['total_records']:>9} records |{bar:<{width}}| {shown}")
+
+
+def plot(rows, path, stream=False):
+    done = [r for r in rows if r['status'] == 'ok']
+    records = [r['total_records'] for r in done]
+    fig, (left, right) = plt.subplots(1, 2, figsize=(11, 4))
+    left.plot(records, [r['load_seconds'] for r in done], marker='o', label='load JSON')
+    left.plot(records, [r['convert_seconds'] for r in done], marker='o', label='convert_all')
+    left.set_ylabel('seconds')
+    left.legend()
+    right.plot(records, [r['peak_rss_mb'] for r in done], marker='o', color='tab:red')
+    right.set_ylabel('peak RSS (MB)')
+    for axis in (left, right):
+        axis.set_xscale('log')
+        axis.set_yscale('log')
+        axis.set_xlabel('records')
+        axis.grid(True, which='both', alpha=0.3)
+    fig.suptitle('JSON -> Turtle scaling' + (' (streaming input)' if stream else ''))
+    fig.tight_layout()
+    fig.savefig(path)
+    print(f"[+] Plot saved => {path}")
+
+
+def fmt(value, spec):
+    return format(value, spec) if value is not None else "n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON -> Turtle conversion time and memory against dataset size")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help="multiples of the real dataset to run (default: 1 10 100 1000)")
+    parser.add_argument('--data', default=DATA_DIR, help="directory of the real JSON files (default: data/)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the synthetic data (default: 0)")
+    parser.add_argument('--timeout', type=float, default=600.0,
+                        help="seconds one size may take before it is stopped (default: 600)")
+    parser.add_argument('--stream', action='store_true',
+                        help="convert with the streaming input path instead of loading the JSON files")
+    parser.add_argument('--format', default='turtle', choices=['turtle', 'ntriples', 'nquads', 'thrift'],
+                        help="RDF output format (default: turtle)")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="serializer processes of convert_all, 0 serializes in-process (default: 0)")
+    parser.add_argument('--plot', default='rdf_scaling.png',
+                        help="PNG to plot to when matplotlib is installed (default: rdf_scaling.png)")
+    parser.add_argument('--json', default=None, help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context('spawn')
+    rows = []
+    for scale in sorted(args.scales):
+        print(f"[*] {scale}x ...")
+        row = measure(scale, args, ctx)
+        rows.append(row)
+        if row['status'] != 'ok':
+            print(f"[!] {scale}x: {row['status']} after {row['wall_seconds']:.0f}s")
+
+    print()
+    print(f"{'scale':>6} {'records':>9} {'JSON MB':>8} {'out MB':>8} {'load s':>8} {'convert s':>10} "
+          f"{'recs/s':>9} {'peak RSS MB':>12}  status")
+    for r in rows:
+        ttl = r['output_bytes'] / 1e6 if 'output_bytes' in r else None
+        rate = r['total_records'] / r['convert_seconds'] if r.get('convert_seconds') else None
+        print(f"{r['scale']:>5}x {r['total_records']:>9} {r['input_bytes'] / 1e6:>8.1f} {fmt(ttl, '.1f'):>8} "
+              f"{fmt(r.get('load_seconds'), '.2f'):>8} {fmt(r.get('convert_seconds'), '.2f'):>10} "
+              f"{fmt(rate, '.0f'):>9} {fmt(r.get('peak_rss_mb'), '.1f'):>12}  {r['status']}")
+
+    if plt is not None:
+        plot(rows, args.plot, args.stream)
+    else:
+        print("\n[i] matplotlib not installed, text charts instead")
+        text_chart(rows, 'convert_seconds', 'convert_all seconds')
+        text_chart(rows, 'peak_rss_mb', 'peak RSS MB')
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'seed': args.seed, 'timeout': args.timeout, 'stream': args.stream, 'format': args.format,
+                       'workers': args.workers, 'results': rows}, f, indent=2)
+        print(f"[+] Results saved => {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+Synthetic fandom wiki corpus for the offline benchmarks.
+
+Builds deterministic pages with the same markup the scrapers read on
+ghibli.fandom.com: category pages, film/series/short articles with a
+portable infobox, Plot and Characters sections, character and director
+pages, the category bar, and the navigation/script chrome around the article
+that targeted parsing skips. The same seed always gives the same bytes.
+"""
+import random
+
+WORDS = (
+    "the a of and in to with his her their young girl boy spirit forest castle sky town river sea "
+    "wind journey magic war love family friend village witch dragon train bathhouse airship island "
+    "mountain moving flying secret ancient princess pilot baker cat soot spirits gods machine garden "
+    "summer winter night morning storm memory dream letter voice heart small great old new hidden"
+).split()
+FIRST_NAMES = (
+    "Sora Haru Mei Satsuki Kiki Sheeta Pazu Chihiro Haku Sophie Howl Nausicaa Ashitaka San Porco Fio "
+    "Arrietty Sho Ponyo Sosuke Marnie Anna Jiro Nahoko Umi Shun Taeko Seita Setsuko Shizuku Seiji Ged"
+).split()
+LAST_NAMES = (
+    "Kusakabe Tanaka Ogino Hatter Okino Kurokawa Yamada Tsukishima Amasawa Horikoshi Matsuzaki Kazama "
+    "Sasaki Mori Aoki Hayashi Kobayashi Inoue Kimura Shimizu Yamamoto Nakamura Fujimoto Ishikawa"
+).split()
+GENRES = ['Fantasy', 'Adventure', 'Drama', 'Romance', 'Comedy', 'Science fiction']
+VOICE_LINE = "{} (Japanese), {} (English), {} (Disney)"
+
+
+def slug(title):
+    return title.replace(' ', '_')
+
+
+def sentence(rng, words=12):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def paragraph(rng, sentences=5):
+    return " ".join(sentence(rng, rng.randint(8, 18)) for _ in range(sentences))
+
+
+def person(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def chrome(rng, kb):
+    """Navigation, scripts and footer of about kb kilobytes, outside the article"""
+    nav = "".join(f'<li><a href="/wiki/{slug(sentence(rng, 2)[:-1])}">{sentence(rng, 2)}</a></li>' for _ in range(40))
+    script = "var wgConfig = " + "{" + ",".join(f'"k{i}": "{sentence(rng, 4)}"' for i in range(20)) + "};"
+    block = f'<nav class="global-navigation"><ul>{nav}</ul></nav><script>{script}</script>'
+    repeat = max(1, kb * 1024 // len(block))
+    return block * repeat
+
+
+def infobox(title, items, image):
+    rows = "".join(
+        f'<div class="pi-item pi-data pi-item-spacing pi-border-color"><h3 class="pi-data-label pi-secondary-font">'
+        f'{label}</h3><div class="pi-data-value pi-font">{value}</div></div>'
+        for label, value in items
+    )
+    figure = (f'<figure class="pi-item pi-image"><a href="{image}" class="image image-thumbnail">'
+              f'<img src="{image}" alt="{title}" class="pi-image-thumbnail"/></a></figure>')
+    return (f'<aside class="portable-infobox pi-background pi-theme-wikia pi-layout-default">'
+            f'<h2 class="pi-item pi-item-spacing pi-title">{title}</h2>{figure}{rows}</aside>')
+
+
+def section(heading, body):
+    return f'<h2><span class="mw-headline" id="{slug(heading)}">{heading}</span></h2>{body}'
+
+
+def article(rng, title, body, categories=(), chrome_kb=40):
+    """A whole fandom page around the article body"""
+    cats = "".join(f'<li><a href="/wiki/Category:{slug(c)}">{c}</a></li>' for c in categories)
+    return (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title} | Ghibli Wiki | Fandom</title>'
+        f'</head><body>{chrome(rng, chrome_kb // 2)}<main class="page__main">'
+        f'<h1 class="page-header__title">{title}</h1>'
+        f'<div id="content"><div class="mw-parser-output">{body}</div></div>'
+        f'<div class="page-footer"><div id="mw-normal-catlinks"><ul>{cats}</ul></div></div>'
+        f'</main>{chrome(rng, chrome_kb // 2)}</body></html>'
+    ).encode('utf-8')
+
+
+def category_page(title, links):
+    members = "".join(
+        f'<li class="category-page__member"><a href="/wiki/{slug(t)}" class="category-page__member-link" '
+        f'title="{t}">{t}</a></li>' for t in links
+    )
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>'
+            f'<h1>Category:{title}</h1><ul class="category-page__members">{members}</ul></body></html>').encode('utf-8')
+
+
+def character_list(rng, names, style):
+    """Characters section in one of the layouts the wiki uses"""
+    if style == 'dl':
+        return "<dl>" + "".join(
+            f'<dt><a href="/wiki/{slug(n)}">{n}</a></dt><dd>{sentence(rng)}</dd>' for n in names) + "</dl>"
+    if style == 'table':
+        return '<table class="wikitable">' + "".join(
+            f'<tr><td><a href="/wiki/{slug(n)}">{n}</a></td><td>{person(rng)}</td></tr>' for n in names) + "</table>"
+    return "<ul>" + "".join(f'<li><a href="/wiki/{slug(n)}">{n}</a> - {sentence(rng, 6)}</li>' for n in names) + "</ul>"
+
+
+def generate_corpus(films=12, characters=8, series=3, shorts=4, directors=4, seed=0, chrome_kb=40):
+    """
+    Path -> page bytes of a complete synthetic wiki.
+
+    Args:
+        films: Film articles listed in Category:Films
+        characters: Characters linked from each film or series, about a
+            fifth of them shared with another title
+        series: Television series articles
+        shorts: Short film articles
+        directors: Director pages the films and series point to
+        seed: Random seed, the same arguments always give the same corpus
+        chrome_kb: Approximate size of the page chrome around every article
+    """
+    rng = random.Random(seed)
+    pages = {}
+    director_names = []
+    while len(director_names) < directors:
+        name = person(rng)
+        if name not in director_names:
+            director_names.append(name)
+
+    used = set()
+
+    def new_title(suffix):
+        while True:
+            title = f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {suffix}".strip()
+            if title not in used:
+                used.add(title)
+                return title
+
+    character_names = []
+
+    def cast(count):
+        names = []
+        for _ in range(count):
+            if character_names and rng.random() < 0.2:
+                name = rng.choice(character_names)
+            else:
+                name = new_title('')
+                character_names.append(name)
+            if name not in names:
+                names.append(name)
+        return names
+
+    def entity_page(title, kind, items, cast_names, extra_sections=()):
+        director = rng.choice(director_names)
+        year = rng.randint(1984, 2023)
+        lead = (f"<p><i><b>{title}</b></i> is a {year} Japanese animated {rng.choice(GENRES).lower()} {kind} "
+                f'directed by <a href="/wiki/{slug(director)}">{director}</a>. {paragraph(rng, 3)}</p>')
+        body = infobox(title, [('Directed by', f'<a href="/wiki/{slug(director)}">{director}</a>')] + items,
+                       f"https://static.wikia.nocookie.net/ghibli/images/{slug(title)}.jpg")
+        body += lead + f"<p>{paragraph(rng)}</p>"
+        body += section('Plot', "".join(f"<p>{paragraph(rng, 6)}</p>" for _ in range(rng.randint(2, 5))))
+        if cast_names:
+            body += section('Characters', character_list(rng, cast_names, rng.choice(['dl', 'ul', 'table'])))
+        for heading in extra_sections:
+            body += section(heading, f"<p>{paragraph(rng)}</p>")
+        return body, year
+
+    film_titles = [new_title('') for _ in range(films)]
+    for title in film_titles:
+        items = [('Release date(s)', f"July {rng.randint(1, 28)}, {rng.randint(1984, 2023)}"),
+                 ('Running time', f"{rng.randint(80, 140)} minutes")]
+        if rng.random() < 0.5:
+            items.append(('Genre', ", ".join(rng.sample(GENRES, 2))))
+        body, _ = entity_page(title, 'film', items, cast(characters), ['Production', 'Trivia'])
+        pages[f"/wiki/{slug(title)}"] = article(rng, title, body, [f"{rng.choice(GENRES)} films", 'Films'],
+                                                chrome_kb)
+
+    series_titles = [new_title('Series') for _ in range(series)]
+    for title in series_titles:
+        items = [('Episodes', str(rng.randint(12, 52))),
+                 ('Original run', f"October {rng.randint(1984, 2023)}"),
+                 ('Running time', f"{rng.randint(20, 30)} minutes"),
+                 ('Studio', 'Studio Ghibli')]
+        body, _ = entity_page(title, 'television series', items, cast(characters), ['Episodes'])
+        pages[f"/wiki/{slug(title)}"] = article(rng, title, body, ['Television series'], chrome_kb)
+
+    short_titles = [new_title('Short') for _ in range(shorts)]
+    for title in short_titles:
+        items = [('Release date', f"March {rng.randint(1, 28)}, {rng.randint(1984, 2023)}"),
+                 ('Running time', f"{rng.randint(5, 16)} minutes"),
+                 ('Studio', 'Studio Ghibli')]
+        body, _ = entity_page(title, 'short film', items, [])
+        pages[f"/wiki/{slug(title)}"] = article(rng, title, body, ['Short films'], chrome_kb)
+
+    for name in character_names:
+        body = infobox(name, [('Age', str(rng.randint(4, 80))), ('Gender', rng.choice(['Female', 'Male']))],
+                       f"https://static.wikia.nocookie.net/ghibli/images/{slug(name)}.png")
+        body += f"<p>{VOICE_LINE.format(person(rng), person(rng), person(rng))}</p>"
+        body += "".join(f"<p>{name} is {paragraph(rng, 4)}</p>" for _ in range(rng.randint(1, 3)))
+        body += section('Appearance', f"<p>{paragraph(rng)}</p>")
+        body += section('Personality', f"<p>{paragraph(rng)}</p>")
+        pages[f"/wiki/{slug(name)}"] = article(rng, name, body, ['Characters'], chrome_kb)
+
+    for name in director_names:
+        body = infobox(name, [('Born', f"January {rng.randint(1, 28)}, {rng.randint(1935, 1980)}"),
+                              ('Nationality', 'Japanese')],
+                       f"https://static.wikia.nocookie.net/ghibli/images/{slug(name)}.jpg")
+        body += f"<p><b>{name}</b> is a Japanese animator and director. {paragraph(rng, 4)}</p>"
+        body += section('History', "".join(f"<p>{paragraph(rng, 5)}</p>" for _ in range(4)))
+        pages[f"/wiki/{slug(name)}"] = article(rng, name, body, ['Directors'], chrome_kb)
+
+    pages["/wiki/Category:Films"] = category_page('Films', film_titles)
+    pages["/wiki/Category:Television_series"] = category_page('Television series', series_titles)
+    pages["/wiki/Category:Short_films"] = category_page('Short films', short_titles)
+    overview = f"<p>{paragraph(rng)}</p>"
+    overview += "<h2>Television series</h2><ul>" + "".join(
+        f'<li><a href="/wiki/{slug(t)}">{t}</a></li>' for t in series_titles) + "</ul>"
+    overview += "<h2>Short films</h2><ul>" + "".join(
+        f'<li><a href="/wiki/{slug(t)}">{t}</a></li>' for t in short_titles) + "</ul>"
+    pages["/wiki/Studio_Ghibli"] = article(rng, 'Studio Ghibli', overview, ['Studios'], chrome_kb)
+    return pages
@@ -0,0 +1,99 @@
+"""
+Local stub of the fandom wiki for the offline benchmarks.
+
+Serves a dict of path -> page bytes over HTTP/1.1 keep-alive, with an
+optional per-request latency to imitate the network. Pages come from
+corpus.generate_corpus() or from an HTTP cache recorded by the scrapers
+(scraper/.http_cache), see pages_from_cache().
+"""
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+class StubWikiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes, without this every response
+    # waits for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        stub = self.server.stub
+        if stub.latency:
+            time.sleep(stub.latency)
+        body = stub.pages.get(self.path)
+        stub.count(self.path, body)
+        if body is None:
+            body = b"Not found"
+            self.send_response(404)
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubWiki:
+    """HTTP server for a page dict, run in a background thread"""
+
+    def __init__(self, pages, latency=0.0, port=0):
+        """
+        Args:
+            pages: Path (with query string, if any) -> page bytes
+            latency: Seconds every response is delayed
+            port: Port to listen on, 0 for any free port
+        """
+        self.pages = pages
+        self.latency = latency
+        self.port = port
+        self.hits = 0
+        self.missing = 0
+        self.bytes_served = 0
+        self.lock = threading.Lock()
+        self.server = None
+
+    def count(self, path, body):
+        with self.lock:
+            self.hits += 1
+            if body is None:
+                self.missing += 1
+            else:
+                self.bytes_served += len(body)
+
+    def start(self):
+        """Start serving, returns the base URL to give the scrapers"""
+        self.server = ThreadingHTTPServer(("127.0.0.1", self.port), StubWikiHandler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def pages_from_cache(cache_dir):
+    """Path -> body of every page in an HTTP cache directory written by the scrapers"""
+    pages = {}
+    meta_dir = os.path.join(cache_dir, 'meta')
+    for name in sorted(os.listdir(meta_dir)):
+        try:
+            with open(os.path.join(meta_dir, name), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(os.path.join(cache_dir, 'objects', meta['body']), 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError, KeyError):
+            continue
+        parts = urlsplit(meta['url'])
+        pages[parts.path + ('?' + parts.query if parts.query else '')] = body
+    return pages
@@ -0,0 +1,176 @@
+"""
+Synthetic films.json / series.json / shorts.json at N times the real size.
+
+Every record is cloned from a record of the real dataset in data/ (same
+fields, same text lengths), with numbered titles and names, so the output
+has the exact schema the scrapers write. Cross references stay consistent:
+movies point to cloned directors, directors' notable_works list the movies
+they direct, characters' appears_in and the per-movie character lists agree,
+a few characters appear in a second movie and a few series characters share
+their name with a film character, as on the wiki.
+
+Usage (from the repository root):
+    python benchmarks/synthetic_dataset.py --scale 100 --out /tmp/ghibli-100x
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+WIKI = "https://ghibli.fandom.com/wiki/"
+
+# Share of film characters that also appear in a second movie, and of series
+# characters named like a film character
+CAMEO_RATE = 0.05
+SHARED_NAME_RATE = 0.1
+
+
+def load_templates(data_dir=DATA_DIR):
+    """The real films, series and shorts data the clones are made from"""
+    templates = {}
+    for name in ('films', 'series', 'shorts'):
+        with open(os.path.join(data_dir, f"{name}.json"), 'r', encoding='utf-8') as f:
+            templates[name] = json.load(f)
+    return templates
+
+
+def numbered(text, copy_no):
+    """Name of the copy_no-th clone, copy 0 keeps the original"""
+    return text if copy_no == 0 else f"{text} {copy_no + 1}"
+
+
+def wiki_url(title):
+    return WIKI + title.replace(' ', '_')
+
+
+def generate_dataset(scale, templates=None, seed=0):
+    """
+    (films, series, shorts) dicts with `scale` times the records of the templates.
+
+    Args:
+        scale: Copies of every template record
+        templates: load_templates() output, the real data by default
+        seed: Random seed of the cameo and shared-name choices
+    """
+    templates = templates or load_templates()
+    rng = random.Random(seed)
+    films_t, series_t, shorts_t = templates['films'], templates['series'], templates['shorts']
+
+    # Directors: copy k of a director directs copy k of its movies
+    directors = []
+    for k in range(scale):
+        for director in films_t['directors']:
+            clone = copy.deepcopy(director)
+            clone['name'] = numbered(director['name'], k)
+            clone['url'] = wiki_url(clone['name'])
+            clone['notable_works'] = []
+            directors.append(clone)
+    directors_by_name = {d['name']: d for d in directors}
+
+    movies = []
+    for k in range(scale):
+        for movie in films_t['movies']:
+            clone = {key: copy.deepcopy(value) for key, value in movie.items() if key != 'characters'}
+            clone['title'] = numbered(movie['title'], k)
+            clone['url'] = wiki_url(clone['title'])
+            if movie.get('director'):
+                clone['director'] = numbered(movie['director'], k)
+                if clone['director'] in directors_by_name:
+                    directors_by_name[clone['director']]['notable_works'].append(clone['title'])
+            clone['characters'] = []
+            movies.append(clone)
+    movies_by_title = {m['title']: m for m in movies}
+
+    characters = []
+    for k in range(scale):
+        for char in films_t['characters']:
+            clone = copy.deepcopy(char)
+            clone['name'] = numbered(char['name'], k)
+            clone['url'] = wiki_url(clone['name'])
+            clone['appears_in'] = [numbered(title, k) for title in char.get('appears_in', [])]
+            if rng.random() < CAMEO_RATE:
+                cameo = rng.choice(movies)['title']
+                if cameo not in clone['appears_in']:
+                    clone['appears_in'].append(cameo)
+            characters.append(clone)
+    for char in characters:
+        for title in char['appears_in']:
+            movie = movies_by_title.get(title)
+            if movie is not None:
+                # As scraped: the movie's copy only knows that movie
+                movie['characters'].append(dict(char, appears_in=[title]))
+
+    films = {'movies': movies, 'characters': characters, 'directors': directors, 'failed_urls': []}
+
+    series_list = []
+    series_characters = []
+    for k in range(scale):
+        for item in series_t['series']:
+            clone = copy.deepcopy(item)
+            clone['title'] = numbered(item['title'], k)
+            clone['url'] = wiki_url(clone['title'])
+            if item.get('director'):
+                clone['director'] = numbered(item['director'], k)
+            clone['characters'] = []
+            series_list.append(clone)
+        by_title = {s['title']: s for s in series_list[-len(series_t['series']):]}
+        for char in series_t['characters']:
+            clone = copy.deepcopy(char)
+            if rng.random() < SHARED_NAME_RATE and characters:
+                clone['name'] = rng.choice(characters)['name']
+            else:
+                clone['name'] = numbered(char['name'], k)
+            clone['url'] = wiki_url(clone['name'])
+            clone['appears_in'] = [numbered(title, k) for title in char.get('appears_in', [])]
+            for title in clone['appears_in']:
+                if title in by_title:
+                    by_title[title]['characters'].append(dict(clone))
+            series_characters.append(clone)
+    series = {'series': series_list, 'characters': series_characters, 'failed_urls': []}
+
+    shorts_list = []
+    for k in range(scale):
+        for item in shorts_t['shorts']:
+            clone = copy.deepcopy(item)
+            clone['title'] = numbered(item['title'], k)
+            clone['url'] = wiki_url(clone['title'])
+            if item.get('director'):
+                clone['director'] = numbered(item['director'], k)
+            shorts_list.append(clone)
+    shorts = {'shorts': shorts_list, 'failed_urls': []}
+
+    return films, series, shorts
+
+
+def write_dataset(out_dir, films, series, shorts):
+    """Write the three JSON files the way the scrapers do, returns their paths"""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for name, data in (('films', films), ('series', series), ('shorts', shorts)):
+        paths[name] = os.path.join(out_dir, f"{name}.json")
+        with open(paths[name], 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate films/series/shorts JSON at N times the real size")
+    parser.add_argument('--scale', type=int, default=10, help="copies of every real record (default: 10)")
+    parser.add_argument('--out', required=True, help="output directory")
+    parser.add_argument('--data', default=DATA_DIR, help="directory of the real JSON files (default: data/)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args()
+
+    films, series, shorts = generate_dataset(args.scale, load_templates(args.data), seed=args.seed)
+    write_dataset(args.out, films, series, shorts)
+    print(f"[+] {args.scale}x dataset => {args.out}: {len(films['movies'])} movies, "
+          f"{len(films['characters'])} characters, {len(films['directors'])} directors, "
+          f"{len(series['series'])} series, {len(shorts['shorts'])} shorts")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+from urllib.parse import unquote, urldefrag
+
+
+def canonical_url(url):
+    """Key of a wiki page URL: no fragment, percent-escapes and spaces normalized"""
+    url, _ = urldefrag(url)
+    return unquote(url).replace(' ', '_')
+
+
+class CharacterRegistry:
+    """
+    Characters seen during a crawl, keyed by canonical page URL.
+
+    The first record of a character is kept (in insertion order) and later
+    sightings only add the title to appears_in and replace the description
+    when theirs is longer. Lookups and appears_in checks are dict/set based,
+    so merging stays linear in the number of sightings.
+    """
+
+    def __init__(self):
+        self.characters = []
+        self.by_url = {}
+        self.appearances = {}
+
+    def __len__(self):
+        return len(self.characters)
+
+    def __iter__(self):
+        return iter(self.characters)
+
+    def get(self, url):
+        return self.by_url.get(canonical_url(url))
+
+    def upsert(self, char, title):
+        """Add a character record or merge it into the one already registered"""
+        key = canonical_url(char['url'])
+        existing = self.by_url.get(key)
+        if existing is None:
+            self.by_url[key] = char
+            self.appearances[key] = set(char.setdefault('appears_in', []))
+            self.characters.append(char)
+            return char
+
+        if title not in self.appearances[key]:
+            self.appearances[key].add(title)
+            existing['appears_in'].append(title)
+        # Update deskripsi jika lebih baik
+        if self.better_description(char.get('description'), existing.get('description')):
+            existing['description'] = char['description']
+        return existing
+
+    def merge(self, chars, title):
+        for char in chars:
+            self.upsert(char, title)
+
+    @staticmethod
+    def better_description(new, old):
+        """Longest non-empty description wins"""
+        return bool(new) and (not old or len(new) > len(old))
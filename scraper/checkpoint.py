@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+import time
+
+
+class CrawlCheckpoint:
+    """
+    Journal of finished work units so a crashed crawl can be resumed.
+
+    Every finished unit (a movie page record, character page or director) is
+    appended as one JSON line to <output>.checkpoint.jsonl and flushed right
+    away. The frontier file <output>.frontier.json holds the movie links of
+    the run and the ones still pending; the journal is what resumes a crawl,
+    so the frontier file is rewritten at most every FRONTIER_INTERVAL
+    seconds. With resume=True both are loaded and finished units are served
+    from the journal instead of being fetched again.
+    """
+
+    # Seconds between two rewrites of the frontier file
+    FRONTIER_INTERVAL = 5.0
+
+    def __init__(self, json_path, resume=False):
+        """
+        Args:
+            json_path: JSON output of the crawl, the checkpoint files sit next to it
+            resume: Load the existing journal instead of starting a new one
+        """
+        root, _ = os.path.splitext(json_path)
+        self.journal_path = root + '.checkpoint.jsonl'
+        self.frontier_path = root + '.frontier.json'
+        self.units = {}
+        self.links = None
+        self.pending = set()
+        self.frontier_written = 0.0
+        self.lock = threading.Lock()
+
+        if resume:
+            self.load()
+        else:
+            self.clear()
+        self.journal = open(self.journal_path, 'a', encoding='utf-8')
+
+    def load(self):
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Last line may be cut off by the crash
+                        continue
+                    self.units[(entry['kind'], entry['key'])] = entry['record']
+        if os.path.exists(self.frontier_path):
+            with open(self.frontier_path, 'r', encoding='utf-8') as f:
+                frontier = json.load(f)
+            self.links = frontier['links']
+            # The file may be behind the journal
+            self.pending = {m['url'] for m in self.links if ('movie', m['url']) not in self.units}
+        print(f"[i] Resuming: {len(self.units)} finished units, {len(self.pending)} movies pending")
+
+    def clear(self):
+        for path in (self.journal_path, self.frontier_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def get(self, kind, key):
+        """Record of a finished unit, or None"""
+        with self.lock:
+            return self.units.get((kind, key))
+
+    def record(self, kind, key, record):
+        """Append a finished unit to the journal"""
+        line = json.dumps({'kind': kind, 'key': key, 'record': record}, ensure_ascii=False)
+        with self.lock:
+            self.units[(kind, key)] = record
+            self.journal.write(line + '\n')
+            self.journal.flush()
+            if kind == 'movie' and key in self.pending:
+                self.pending.discard(key)
+                if time.monotonic() - self.frontier_written >= self.FRONTIER_INTERVAL:
+                    self.write_frontier()
+
+    def set_links(self, links):
+        """Remember the movie links of this run, all of them still pending"""
+        with self.lock:
+            self.links = links
+            self.pending = {m['url'] for m in links if ('movie', m['url']) not in self.units}
+            self.write_frontier()
+
+    def write_frontier(self):
+        pending = [m['url'] for m in self.links if m['url'] in self.pending]
+        tmp = self.frontier_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'links': self.links, 'pending': pending}, f, ensure_ascii=False)
+        os.replace(tmp, self.frontier_path)
+        self.frontier_written = time.monotonic()
+
+    def finish(self):
+        """The crawl completed and its output is saved, drop the checkpoint"""
+        self.journal.close()
+        self.clear()
+
+
+def add_resume_argument(parser):
+    """Register the --resume command line option"""
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted crawl from its checkpoint journal")
@@ -0,0 +1,123 @@
+import heapq
+import threading
+
+from character_registry import canonical_url
+
+# Page types in crawl priority order, a budget can be given for each
+ENTITY_TYPES = ['movie', 'series', 'short', 'character', 'director']
+PRIORITY = {kind: rank for rank, kind in enumerate(ENTITY_TYPES)}
+
+
+class CrawlFrontier:
+    """
+    Decides which pages a crawl visits and in what order. Links are pushed
+    with their link depth (catalogue entries are depth 1, the character and
+    director pages they link to depth 2) and popped by depth, then page type
+    in ENTITY_TYPES order, then push order. Every URL is queued at most once
+    per page type (by canonical URL).
+
+    Budgets are applied when a link is popped, so the total or per-type
+    budget goes to the pages that come first in that order. Links are pushed
+    in list and page order, so the same budget keeps the same pages every
+    run. Each crawl uses its own frontier.
+    """
+
+    def __init__(self, max_pages=None, budgets=None):
+        """
+        Args:
+            max_pages: Most pages admitted in total, None for no limit
+            budgets: Optional dict entity type -> most pages of that type
+        """
+        self.max_pages = max_pages
+        self.budgets = dict(budgets or {})
+        self.heap = []
+        self.queued = set()
+        self.seen = set()
+        self.counts = {}
+        self.rejected = set()
+        self.lock = threading.Lock()
+
+    def push(self, kind, link, depth=1):
+        """Queue a link dict (with 'url') at depth, False if it was queued before"""
+        key = (kind, canonical_url(link['url']))
+        with self.lock:
+            if key in self.queued:
+                return False
+            self.queued.add(key)
+            heapq.heappush(self.heap, (depth, PRIORITY[kind], len(self.queued), kind, link))
+            return True
+
+    def _admit(self, kind, url):
+        key = (kind, canonical_url(url))
+        budget = self.budgets.get(kind)
+        if (self.max_pages is not None and len(self.seen) >= self.max_pages) or \
+                (budget is not None and self.counts.get(kind, 0) >= budget):
+            self.rejected.add(key)
+            return False
+        self.seen.add(key)
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        return True
+
+    def pop(self):
+        """
+        (kind, depth, link) of the next page to visit, None when the frontier
+        is empty. Links over budget are dropped on the way.
+        """
+        with self.lock:
+            while self.heap:
+                depth, _, _, kind, link = heapq.heappop(self.heap)
+                if self._admit(kind, link['url']):
+                    return kind, depth, link
+            return None
+
+    def pop_level(self):
+        """
+        (kind, depth, links) of the next page and every queued page of the
+        same type and depth after it, in push order, so a crawl can fetch
+        them in parallel. None when the frontier is empty.
+        """
+        first = self.pop()
+        if first is None:
+            return None
+        kind, depth, link = first
+        links = [link]
+        with self.lock:
+            while self.heap and self.heap[0][:2] == (depth, PRIORITY[kind]):
+                link = heapq.heappop(self.heap)[4]
+                if self._admit(kind, link['url']):
+                    links.append(link)
+        return kind, depth, links
+
+    def admitted(self, kind, url):
+        """True if url was popped as a page of this type within budget"""
+        with self.lock:
+            return (kind, canonical_url(url)) in self.seen
+
+    def summary(self):
+        counts = ", ".join(f"{n} {kind}" for kind, n in sorted(self.counts.items()))
+        return f"{len(self.seen)} pages admitted ({counts or 'none'}), {len(self.rejected)} over budget"
+
+
+def parse_budget(text):
+    """'character=200' -> ('character', 200)"""
+    kind, _, value = text.partition('=')
+    if kind not in ENTITY_TYPES or not value.isdigit():
+        raise ValueError(f"budget must look like TYPE=N with TYPE in {', '.join(ENTITY_TYPES)}")
+    return kind, int(value)
+
+
+def add_frontier_arguments(parser):
+    """Register the crawl budget command line options shared by the scrapers"""
+    parser.add_argument('--max-pages', type=int, default=None,
+                        help="most pages visited by one crawl (default: no limit)")
+    parser.add_argument('--budget', action='append', default=[], metavar='TYPE=N',
+                        help=f"most pages of one type, TYPE in {', '.join(ENTITY_TYPES)} (repeatable)")
+
+
+def frontier_from_args(args):
+    """CrawlFrontier for the parsed command line"""
+    try:
+        budgets = dict(parse_budget(b) for b in args.budget)
+    except ValueError as e:
+        raise SystemExit(f"[ERROR] {e}")
+    return CrawlFrontier(max_pages=args.max_pages, budgets=budgets)
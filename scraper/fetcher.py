@@ -0,0 +1,200 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+from metrics import Metrics
+
+# Responses worth another try: rate limited or a temporary server problem
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """Raised when a URL still fails after every retry"""
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker. After `threshold` failures in a row the host is
+    paused for `cooldown` seconds; the next request after the pause is a
+    probe, and one more failure pauses the host again.
+    """
+
+    def __init__(self, threshold=5, cooldown=30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = {}
+        self.open_until = {}
+        self.lock = threading.Lock()
+
+    def wait(self, host):
+        """Block while the circuit of host is open"""
+        while True:
+            with self.lock:
+                remaining = self.open_until.get(host, 0) - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def success(self, host):
+        with self.lock:
+            self.failures[host] = 0
+
+    def failure(self, host):
+        with self.lock:
+            self.failures[host] = self.failures.get(host, 0) + 1
+            if self.failures[host] >= self.threshold:
+                self.open_until[host] = time.monotonic() + self.cooldown
+                print(f"[!] {host}: {self.failures[host]} failures in a row, pausing {self.cooldown:.0f}s")
+
+
+class Fetcher:
+    """
+    Fetch layer shared by the scrapers: rate limiting, optional HTTP cache,
+    retries with exponential backoff and jitter, Retry-After handling and a
+    per-host circuit breaker. URLs that still fail are kept in `failed` for
+    the report saved with the output.
+
+    One Fetcher can be shared by several scrapers in the same process; URLs
+    registered with share() are fetched once and their body (or error) is
+    handed to every scraper that asks for them.
+
+    Latency, bytes, status codes, retries and cache results are counted in
+    `metrics`, shared by every scraper using this Fetcher.
+    """
+
+    def __init__(self, session, rate_limiter, cache=None, retries=4, backoff=1.0, max_backoff=60.0,
+                 timeout=12, breaker=None, metrics=None):
+        """
+        Args:
+            session: requests.Session used for every request
+            rate_limiter: RateLimiter shared by everything that talks to the wiki
+            cache: Optional HTTPCache
+            retries: Extra attempts after the first one
+            backoff: Base delay in seconds, doubled after every attempt
+            max_backoff: Longest delay between two attempts, also caps Retry-After
+            timeout: Seconds before a request times out
+            breaker: CircuitBreaker, a new one by default
+            metrics: Metrics of the run, a new one by default
+        """
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = metrics or Metrics()
+        if cache is not None and cache.metrics is None:
+            cache.metrics = self.metrics
+        self.failed = {}
+        self.shared = set()
+        self.memo = {}
+        self.memo_locks = {}
+        self.lock = threading.Lock()
+
+    def delay(self, attempt, resp=None):
+        """Seconds to wait before the next attempt"""
+        if resp is not None:
+            retry_after = self.retry_after(resp)
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        # Full jitter spreads out threads that failed at the same moment
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def retry_after(self, resp):
+        value = resp.headers.get('Retry-After')
+        if not value:
+            return None
+        if value.strip().isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def request(self, url, headers=None):
+        """GET url, retrying timeouts, connection errors, 429 and 5xx"""
+        host = urlparse(url).netloc
+        error = None
+        for attempt in range(self.retries + 1):
+            self.breaker.wait(host)
+            self.rate_limiter.acquire()
+            resp = None
+            start = time.perf_counter()
+            try:
+                resp = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                self.metrics.inc('http_errors_total', error=type(e).__name__)
+            else:
+                self.metrics.observe('fetch_seconds', time.perf_counter() - start)
+                self.metrics.inc('http_responses_total', status=str(resp.status_code))
+                self.metrics.inc('fetch_bytes_total', len(resp.content))
+                if resp.status_code not in RETRY_STATUS:
+                    self.breaker.success(host)
+                    return resp
+                error = requests.HTTPError(f"{resp.status_code} for url: {url}", response=resp)
+
+            self.breaker.failure(host)
+            if attempt < self.retries:
+                self.metrics.inc('fetch_retries_total')
+                wait = self.delay(attempt, resp)
+                print(f"[!] {url}: {error}, retry {attempt + 1}/{self.retries} in {wait:.1f}s")
+                time.sleep(wait)
+        self.metrics.inc('fetch_failures_total')
+        raise FetchError(f"gave up after {self.retries + 1} attempts: {error}")
+
+    def share(self, urls):
+        """Keep the result of these URLs for the whole run, they are asked for more than once"""
+        with self.lock:
+            self.shared.update(urls)
+
+    def fetch(self, url, fresh=False):
+        """Raw body of url, from the cache when there is one (revalidated first when fresh)"""
+        if url not in self.shared:
+            return self.fetch_direct(url, fresh)
+        with self.lock:
+            flight = self.memo_locks.setdefault(url, threading.Lock())
+        # Concurrent callers wait for the first fetch instead of repeating it
+        with flight:
+            if url in self.memo:
+                self.metrics.inc('fetch_shared_hits_total')
+            else:
+                try:
+                    self.memo[url] = (self.fetch_direct(url, fresh), None)
+                except Exception as e:
+                    self.memo[url] = (None, e)
+            body, error = self.memo[url]
+        if error is not None:
+            raise error
+        return body
+
+    def fetch_direct(self, url, fresh=False):
+        try:
+            if self.cache:
+                return self.cache.fetch(url, self.request, fresh)
+            resp = self.request(url)
+            resp.raise_for_status()
+            return resp.content
+        except Exception as e:
+            # A missing page is an answer, not a hole in the data
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            if status not in (404, 410):
+                with self.lock:
+                    self.failed[url] = str(e)
+            raise
+
+    def failure(self, url):
+        """Error kept for url in the failure report, None if it is not there"""
+        with self.lock:
+            return self.failed.get(url)
+
+    def failed_report(self):
+        """URLs that could not be fetched in this run"""
+        with self.lock:
+            return [{'url': url, 'error': error} for url, error in sorted(self.failed.items())]
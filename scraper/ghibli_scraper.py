@@ -1,34 +1,54 @@
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import json
-import re
-import time
 from urllib.parse import urljoin
 
-class GhibliScraper:
-    def __init__(self):
-        self.base_url = "https://ghibli.fandom.com"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Referer': 'https://google.com'
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+from character_registry import CharacterRegistry, canonical_url
+from checkpoint import CrawlCheckpoint, add_resume_argument
+from crawl_frontier import add_frontier_arguments, frontier_from_args
+from http_cache import add_cache_arguments, cache_from_args
+from manifest import RevisionManifest, add_incremental_argument
+from matchers import FILM_BY, FILM_DIRECTED_BY, GENRE_SEPARATORS, YEAR
+from mediawiki_api import add_source_argument
+from metrics import add_metrics_arguments, write_metrics
+from parse_pool import add_parse_workers_argument, parse_pool_from_args
+from parser_backends import add_parser_argument
+from record_stream import RecordStream, add_stream_argument
+from scraper_core import (VOICE_KEYWORDS, FirstParagraph, InfoboxImage, InfoboxValue, Method, SectionText,
+                          WikiScraper, add_crawl_arguments)
+
+DESCRIPTION = FirstParagraph('description')
+
+
+class GhibliScraper(WikiScraper):
+    FIELDS = [
+        Method('release_year', 'extract_release_year'),
+        Method('director', 'extract_director'),
+        InfoboxValue('duration', ['running time'], prefer_link=False),
+        DESCRIPTION,
+        SectionText('synopsis', ids=['Plot', 'Synopsis', 'Story']),
+        InfoboxImage('poster_url'),
+        Method('genres', 'extract_genres'),
+    ]
+    VOICE_KEYWORDS = VOICE_KEYWORDS[:3] + ['(Streamline)'] + VOICE_KEYWORDS[3:]
+    VISITORS = {'movie': 'visit_movies', 'character': 'visit_characters', 'director': 'visit_directors'}
+
+    def __init__(self, checkpoint=None, **kwargs):
+        """
+        Args:
+            checkpoint: Optional CrawlCheckpoint journaling parsed movie pages,
+                character pages and directors for --resume
+            **kwargs: Fetch/parse options, see WikiScraper
+        """
+        super().__init__(**kwargs)
+        self.checkpoint = checkpoint
         self.movies = []
-        self.characters = []
+        self.registry = CharacterRegistry()
+        self.characters = self.registry.characters
+        self.scraped = []
+        self.character_pages = {}
+        self.director_details = {}
         self.directors = {}
 
-    def get_soup(self, url):
-        try:
-            resp = self.session.get(url, timeout=12)
-            resp.raise_for_status()
-            return BeautifulSoup(resp.content, 'html.parser')
-        except Exception as e:
-            print(f"[ERROR] fetching {url}: {e}")
-            return None
-
     def candidate_list_pages(self):
         return [
             "/wiki/Category:Films",
@@ -48,15 +68,9 @@ class GhibliScraper:
             if not soup:
                 continue
 
-            cat_links = soup.select('a.category-page__member-link')
-            if cat_links:
-                for a in cat_links:
-                    href = a.get('href')
-                    title = a.get_text(strip=True)
-                    if href and '/wiki/' in href and ':' not in href:
-                        movie_links.append({'title': title, 'url': urljoin(self.base_url, href)})
-                if movie_links:
-                    break
+            movie_links.extend(self.category_links(soup))
+            if movie_links:
+                break
 
             content = soup.find('div', {'class': 'mw-parser-output'})
             if content:
@@ -74,268 +88,163 @@ class GhibliScraper:
             if movie_links:
                 break
 
-            time.sleep(0.5)
-
-        seen = set()
-        unique = []
-        for item in movie_links:
-            if item['url'] not in seen:
-                seen.add(item['url'])
-                unique.append(item)
-
+        unique = self.unique_links(movie_links)
         print(f"[i] Found {len(unique)} candidate movie links.")
-        return unique[:30]
-
-    def extract_description(self, soup):
-        """Extract first paragraph after main heading for description"""
-        content = soup.find('div', class_='mw-parser-output')
-        if not content:
-            return None
-        
-        for p in content.find_all('p', recursive=False):
-            text = p.get_text(" ", strip=True)
-            if len(text) > 100:
-                return text[:800]
-        
-        return None
-
-    def extract_synopsis(self, soup):
-        """Extract plot/synopsis from Plot section with subsections"""
-        content = soup.find('div', class_='mw-parser-output')
-        if not content:
-            return None
-
-        plot_heading = None
-        for h2 in content.find_all('h2'):
-            span = h2.find('span', class_='mw-headline')
-            if span and span.get('id') in ['Plot', 'Synopsis', 'Story']:
-                plot_heading = h2
-                break
-
-        if not plot_heading:
-            return None
-
-        synopsis_parts = []
-        current = plot_heading.find_next_sibling()
-        
-        while current:
-            if current.name in ['h2', 'h1']:
-                break
-            
-            if current.name == 'p':
-                text = current.get_text(" ", strip=True)
-                if len(text) > 40:
-                    synopsis_parts.append(text)
-            
-            current = current.find_next_sibling()
-
-        if synopsis_parts:
-            full_synopsis = " ".join(synopsis_parts)
-            return full_synopsis[:2000]
-        
-        return None
-
-    def extract_poster(self, soup):
-        infobox = soup.find('aside', {'class': 'portable-infobox'})
-        if not infobox:
-            return None
-        img = infobox.find('img')
-        return img['src'] if img and img.get('src') else None
+        return unique
 
-    def extract_director(self, soup):
+    def extract_director(self, page):
         """Extract director with multiple fallback methods"""
-        infobox = soup.find('aside', {'class': 'portable-infobox'})
-        if infobox:
-            for item in infobox.select('.pi-item'):
-                label = item.find(class_='pi-data-label')
-                val = item.find(class_='pi-data-value')
-                if label and val:
-                    label_text = label.get_text(strip=True).lower()
-                    if 'director' in label_text or 'directed' in label_text:
-                        director_link = val.find('a')
-                        if director_link:
-                            return director_link.get_text(strip=True)
-                        return val.get_text(" ", strip=True)
+        director = page.infobox_value(['director', 'directed'], prefer_link=True)
+        if director is not None:
+            return director
         
-        content = soup.find('div', {'class': 'mw-parser-output'})
-        if content:
-            for p in content.find_all('p', recursive=False)[:3]:
-                text = p.get_text(" ", strip=True)
-                match = re.search(r'directed by ([A-Z][a-zA-Z\s]+?)(?:\.|,|\sand\s)', text, re.IGNORECASE)
-                if match:
-                    return match.group(1).strip()
-                
-                match = re.search(r'(?:a |the )?film by ([A-Z][a-zA-Z\s]+?)(?:\.|,|\sand\s)', text, re.IGNORECASE)
-                if match:
-                    return match.group(1).strip()
+        for text in page.paragraphs[:3]:
+            match = FILM_DIRECTED_BY.search(text)
+            if match:
+                return match.group(1).strip()
+            
+            match = FILM_BY.search(text)
+            if match:
+                return match.group(1).strip()
         
         return None
 
-    def extract_release_year(self, soup):
-        infobox = soup.find('aside', {'class': 'portable-infobox'})
-        if not infobox:
-            return None
-        for item in infobox.select('.pi-item'):
-            label = item.find(class_='pi-data-label')
-            val = item.find(class_='pi-data-value')
-            if label and val:
-                txt = val.get_text(" ", strip=True)
-                year = re.search(r'(19|20)\d{2}', txt)
-                if year:
-                    return int(year.group())
-        return None
-
-    def extract_duration(self, soup):
-        infobox = soup.find('aside', {'class': 'portable-infobox'})
-        if not infobox:
-            return None
-        for item in infobox.select('.pi-item'):
-            label = item.find(class_='pi-data-label')
-            val = item.find(class_='pi-data-value')
-            if label and val and 'running time' in label.get_text(strip=True).lower():
-                return val.get_text(" ", strip=True)
+    def extract_release_year(self, page):
+        for _, _, txt in page.infobox_items:
+            year = YEAR.search(txt)
+            if year:
+                return int(year.group())
         return None
 
-    def extract_genres(self, soup):
+    def genre_hints(self, page):
+        """Genres guessed from words of the article text, at most 3, Animation last"""
+        text = page.content.get_text(" ", strip=True).lower() if page.content else ""
+        default_genres = []
+        if 'adventure' in text or 'journey' in text:
+            default_genres.append('Adventure')
+        if 'fantasy' in text or 'magic' in text or 'spirit' in text:
+            default_genres.append('Fantasy')
+        if 'romance' in text or 'love' in text:
+            default_genres.append('Romance')
+        if 'war' in text or 'battle' in text:
+            default_genres.append('Drama')
+        default_genres.append('Animation')
+        return default_genres[:3]
+
+    def extract_genres(self, page):
         """Extract genres from categories and content with fallback"""
         genres = []
         
-        infobox = soup.find('aside', {'class': 'portable-infobox'})
-        if infobox:
-            for item in infobox.select('.pi-item'):
-                label = item.find(class_='pi-data-label')
-                val = item.find(class_='pi-data-value')
-                if label and val and 'genre' in label.get_text(strip=True).lower():
-                    genre_text = val.get_text(" ", strip=True)
-                    genres_split = re.split(r'[,/;]', genre_text)
-                    genres.extend([g.strip() for g in genres_split if g.strip()])
+        for genre_text in page.infobox_values(['genre']):
+            genres_split = GENRE_SEPARATORS.split(genre_text)
+            genres.extend([g.strip() for g in genres_split if g.strip()])
         
         if not genres:
-            categories = soup.find('div', {'id': 'mw-normal-catlinks'})
-            if categories:
-                for link in categories.find_all('a'):
-                    cat_text = link.get_text(strip=True)
-                    if any(keyword in cat_text.lower() for keyword in ['adventure', 'fantasy', 'drama', 'romance', 'anime']):
-                        if 'films' not in cat_text.lower() and 'movies' not in cat_text.lower():
-                            genres.append(cat_text)
+            for cat_text in page.categories:
+                if any(keyword in cat_text.lower() for keyword in ['adventure', 'fantasy', 'drama', 'romance', 'anime']):
+                    if 'films' not in cat_text.lower() and 'movies' not in cat_text.lower():
+                        genres.append(cat_text)
         
-        if not genres:
-            content = soup.find('div', {'class': 'mw-parser-output'})
-            if content:
-                text = content.get_text(" ", strip=True).lower()
-                default_genres = []
-                if 'adventure' in text or 'journey' in text:
-                    default_genres.append('Adventure')
-                if 'fantasy' in text or 'magic' in text or 'spirit' in text:
-                    default_genres.append('Fantasy')
-                if 'romance' in text or 'love' in text:
-                    default_genres.append('Romance')
-                if 'war' in text or 'battle' in text:
-                    default_genres.append('Drama')
-                
-                if 'anime' not in [g.lower() for g in default_genres]:
-                    default_genres.append('Animation')
-                
-                genres = default_genres[:3]
+        if not genres and page.content:
+            genres = self.genre_hints(page)
         
         return genres if genres else ['Animation', 'Fantasy']
 
-    def scrape_movie_detail(self, movie_url, movie_title):
-        print(f"[+] Scraping movie: {movie_title}")
-        soup = self.get_soup(movie_url)
-        if not soup:
+    def extract_movie_record(self, page):
+        """Fields and character links of a movie page"""
+        return {
+            'fields': self.extract_fields(page),
+            'character_links': self.extract_character_links(page),
+        }
+
+    def movie_from_record(self, link, record):
+        """(movie data without characters, character links) of a movie page record"""
+        if not record:
             return None
 
         movie_data = {
-            'title': movie_title,
-            'url': movie_url,
-            'release_year': self.extract_release_year(soup),
-            'director': self.extract_director(soup),
-            'duration': self.extract_duration(soup),
-            'description': self.extract_description(soup),
-            'synopsis': self.extract_synopsis(soup),
-            'poster_url': self.extract_poster(soup),
-            'genres': self.extract_genres(soup),
-            'characters': []
+            'title': link['title'],
+            'url': link['url'],
         }
-
-        chars = self.scrape_characters_from_movie(soup, movie_title)
-        movie_data['characters'] = chars
-
-        return movie_data
+        movie_data.update(record['fields'])
+        return movie_data, record['character_links']
 
     # ====================================================
-    # FIXED: Extract deskripsi dari halaman karakter langsung
+    # Satu kali fetch per halaman karakter (deskripsi + infobox)
     # ====================================================
+    def character_page(self, char_url):
+        """Record of a character page fetched by scrape_character_pages (empty if the fetch failed)"""
+        return self.character_pages.get(canonical_url(char_url)) or self.parse_character_page(None)
+
+    def scrape_character_pages(self, char_urls):
+        """Fetch every character page of char_urls once, in parallel (parsed in the parse pool if any)"""
+        todo = []
+        for char_url in char_urls:
+            record = self.checkpoint.get('character', char_url) if self.checkpoint else None
+            if record is not None:
+                self.character_pages[canonical_url(char_url)] = record
+            elif canonical_url(char_url) not in self.character_pages:
+                todo.append(char_url)
+        records = self.scrape_pages('parse_character_page', [(char_url,) for char_url in todo])
+        for char_url, record in zip(todo, records):
+            if record is None:
+                record = self.parse_character_page(None)
+            elif self.checkpoint:
+                self.checkpoint.record('character', char_url, record)
+            self.character_pages[canonical_url(char_url)] = record
+
+    def parse_character_page(self, page):
+        """Extract description, image, age and gender from one character page"""
+        result = {'description': None, 'details': {}}
+        if not page:
+            return result
+
+        result['description'] = self.extract_character_description(page)
+
+        if page.infobox_image:
+            result['details']['image_url'] = page.infobox_image
+        for lt, _, vt in page.infobox_items:
+            if 'age' in lt:
+                result['details']['age'] = vt
+            elif 'gender' in lt:
+                result['details']['gender'] = vt
+
+        return result
+
     def get_character_description_from_page(self, char_url):
         """Fetch character description directly from character page"""
-        soup = self.get_soup(char_url)
-        if not soup:
-            return None
-        
-        content = soup.find('div', {'class': 'mw-parser-output'})
-        if not content:
-            return None
-        
-        # Ambil semua paragraf
-        paragraphs = content.find_all('p', recursive=False)
-        
-        for p in paragraphs:
-            text = p.get_text(" ", strip=True)
-            
-            # Skip paragraf pendek
-            if len(text) < 50:
-                continue
-            
-            # Skip jika hanya berisi voice actor (banyak tanda kurung dan comma)
-            # Pattern: "Name1 (Language), Name2 (Language), Name3 (Language)"
-            parentheses_count = text.count('(')
-            comma_count = text.count(',')
+        return self.character_page(char_url)['description']
+
+    def character_entries(self, char_urls_found, movie_title):
+        """Character entries of a movie, character pages are fetched once (see scrape_character_pages)"""
+        results = []
+        for char_info in char_urls_found:
+            print(f"       - Fetching description for: {char_info['name']}")
             
-            # Jika lebih dari 2 tanda kurung dan banyak comma dalam 200 karakter pertama -> skip
-            if parentheses_count >= 2 and comma_count >= 2 and len(text) < 200:
-                continue
+            # Fetch deskripsi dari halaman karakter
+            description = self.get_character_description_from_page(char_info['url'])
             
-            # Jika mengandung kata kunci voice actor -> skip
-            voice_keywords = ['(Japanese)', '(English)', '(Disney)', '(Streamline)', 'voiced by', 'voice actor']
-            if any(keyword in text for keyword in voice_keywords) and len(text) < 200:
-                continue
+            results.append({
+                'name': char_info['name'],
+                'url': char_info['url'],
+                'description': description,
+                'appears_in': [movie_title]
+            })
             
-            # Ini kemungkinan besar deskripsi karakter yang benar
-            return text[:600]
-        
-        return None
-
-    # ====================================================
-    # FIXED: Scrape characters - ambil nama dulu, fetch deskripsi kemudian
-    # ====================================================
-    def scrape_characters_from_movie(self, soup, movie_title):
-        """Extract characters from Characters section, fetch descriptions separately"""
-        results = []
-        content = soup.find('div', {'class': 'mw-parser-output'})
-        if not content:
-            return results
-
-        # Cari heading "Characters"
-        char_heading = None
-        for h2 in content.find_all('h2'):
-            span = h2.find('span', class_='mw-headline')
-            if span and 'character' in span.get_text(strip=True).lower():
-                char_heading = h2
-                break
+        return results
 
-        if not char_heading:
-            return results
+    def extract_character_links(self, page):
+        """Character names and URLs listed in the Characters section (None if no section)"""
+        # Cari section "Characters"
+        section = page.find_section(title_keywords=['character'])
+        if section is None:
+            return None
 
-        current = char_heading.find_next_sibling()
-        char_count = 0
         char_urls_found = []
+        seen = set()
         
         # Step 1: Kumpulkan semua character URLs
-        while current and char_count < 20:
-            if current.name in ['h2', 'h1']:
-                break
-            
+        for current in section:
             # Dari definition list
             if current.name == 'dl':
                 for dt in current.find_all('dt'):
@@ -350,15 +259,12 @@ class GhibliScraper:
                             
                             char_url = urljoin(self.base_url, href)
                             
-                            if char_url not in [c['url'] for c in char_urls_found]:
+                            if canonical_url(char_url) not in seen:
                                 char_urls_found.append({
                                     'name': name,
                                     'url': char_url
                                 })
-                                char_count += 1
-                                
-                                if char_count >= 20:
-                                    break
+                                seen.add(canonical_url(char_url))
             
             # Dari list items
             elif current.name == 'ul':
@@ -379,15 +285,12 @@ class GhibliScraper:
                             
                             char_url = urljoin(self.base_url, href)
                             
-                            if char_url not in [c['url'] for c in char_urls_found]:
+                            if canonical_url(char_url) not in seen:
                                 char_urls_found.append({
                                     'name': name,
                                     'url': char_url
                                 })
-                                char_count += 1
-                                
-                                if char_count >= 20:
-                                    break
+                                seen.add(canonical_url(char_url))
             
             # Dari paragraf dengan bold
             elif current.name == 'p':
@@ -403,104 +306,121 @@ class GhibliScraper:
                             
                             char_url = urljoin(self.base_url, href)
                             
-                            if char_url not in [c['url'] for c in char_urls_found]:
+                            if canonical_url(char_url) not in seen:
                                 char_urls_found.append({
                                     'name': char_name,
                                     'url': char_url
                                 })
-                                char_count += 1
-                                
-                                if char_count >= 20:
-                                    break
-            
-            current = current.find_next_sibling()
+                                seen.add(canonical_url(char_url))
 
-        # Step 2: Fetch deskripsi untuk setiap karakter dari halaman mereka
-        print(f"    -> Found {len(char_urls_found)} characters, fetching descriptions...")
-        
-        for char_info in char_urls_found:
-            print(f"       - Fetching description for: {char_info['name']}")
-            
-            # Fetch deskripsi dari halaman karakter
-            description = self.get_character_description_from_page(char_info['url'])
-            
-            results.append({
-                'name': char_info['name'],
-                'url': char_info['url'],
-                'description': description,
-                'appears_in': [movie_title]
-            })
-            
-            # Rate limiting
-            time.sleep(0.5)
-
-        # Update global characters list
-        seen_urls = {c['url'] for c in self.characters}
-        for char in results:
-            if char['url'] not in seen_urls:
-                self.characters.append(char)
-                seen_urls.add(char['url'])
-            else:
-                for existing in self.characters:
-                    if existing['url'] == char['url']:
-                        if movie_title not in existing['appears_in']:
-                            existing['appears_in'].append(movie_title)
-                        # Update deskripsi jika lebih baik
-                        if char.get('description') and (
-                            not existing.get('description') or 
-                            len(char['description']) > len(existing.get('description', ''))
-                        ):
-                            existing['description'] = char['description']
+        return char_urls_found
 
-        return results
+    def merge_characters(self, results, movie_title):
+        """Merge characters of one movie into the global characters list"""
+        self.registry.merge(results, movie_title)
 
     def scrape_character_detail(self, char_data):
-        """Scrape additional character details (image, age, gender)"""
+        """Add character details (image, age, gender) from the already fetched page"""
         print(f"    - Character detail: {char_data['name']}")
-        soup = self.get_soup(char_data['url'])
-        if not soup:
-            return char_data
-
-        infobox = soup.find('aside', {'class': 'portable-infobox'})
-        if infobox:
-            img = infobox.find('img')
-            if img and img.get('src'):
-                char_data['image_url'] = img['src']
-            
-            for div in infobox.select('.pi-item'):
-                label = div.find(class_='pi-data-label')
-                val = div.find(class_='pi-data-value')
-                if label and val:
-                    lt = label.get_text(strip=True).lower()
-                    vt = val.get_text(" ", strip=True)
-                    if 'age' in lt:
-                        char_data['age'] = vt
-                    elif 'gender' in lt:
-                        char_data['gender'] = vt
-
+        char_data.update(self.character_page(char_data['url'])['details'])
         return char_data
 
-    def scrape_all(self, scrape_char_details=False):
-        print("[*] Starting scraping...")
-        movie_links = self.scrape_movie_list()
+    def visit_movies(self, movie_links, depth):
+        """
+        Fetch a level of movie pages in parallel and journal each page record
+        as soon as it is parsed (resumed ones come back from the checkpoint).
+        Their characters and directors are queued one level deeper, in list
+        and page order, so a budget keeps the same pages every run.
+        """
+        if self.checkpoint and self.checkpoint.links is None:
+            self.checkpoint.set_links(movie_links)
         print(f"[i] Candidate movie links: {len(movie_links)}")
+        self.prefetch(m['url'] for m in movie_links)
+
+        records = {}
+        todo = []
+        for link in movie_links:
+            record = self.checkpoint.get('movie', link['url']) if self.checkpoint else None
+            if record is not None:
+                print(f"[+] Resumed movie: {link['title']}")
+                records[link['url']] = record
+            else:
+                print(f"[+] Scraping movie: {link['title']}")
+                todo.append(link)
+        with self.metrics.timer('phase_seconds', scraper='films', phase='movies'):
+            for link, record in zip(todo, self.scrape_pages('extract_movie_record', [(link['url'],) for link in todo])):
+                if record and self.checkpoint:
+                    self.checkpoint.record('movie', link['url'], record)
+                records[link['url']] = record
+
+        for link in movie_links:
+            entry = self.movie_from_record(link, records[link['url']])
+            if not entry:
+                continue
+            movie, char_links = entry
+            for char_link in char_links or []:
+                self.frontier.push('character', char_link, depth + 1)
+            if movie.get('director'):
+                director_link = {'title': movie['director'], 'url': self.director_url(movie['director'])}
+                self.frontier.push('director', director_link, depth + 1)
+            if self.stream:
+                # Character entries are patched in once they are merged and detailed
+                stubs = [{'name': c['name'], 'url': c['url']} for c in char_links or []]
+                self.stream.emit('movies', dict(movie, characters=stubs))
+                movie = {'title': movie['title'], 'url': movie['url'], 'director': movie.get('director')}
+            self.scraped.append((movie, char_links))
+
+    def visit_characters(self, char_links, depth):
+        """Fetch a level of character pages once each, in parallel"""
+        print(f"[i] Fetching {len(char_links)} character pages...")
+        self.prefetch(c['url'] for c in char_links)
+        with self.metrics.timer('phase_seconds', scraper='films', phase='characters'):
+            self.scrape_character_pages([c['url'] for c in char_links])
+
+    def visit_directors(self, director_links, depth):
+        """Fetch a level of director pages in parallel"""
+        print("\n[*] Scraping director details...")
+        self.prefetch(d['url'] for d in director_links)
+        with self.metrics.timer('phase_seconds', scraper='films', phase='directors'):
+            self.director_details.update(self.scrape_director_details([d['title'] for d in director_links]))
 
-        for m in movie_links:
-            time.sleep(0.8)
-            movie = self.scrape_movie_detail(m['url'], m['title'])
-            if movie:
-                self.movies.append(movie)
+    def scrape_all(self, scrape_char_details=False):
+        print("[*] Starting scraping...")
+        resumed = self.checkpoint and self.checkpoint.links is not None
+        with self.metrics.timer('phase_seconds', scraper='films', phase='list'):
+            links = self.checkpoint.links if resumed else self.scrape_movie_list()
+        for link in links:
+            self.frontier.push('movie', link)
+        self.crawl()
+
+        # Merging stays in list order
+        for movie, char_links in self.scraped:
+            chars = self.admitted_links('character', char_links)
+            movie['characters'] = self.character_entries(chars, movie['title'])
+            self.movies.append(movie)
+            self.merge_characters(movie['characters'], movie['title'])
 
         print(f"[i] Movies scraped: {len(self.movies)}")
         print(f"[i] Characters found: {len(self.characters)}")
 
         if scrape_char_details:
             print("[*] Scraping additional character details (images, age, gender)...")
-            for c in self.characters:
-                time.sleep(0.5)
-                self.scrape_character_detail(c)
+            with self.metrics.timer('phase_seconds', scraper='films', phase='character_details'):
+                self.map_concurrent(self.scrape_character_detail, self.characters)
 
+        if self.stream:
+            self.emit_movies()
         self.extract_directors()
+        if self.stream:
+            # Characters and directors are final only once every movie is merged
+            for char in self.characters:
+                self.stream.emit('characters', char)
+            for director in self.directors.values():
+                self.stream.emit('directors', director)
+            for failure in self.failed_report():
+                self.stream.emit('failed_urls', failure)
+        print(f"[i] Frontier: {self.frontier.summary()}")
+        print(f"[i] Failed URLs: {len(self.failed)}")
         print("[*] Scraping complete")
         return {
             'movies': self.movies, 
@@ -508,17 +428,39 @@ class GhibliScraper:
             'directors': list(self.directors.values())
         }
 
-    def scrape_director_detail(self, director_name):
-        """Scrape detailed director information from director page"""
-        print(f"    [Director] Scraping: {director_name}")
-        
-        # Create URL from director name
-        director_url = urljoin(self.base_url, f"/wiki/{director_name.replace(' ', '_')}")
-        soup = self.get_soup(director_url)
-        
-        if not soup:
-            return None
-        
+    def emit_movies(self):
+        """
+        Patch the character entries into the streamed movies once they are
+        merged and detailed (they are shared with the characters list, as in
+        the non-stream films.json), keeping only what the director phase needs.
+        """
+        for movie in self.movies:
+            self.stream.patch('movies', {'url': movie['url'], 'characters': movie.pop('characters')})
+
+    def director_url(self, director_name):
+        """Create URL from director name"""
+        return urljoin(self.base_url, f"/wiki/{director_name.replace(' ', '_')}")
+
+    def scrape_director_details(self, names):
+        """Director name -> director record (None if the page failed), pages not in the checkpoint fetched in parallel"""
+        details = {}
+        todo = []
+        for name in names:
+            print(f"    [Director] Scraping: {name}")
+            record = self.checkpoint.get('director', name) if self.checkpoint else None
+            if record is not None:
+                details[name] = record
+            else:
+                todo.append(name)
+        calls = [(self.director_url(name), name, self.director_url(name)) for name in todo]
+        for name, record in zip(todo, self.scrape_pages('extract_director_detail', calls)):
+            if self.checkpoint and record:
+                self.checkpoint.record('director', name, record)
+            details[name] = record
+        return details
+
+    def extract_director_detail(self, page, director_name, director_url):
+        """Born, nationality, description and history of a director page"""
         director_data = {
             'name': director_name,
             'url': director_url,
@@ -531,79 +473,41 @@ class GhibliScraper:
         }
         
         # Extract from infobox
-        infobox = soup.find('aside', {'class': 'portable-infobox'})
-        if infobox:
-            for item in infobox.select('.pi-item'):
-                label = item.find(class_='pi-data-label')
-                val = item.find(class_='pi-data-value')
-                
-                if label and val:
-                    label_text = label.get_text(strip=True).lower()
-                    value_text = val.get_text(" ", strip=True)
-                    
-                    if 'born' in label_text or 'birth' in label_text:
-                        director_data['born'] = value_text
-                        # Extract year from born date
-                        year_match = re.search(r'(19|20)\d{2}', value_text)
-                        if year_match:
-                            director_data['birth_year'] = int(year_match.group())
-                    
-                    elif 'nationality' in label_text or 'national' in label_text:
-                        director_data['nationality'] = value_text
+        for label_text, _, value_text in page.infobox_items:
+            if 'born' in label_text or 'birth' in label_text:
+                director_data['born'] = value_text
+                # Extract year from born date
+                year_match = YEAR.search(value_text)
+                if year_match:
+                    director_data['birth_year'] = int(year_match.group())
+            
+            elif 'nationality' in label_text or 'national' in label_text:
+                director_data['nationality'] = value_text
         
         # Extract description from first paragraph
-        content = soup.find('div', {'class': 'mw-parser-output'})
-        if content:
-            for p in content.find_all('p', recursive=False):
-                text = p.get_text(" ", strip=True)
-                if len(text) > 100:
-                    director_data['description'] = text[:800]
-                    break
+        if page.content:
+            director_data['description'] = DESCRIPTION.extract(self, page)
             
-            # Extract history from History section
-            history_heading = None
-            for h2 in content.find_all('h2'):
-                span = h2.find('span', class_='mw-headline')
-                if span and span.get('id') in ['History', 'Biography', 'Career', 'Life']:
-                    history_heading = h2
-                    break
-            
-            if history_heading:
-                history_parts = []
-                current = history_heading.find_next_sibling()
-                
-                while current and len(history_parts) < 5:  # Ambil max 5 paragraf
-                    if current.name in ['h2', 'h1']:
-                        break
-                    
-                    if current.name == 'p':
-                        text = current.get_text(" ", strip=True)
-                        if len(text) > 50:
-                            history_parts.append(text)
-                    
-                    current = current.find_next_sibling()
-                
-                if history_parts:
-                    director_data['history'] = " ".join(history_parts)[:2000]
+            # Extract history from History section (max 5 paragraf)
+            section = page.find_section(ids=['History', 'Biography', 'Career', 'Life'])
+            history_parts = page.section_paragraphs(section, min_length=50, limit=5)
+            if history_parts:
+                director_data['history'] = " ".join(history_parts)[:2000]
         
         return director_data
     
     def extract_directors(self):
-        """Extract directors and scrape their detailed information"""
-        print("\n[*] Scraping director details...")
-        
+        """Directors of the movies, with the details of their crawled pages"""
         for m in self.movies:
             director_name = m.get('director')
             if director_name:
                 # Check if director already exists
                 if director_name not in self.directors:
-                    # Scrape detailed director info
-                    director_detail = self.scrape_director_detail(director_name)
+                    director_detail = self.director_details.get(director_name)
                     
                     if director_detail:
                         self.directors[director_name] = director_detail
                         self.directors[director_name]['notable_works'] = []
-                        time.sleep(0.5)  # Rate limiting
                     else:
                         # Fallback: create basic director entry
                         self.directors[director_name] = {
@@ -620,6 +524,7 @@ class GhibliScraper:
             'movies': self.movies,
             'characters': self.characters,
             'directors': list(self.directors.values()),
+            'failed_urls': self.failed_report(),
         }
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
@@ -660,7 +565,37 @@ class GhibliScraper:
                 print(f"   Description: N/A")
 
 if __name__ == "__main__":
-    s = GhibliScraper()
+    parser = argparse.ArgumentParser(description="Scrape Studio Ghibli films from ghibli.fandom.com")
+    add_crawl_arguments(parser)
+    add_cache_arguments(parser)
+    add_parser_argument(parser)
+    add_parse_workers_argument(parser)
+    add_source_argument(parser)
+    add_incremental_argument(parser)
+    add_resume_argument(parser)
+    add_stream_argument(parser)
+    add_frontier_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    output = '../data/films.json'
+    checkpoint = CrawlCheckpoint(output, resume=args.resume)
+    s = GhibliScraper(concurrency=args.concurrency, rate=args.rate, cache=cache_from_args(args),
+                      parser=args.parser, full_parse=args.full_parse, source=args.source,
+                      manifest_path=RevisionManifest.path_for(output) if args.incremental else None,
+                      checkpoint=checkpoint, stream=RecordStream(output) if args.stream else None,
+                      frontier=frontier_from_args(args), parse_pool=parse_pool_from_args(args))
     data = s.scrape_all(scrape_char_details=True)
-    s.save_to_json('../data/films.json')
+    if s.parse_pool:
+        s.parse_pool.close()
+    if s.stream:
+        s.stream.merge(['movies', 'characters', 'directors', 'failed_urls'])
+    else:
+        s.save_to_json(output)
+    if s.manifest:
+        s.manifest.save()
+    if s.cache:
+        s.cache.flush()
+    checkpoint.finish()
+    write_metrics(s.metrics, args)
     s.print_summary()
\ No newline at end of file
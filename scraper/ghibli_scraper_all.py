@@ -0,0 +1,154 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+from checkpoint import CrawlCheckpoint, add_resume_argument
+from crawl_frontier import add_frontier_arguments, frontier_from_args
+from ghibli_scraper import GhibliScraper
+from ghibli_scraper_series import GhibliSeriesScraper
+from ghibli_scraper_shorts import GhibliShortsScraper
+from http_cache import add_cache_arguments, cache_from_args
+from manifest import RevisionManifest, add_incremental_argument
+from mediawiki_api import add_source_argument
+from metrics import add_metrics_arguments, write_metrics
+from parse_pool import ParsePool, add_parse_workers_argument
+from parser_backends import DEFAULT_PARSER, add_parser_argument
+from record_stream import RecordStream, add_stream_argument
+from scraper_core import add_crawl_arguments, make_fetcher
+
+OUTPUTS = {
+    'films': '../data/films.json',
+    'series': '../data/series.json',
+    'shorts': '../data/shorts.json',
+}
+
+# Keys of each output, in the order they are written
+STREAM_KINDS = {
+    'films': ['movies', 'characters', 'directors', 'failed_urls'],
+    'series': ['series', 'characters', 'failed_urls'],
+    'shorts': ['shorts', 'failed_urls'],
+}
+
+
+class GhibliCatalogueScraper:
+    """
+    Runs the films, series and shorts scrapers in one process. They share one
+    pooled keep-alive session, rate limit and HTTP cache through a single
+    Fetcher, and list pages that more than one scraper reads (e.g.
+    /wiki/Studio_Ghibli) are fetched once for all of them. Each crawl has its
+    own frontier, so its budget keeps the same pages whatever the others do.
+    """
+
+    def __init__(self, concurrency=1, rate=2.0, cache=None, parser=DEFAULT_PARSER, full_parse=False,
+                 source='html', incremental=False, checkpoint=None, stream=False, frontiers=None,
+                 outputs=OUTPUTS, parse_workers=0):
+        """
+        Args:
+            concurrency: Pages fetched at the same time by each scraper
+            rate: Requests per second toward the wiki, for the whole run
+            cache: Optional HTTPCache
+            parser: HTML parser backend
+            full_parse: Parse whole pages instead of the extractor regions
+            source: 'html' or 'api'
+            incremental: Keep a revision manifest next to every output
+            checkpoint: Optional CrawlCheckpoint of the films crawl
+            stream: Write .jsonl streams and merge them into the outputs
+            frontiers: Scraper name -> CrawlFrontier (and budgets) of its crawl
+            outputs: Scraper name -> JSON output path
+            parse_workers: Parser processes shared by the three crawls, 0
+                parses in the fetching threads
+        """
+        self.outputs = outputs
+        self.checkpoint = checkpoint
+        frontiers = frontiers or {}
+        self.parse_pool = ParsePool(parse_workers) if parse_workers > 0 else None
+
+        def options(name):
+            return {
+                'concurrency': concurrency,
+                'parser': parser,
+                'full_parse': full_parse,
+                'source': source,
+                'manifest_path': RevisionManifest.path_for(outputs[name]) if incremental else None,
+                'stream': RecordStream(outputs[name]) if stream else None,
+                'frontier': frontiers.get(name),
+                'parse_pool': self.parse_pool,
+            }
+
+        # Every crawl runs `concurrency` fetching threads on the shared session
+        self.fetcher = make_fetcher(rate, cache, pool_size=len(outputs) * concurrency)
+        self.metrics = self.fetcher.metrics
+        self.films = GhibliScraper(fetcher=self.fetcher, checkpoint=checkpoint, **options('films'))
+        self.series = GhibliSeriesScraper(fetcher=self.fetcher, **options('series'))
+        self.shorts = GhibliShortsScraper(fetcher=self.fetcher, **options('shorts'))
+        self.scrapers = {'films': self.films, 'series': self.series, 'shorts': self.shorts}
+
+    def share_list_pages(self):
+        """Mark the candidate list pages read by more than one scraper as shared"""
+        readers = {}
+        for scraper in self.scrapers.values():
+            for path in scraper.candidate_list_pages():
+                url = urljoin(scraper.base_url, path)
+                readers[url] = readers.get(url, 0) + 1
+        shared = [url for url, n in readers.items() if n > 1]
+        self.fetcher.share(shared)
+        return shared
+
+    def scrape_all(self):
+        """Run the three crawls side by side, returns scraper name -> scraped data"""
+        print(f"[i] Shared list pages: {len(self.share_list_pages())}")
+        calls = {
+            'films': lambda: self.films.scrape_all(scrape_char_details=True),
+            'series': self.series.scrape_all,
+            'shorts': self.shorts.scrape_all,
+        }
+        with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+            futures = {name: pool.submit(call) for name, call in calls.items()}
+            results = {name: future.result() for name, future in futures.items()}
+        if self.parse_pool:
+            self.parse_pool.close()
+        return results
+
+    def save(self):
+        """Write the three JSON outputs (and manifests) and the cache access times, then drop the checkpoint"""
+        for name, scraper in self.scrapers.items():
+            if scraper.stream:
+                scraper.stream.merge(STREAM_KINDS[name])
+            else:
+                scraper.save_to_json(self.outputs[name])
+            if scraper.manifest:
+                scraper.manifest.save()
+        if self.fetcher.cache:
+            self.fetcher.cache.flush()
+        if self.checkpoint:
+            self.checkpoint.finish()
+
+    def print_summary(self):
+        for scraper in self.scrapers.values():
+            scraper.print_summary()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape Studio Ghibli films, series and shorts in one run")
+    add_crawl_arguments(parser)
+    add_cache_arguments(parser)
+    add_parser_argument(parser)
+    add_parse_workers_argument(parser)
+    add_source_argument(parser)
+    add_incremental_argument(parser)
+    add_resume_argument(parser)
+    add_stream_argument(parser)
+    add_frontier_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    catalogue = GhibliCatalogueScraper(
+        concurrency=args.concurrency, rate=args.rate, cache=cache_from_args(args),
+        parser=args.parser, full_parse=args.full_parse, source=args.source,
+        incremental=args.incremental, checkpoint=CrawlCheckpoint(OUTPUTS['films'], resume=args.resume),
+        stream=args.stream, frontiers={name: frontier_from_args(args) for name in OUTPUTS}, parse_workers=args.parse_workers,
+    )
+    catalogue.scrape_all()
+    catalogue.save()
+    write_metrics(catalogue.metrics, args)
+    catalogue.print_summary()
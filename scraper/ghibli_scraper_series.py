@@ -1,39 +1,49 @@
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import json
-import re
-import time
 from urllib.parse import urljoin
 
-class GhibliSeriesScraper:
-    def __init__(self):
-        self.base_url = "https://ghibli.fandom.com"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Referer': 'https://google.com'
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+from character_registry import CharacterRegistry, canonical_url
+from crawl_frontier import add_frontier_arguments, frontier_from_args
+from http_cache import add_cache_arguments, cache_from_args
+from manifest import RevisionManifest, add_incremental_argument
+from matchers import EPISODE_COUNT, NUMBER, SERIES_DIRECTED_BY, YEAR
+from mediawiki_api import add_source_argument
+from metrics import add_metrics_arguments, write_metrics
+from parse_pool import add_parse_workers_argument, parse_pool_from_args
+from parser_backends import add_parser_argument
+from record_stream import RecordStream, add_stream_argument
+from scraper_core import (FirstParagraph, InfoboxImage, InfoboxValue, Method, SectionText, WikiScraper,
+                          add_crawl_arguments)
+
+
+class GhibliSeriesScraper(WikiScraper):
+    FIELDS = [
+        Method('director', 'extract_director'),
+        Method(('release_date', 'release_year'), 'extract_release_info'),
+        Method('episodes', 'extract_episodes'),
+        InfoboxValue('running_time', ['running time', 'runtime', 'duration', 'length']),
+        InfoboxValue('studio', ['studio', 'production', 'producer', 'produced by']),
+        FirstParagraph('description'),
+        SectionText('plot', keywords=['plot', 'synopsis', 'story', 'premise', 'overview']),
+        InfoboxImage('poster_url'),
+    ]
+    VISITORS = {'series': 'visit_series', 'character': 'visit_characters'}
+
+    def __init__(self, **kwargs):
+        """See WikiScraper for the fetch/parse options"""
+        super().__init__(**kwargs)
         self.series = []
-        self.characters = []
-
-    def get_soup(self, url):
-        try:
-            resp = self.session.get(url, timeout=12)
-            resp.raise_for_status()
-            return BeautifulSoup(resp.content, 'html.parser')
-        except Exception as e:
-            print(f"[ERROR] fetching {url}: {e}")
-            return None
+        self.scraped = []
+        self.descriptions = {}
+        self.registry = CharacterRegistry()
+        self.characters = self.registry.characters
 
     def get_known_series_urls(self):
         """Direct URLs for known Ghibli series"""
         return [
-            {'title': "Ronja, the Robber's Daughter", 'url': "https://ghibli.fandom.com/wiki/Ronja,_the_Robber%27s_Daughter"},
-            {'title': 'Sherlock Hound', 'url': 'https://ghibli.fandom.com/wiki/Sherlock_Hound'},
-            {'title': 'Film Guru Guru', 'url': 'https://ghibli.fandom.com/wiki/Film_Guru_Guru'},
+            {'title': "Ronja, the Robber's Daughter", 'url': urljoin(self.base_url, "/wiki/Ronja,_the_Robber%27s_Daughter")},
+            {'title': 'Sherlock Hound', 'url': urljoin(self.base_url, '/wiki/Sherlock_Hound')},
+            {'title': 'Film Guru Guru', 'url': urljoin(self.base_url, '/wiki/Film_Guru_Guru')},
         ]
 
     def candidate_list_pages(self):
@@ -59,265 +69,88 @@ class GhibliSeriesScraper:
                 continue
 
             # Method 1: Category page links
-            cat_links = soup.select('a.category-page__member-link')
-            if cat_links:
-                for a in cat_links:
-                    href = a.get('href')
-                    title = a.get_text(strip=True)
-                    if href and '/wiki/' in href and ':' not in href:
-                        series_links.append({'title': title, 'url': urljoin(self.base_url, href)})
+            series_links.extend(self.category_links(soup))
 
             # Method 2: Content links - look for TV series section
-            content = soup.find('div', {'class': 'mw-parser-output'})
-            if content:
-                for heading in content.find_all(['h2', 'h3']):
-                    heading_text = heading.get_text(strip=True).lower()
-                    if any(keyword in heading_text for keyword in ['television', 'tv', 'series']):
-                        current = heading.find_next_sibling()
-                        while current and current.name not in ['h2', 'h3']:
-                            if current:
-                                for a in current.find_all('a', href=True):
-                                    href = a['href']
-                                    title = a.get_text(strip=True)
-                                    if (href.startswith('/wiki/') and 
-                                        ':' not in href and 
-                                        len(title) > 2):
-                                        series_links.append({
-                                            'title': title, 
-                                            'url': urljoin(self.base_url, href)
-                                        })
-                            current = current.find_next_sibling()
-                            if not current:
-                                break
-
-            time.sleep(0.5)
+            series_links.extend(self.section_links(soup, ['television', 'tv', 'series']))
 
         # Remove duplicates
-        seen = set()
-        unique = []
-        for item in series_links:
-            if item['url'] not in seen:
-                seen.add(item['url'])
-                unique.append(item)
-
+        unique = self.unique_links(series_links)
         print(f"[i] Found {len(unique)} candidate series links.")
         return unique
 
-    def extract_from_infobox(self, soup, label_keywords):
-        """Extract value from infobox by label keywords"""
-        infobox = soup.find('aside', {'class': 'portable-infobox'})
-        if not infobox:
-            return None
-        
-        for item in infobox.select('.pi-item'):
-            label = item.find(class_='pi-data-label')
-            val = item.find(class_='pi-data-value')
-            if label and val:
-                label_text = label.get_text(strip=True).lower()
-                if any(keyword in label_text for keyword in label_keywords):
-                    link = val.find('a')
-                    if link:
-                        return link.get_text(strip=True)
-                    return val.get_text(" ", strip=True)
-        return None
-
-    def extract_director(self, soup):
+    def extract_director(self, page):
         """Extract director from infobox or content"""
         # Try infobox first
-        director = self.extract_from_infobox(soup, ['director', 'directed'])
+        director = self.extract_from_infobox(page, ['director', 'directed'])
         if director:
             return director
         
         # Fallback: search in first paragraph
-        content = soup.find('div', {'class': 'mw-parser-output'})
-        if content:
-            for p in content.find_all('p', recursive=False)[:3]:
-                text = p.get_text(" ", strip=True)
-                match = re.search(r'directed by ([A-Z][a-zA-Z\s]+?)(?:\sand\s|,|\.|$)', text, re.IGNORECASE)
-                if match:
-                    return match.group(1).strip()
+        for text in page.paragraphs[:3]:
+            match = SERIES_DIRECTED_BY.search(text)
+            if match:
+                return match.group(1).strip()
         
         return None
 
-    def extract_episodes(self, soup):
+    def extract_episodes(self, page):
         """Extract number of episodes from various sources"""
         # Try infobox
-        episodes = self.extract_from_infobox(soup, ['episodes', 'no. of episodes', 'episode'])
+        episodes = self.extract_from_infobox(page, ['episodes', 'no. of episodes', 'episode'])
         if episodes:
-            match = re.search(r'(\d+)', episodes)
+            match = NUMBER.search(episodes)
             if match:
                 return int(match.group(1))
         
         # Try first paragraph
-        content = soup.find('div', {'class': 'mw-parser-output'})
-        if content:
-            for p in content.find_all('p', recursive=False)[:3]:
-                text = p.get_text(" ", strip=True)
-                match = re.search(r'(\d+)\s*episode', text, re.IGNORECASE)
-                if match:
-                    return int(match.group(1))
+        for text in page.paragraphs[:3]:
+            match = EPISODE_COUNT.search(text)
+            if match:
+                return int(match.group(1))
         
         return None
 
-    def extract_release_info(self, soup):
+    def extract_release_info(self, page):
         """Extract release date and year"""
         # Try infobox
-        date_str = self.extract_from_infobox(soup, ['release', 'released', 'aired', 'original run', 'premiered'])
+        date_str = self.extract_from_infobox(page, ['release', 'released', 'aired', 'original run', 'premiered'])
         if date_str:
-            year_match = re.search(r'(19|20)\d{2}', date_str)
+            year_match = YEAR.search(date_str)
             return {
                 'release_date': date_str,
                 'release_year': int(year_match.group()) if year_match else None
             }
         
         # Fallback: search in first paragraph
-        content = soup.find('div', {'class': 'mw-parser-output'})
-        if content:
-            for p in content.find_all('p', recursive=False)[:2]:
-                text = p.get_text(" ", strip=True)
-                year_match = re.search(r'(19|20)\d{2}', text)
-                if year_match:
-                    return {
-                        'release_date': None,
-                        'release_year': int(year_match.group())
-                    }
+        for text in page.paragraphs[:2]:
+            year_match = YEAR.search(text)
+            if year_match:
+                return {
+                    'release_date': None,
+                    'release_year': int(year_match.group())
+                }
         
         return {'release_date': None, 'release_year': None}
 
-    def extract_running_time(self, soup):
-        """Extract running time/duration"""
-        return self.extract_from_infobox(soup, ['running time', 'runtime', 'duration', 'length'])
-
-    def extract_studio(self, soup):
-        """Extract studio from infobox"""
-        return self.extract_from_infobox(soup, ['studio', 'production', 'producer', 'produced by'])
-
-    def extract_description(self, soup):
-        """Extract first meaningful paragraph as description"""
-        content = soup.find('div', class_='mw-parser-output')
-        if not content:
-            return None
-        
-        for p in content.find_all('p', recursive=False):
-            text = p.get_text(" ", strip=True)
-            if len(text) > 100:
-                return text[:800]
-        
-        return None
-
-    def extract_plot_or_overview(self, soup):
-        """Extract plot/synopsis/overview from various sections"""
-        content = soup.find('div', class_='mw-parser-output')
-        if not content:
-            return None
-
-        # Try to find Plot, Synopsis, Story, Overview, or Premise heading
-        target_heading = None
-        for h2 in content.find_all('h2'):
-            span = h2.find('span', class_='mw-headline')
-            if span:
-                heading_id = span.get('id', '').lower()
-                heading_text = span.get_text(strip=True).lower()
-                if any(keyword in heading_id or keyword in heading_text 
-                       for keyword in ['plot', 'synopsis', 'story', 'premise', 'overview']):
-                    target_heading = h2
-                    break
-
-        if not target_heading:
-            return None
-
-        # Collect paragraphs under the section
-        plot_parts = []
-        current = target_heading.find_next_sibling()
-        
-        while current:
-            if current.name in ['h2', 'h1']:
-                break
-            
-            if current.name == 'p':
-                text = current.get_text(" ", strip=True)
-                if len(text) > 40:
-                    plot_parts.append(text)
-            
-            current = current.find_next_sibling()
-
-        if plot_parts:
-            full_plot = " ".join(plot_parts)
-            return full_plot[:2000]
-        
-        return None
+    def character_record(self, page):
+        """Manifest record of a character page"""
+        return {'description': self.extract_character_description(page)}
 
-    def extract_poster(self, soup):
-        """Extract poster image from infobox"""
-        infobox = soup.find('aside', {'class': 'portable-infobox'})
-        if not infobox:
-            return None
-        img = infobox.find('img')
-        return img['src'] if img and img.get('src') else None
+    def extract_character_links(self, page):
+        """Names and URLs of the characters linked from the Characters section"""
+        # Find Characters section
+        section = page.find_section(title_keywords=['character'])
+        if section is None:
+            return []
 
-    def get_character_description_from_page(self, char_url):
-        """Fetch character description directly from character page"""
-        soup = self.get_soup(char_url)
-        if not soup:
-            return None
-        
-        content = soup.find('div', {'class': 'mw-parser-output'})
-        if not content:
-            return None
-        
-        paragraphs = content.find_all('p', recursive=False)
-        
-        for p in paragraphs:
-            text = p.get_text(" ", strip=True)
-            
-            if len(text) < 50:
-                continue
-            
-            # Skip voice actor lines
-            parentheses_count = text.count('(')
-            comma_count = text.count(',')
-            
-            if parentheses_count >= 2 and comma_count >= 2 and len(text) < 200:
-                continue
-            
-            voice_keywords = ['(Japanese)', '(English)', '(Disney)', 'voiced by', 'voice actor']
-            if any(keyword in text for keyword in voice_keywords) and len(text) < 200:
-                continue
-            
-            return text[:600]
-        
-        return None
-
-    def scrape_characters_from_series(self, soup, series_title):
-        """Extract characters from Characters section"""
-        results = []
-        content = soup.find('div', {'class': 'mw-parser-output'})
-        if not content:
-            return results
-
-        # Find Characters heading
-        char_heading = None
-        for h2 in content.find_all('h2'):
-            span = h2.find('span', class_='mw-headline')
-            if span and 'character' in span.get_text(strip=True).lower():
-                char_heading = h2
-                break
-
-        if not char_heading:
-            return results
-
-        current = char_heading.find_next_sibling()
-        char_count = 0
         char_urls_found = []
+        seen = set()
         
         # Collect character URLs from various formats
-        while current and char_count < 20:
-            if current.name in ['h2', 'h1']:
-                break
-            
+        for current in section:
             # Skip h3/h4 headings (like "Principal cast", "Secondary cast")
             if current.name in ['h3', 'h4']:
-                current = current.find_next_sibling()
                 continue
             
             # From table (common in TV series pages)
@@ -339,15 +172,12 @@ class GhibliSeriesScraper:
                                 
                                 char_url = urljoin(self.base_url, href)
                                 
-                                if char_url not in [c['url'] for c in char_urls_found]:
+                                if canonical_url(char_url) not in seen:
                                     char_urls_found.append({
                                         'name': name,
                                         'url': char_url
                                     })
-                                    char_count += 1
-                                    
-                                    if char_count >= 20:
-                                        break
+                                    seen.add(canonical_url(char_url))
             
             # From definition list
             elif current.name == 'dl':
@@ -363,15 +193,12 @@ class GhibliSeriesScraper:
                             
                             char_url = urljoin(self.base_url, href)
                             
-                            if char_url not in [c['url'] for c in char_urls_found]:
+                            if canonical_url(char_url) not in seen:
                                 char_urls_found.append({
                                     'name': name,
                                     'url': char_url
                                 })
-                                char_count += 1
-                                
-                                if char_count >= 20:
-                                    break
+                                seen.add(canonical_url(char_url))
             
             # From list items
             elif current.name == 'ul':
@@ -392,104 +219,125 @@ class GhibliSeriesScraper:
                             
                             char_url = urljoin(self.base_url, href)
                             
-                            if char_url not in [c['url'] for c in char_urls_found]:
+                            if canonical_url(char_url) not in seen:
                                 char_urls_found.append({
                                     'name': name,
                                     'url': char_url
                                 })
-                                char_count += 1
-                                
-                                if char_count >= 20:
-                                    break
-            
-            current = current.find_next_sibling()
+                                seen.add(canonical_url(char_url))
 
-        # Fetch descriptions for each character (if valid character pages exist)
-        if char_urls_found:
-            print(f"    -> Found {len(char_urls_found)} characters, fetching descriptions...")
-        
-        for char_info in char_urls_found:
+        return char_urls_found
+
+    def fetch_descriptions(self, char_urls_found):
+        """Canonical character URL -> description, each page fetched once, in parallel (parsed in the parse pool if any)"""
+        unique = self.unique_links(char_urls_found)
+        for char_info in unique:
             print(f"       - Fetching description for: {char_info['name']}")
-            
-            description = self.get_character_description_from_page(char_info['url'])
-            
+        self.prefetch(c['url'] for c in unique)
+        records = self.scrape_pages('character_record', [(c['url'],) for c in unique])
+        return {canonical_url(c['url']): record['description'] if record else None for c, record in zip(unique, records)}
+
+    def character_entries(self, char_urls_found, series_title, descriptions):
+        """Character entries of a series, merged into the global characters list"""
+        results = []
+        for char_info in char_urls_found:
             results.append({
                 'name': char_info['name'],
                 'url': char_info['url'],
-                'description': description,
+                'description': descriptions.get(canonical_url(char_info['url'])),
                 'appears_in': [series_title]
             })
-            
-            time.sleep(0.5)
 
         # Update global characters list
-        seen_urls = {c['url'] for c in self.characters}
-        for char in results:
-            if char['url'] not in seen_urls:
-                self.characters.append(char)
-                seen_urls.add(char['url'])
-            else:
-                for existing in self.characters:
-                    if existing['url'] == char['url']:
-                        if series_title not in existing['appears_in']:
-                            existing['appears_in'].append(series_title)
-                        if char.get('description') and (
-                            not existing.get('description') or 
-                            len(char['description']) > len(existing.get('description', ''))
-                        ):
-                            existing['description'] = char['description']
+        self.registry.merge(results, series_title)
 
         return results
 
-    def scrape_series_detail(self, series_url, series_title):
-        """Scrape detailed information for a series"""
-        print(f"[+] Scraping series: {series_title}")
-        soup = self.get_soup(series_url)
-        if not soup:
+    def extract_series_record(self, page):
+        """Fields and character links of a series page"""
+        return {
+            'fields': self.extract_fields(page),
+            'character_links': self.extract_character_links(page),
+        }
+
+    def series_from_record(self, link, record):
+        """(series data without characters, character links) of a series page record"""
+        if not record:
             return None
 
-        release_info = self.extract_release_info(soup)
-        
         series_data = {
-            'title': series_title,
-            'url': series_url,
-            'director': self.extract_director(soup),
-            'release_date': release_info['release_date'],
-            'release_year': release_info['release_year'],
-            'episodes': self.extract_episodes(soup),
-            'running_time': self.extract_running_time(soup),
-            'studio': self.extract_studio(soup),
-            'description': self.extract_description(soup),
-            'plot': self.extract_plot_or_overview(soup),
-            'poster_url': self.extract_poster(soup),
-            'characters': []
+            'title': link['title'],
+            'url': link['url'],
         }
+        series_data.update(record['fields'])
+        return series_data, record['character_links']
 
-        # Scrape characters
-        chars = self.scrape_characters_from_series(soup, series_title)
-        series_data['characters'] = chars
-
-        return series_data
+    def visit_series(self, series_links, depth):
+        """Fetch a level of series pages in parallel, their characters are queued one level deeper"""
+        print(f"[i] Candidate series links: {len(series_links)}")
+        self.prefetch(s['url'] for s in series_links)
+        for link in series_links:
+            print(f"[+] Scraping series: {link['title']}")
+        with self.metrics.timer('phase_seconds', scraper='series', phase='series'):
+            records = self.scrape_pages('extract_series_record', [(link['url'],) for link in series_links])
+            for link, record in zip(series_links, records):
+                entry = self.series_from_record(link, record)
+                if not entry:
+                    continue
+                series, char_links = entry
+                for char_link in char_links:
+                    self.frontier.push('character', char_link, depth + 1)
+                # Keep it if it has any meaningful data
+                keep = bool(series.get('director') or 
+                            series.get('episodes') or 
+                            series.get('description') or
+                            series.get('plot'))
+                if self.stream:
+                    if keep:
+                        # Character entries are patched in once every series is merged
+                        stubs = [{'name': c['name'], 'url': c['url']} for c in char_links]
+                        self.stream.emit('series', dict(series, characters=stubs))
+                    series = {'title': series['title'], 'url': series['url']}
+                self.scraped.append((series, char_links, keep))
+
+    def visit_characters(self, char_links, depth):
+        """Fetch the descriptions of a level of character pages"""
+        with self.metrics.timer('phase_seconds', scraper='series', phase='characters'):
+            self.descriptions.update(self.fetch_descriptions(char_links))
 
     def scrape_all(self):
         """Scrape all series"""
         print("[*] Starting series scraping...")
-        series_links = self.scrape_series_list()
-        print(f"[i] Candidate series links: {len(series_links)}")
-
-        for s in series_links:
-            time.sleep(0.8)
-            series = self.scrape_series_detail(s['url'], s['title'])
-            if series:
-                # Add to list if it has any meaningful data
-                if (series.get('director') or 
-                    series.get('episodes') or 
-                    series.get('description') or
-                    series.get('plot')):
-                    self.series.append(series)
+        with self.metrics.timer('phase_seconds', scraper='series', phase='list'):
+            links = self.scrape_series_list()
+        for link in links:
+            self.frontier.push('series', link)
+        self.crawl()
+
+        for series, char_links, keep in self.scraped:
+            chars = self.admitted_links('character', char_links)
+            if chars:
+                print(f"    -> {series['title']}: {len(chars)} characters")
+            series['characters'] = self.character_entries(chars, series['title'], self.descriptions)
+            if keep:
+                self.series.append(series)
+
+        if self.stream:
+            # Character entries are shared with the characters list, their
+            # appears_in is final only once every series is merged
+            for series in self.series:
+                self.stream.patch('series', {'url': series['url'], 'characters': series.pop('characters')})
 
         print(f"[i] Series scraped: {len(self.series)}")
         print(f"[i] Characters found: {len(self.characters)}")
+        print(f"[i] Frontier: {self.frontier.summary()}")
+        if self.stream:
+            # appears_in is final only once every series is merged
+            for char in self.characters:
+                self.stream.emit('characters', char)
+            for failure in self.failed_report():
+                self.stream.emit('failed_urls', failure)
+        print(f"[i] Failed URLs: {len(self.failed)}")
         print("[*] Scraping complete")
         return {
             'series': self.series,
@@ -500,7 +348,8 @@ class GhibliSeriesScraper:
         """Save series data to JSON file"""
         data = {
             'series': self.series,
-            'characters': self.characters
+            'characters': self.characters,
+            'failed_urls': self.failed_report(),
         }
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
@@ -547,7 +396,35 @@ class GhibliSeriesScraper:
                 print(f"   Description: N/A")
 
 if __name__ == "__main__":
-    scraper = GhibliSeriesScraper()
+    parser = argparse.ArgumentParser(description="Scrape Studio Ghibli TV series from ghibli.fandom.com")
+    add_crawl_arguments(parser)
+    add_cache_arguments(parser)
+    add_parser_argument(parser)
+    add_parse_workers_argument(parser)
+    add_source_argument(parser)
+    add_incremental_argument(parser)
+    add_stream_argument(parser)
+    add_frontier_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    output = '../data/series.json'
+    scraper = GhibliSeriesScraper(concurrency=args.concurrency, rate=args.rate,
+                          cache=cache_from_args(args), parser=args.parser,
+                          full_parse=args.full_parse, source=args.source,
+                          manifest_path=RevisionManifest.path_for(output) if args.incremental else None,
+                          stream=RecordStream(output) if args.stream else None,
+                          frontier=frontier_from_args(args), parse_pool=parse_pool_from_args(args))
     data = scraper.scrape_all()
-    scraper.save_to_json('../data/series.json')
+    if scraper.parse_pool:
+        scraper.parse_pool.close()
+    if scraper.stream:
+        scraper.stream.merge(['series', 'characters', 'failed_urls'])
+    else:
+        scraper.save_to_json(output)
+    if scraper.manifest:
+        scraper.manifest.save()
+    if scraper.cache:
+        scraper.cache.flush()
+    write_metrics(scraper.metrics, args)
     scraper.print_summary()
\ No newline at end of file
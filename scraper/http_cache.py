@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Next to the scrapers, whatever directory they are started from
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.http_cache')
+
+
+class CacheMiss(Exception):
+    """Raised in offline mode when a URL was never cached"""
+
+
+class HTTPCache:
+    """
+    On-disk cache of raw HTML keyed by URL.
+
+    Bodies are stored content-addressed under objects/ (file name is the
+    sha256 of the body), and each URL has a small metadata file under meta/
+    with the body hash, ETag, Last-Modified and timestamps. Entries older than
+    ttl (every entry by default) are revalidated with If-None-Match /
+    If-Modified-Since, so an unchanged page costs a 304 instead of a download.
+
+    Access times of cache hits are kept in memory and written to the meta
+    files by flush(), which evict() runs first.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=0, max_bytes=512 * 1024 * 1024, offline=False):
+        """
+        Args:
+            cache_dir: Directory holding the cache
+            ttl: Seconds an entry is served without revalidation, 0 always revalidates
+            max_bytes: Size limit of stored bodies, least recently used go first
+            offline: Serve only from cache, never touch the network
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        # Metrics of the run, set by the Fetcher using this cache
+        self.metrics = None
+        self.meta_dir = os.path.join(cache_dir, 'meta')
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        os.makedirs(self.meta_dir, exist_ok=True)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        # URL -> access time not written to its meta file yet
+        self.used = {}
+        self.total_bytes = sum(
+            os.path.getsize(os.path.join(self.objects_dir, name))
+            for name in os.listdir(self.objects_dir)
+        )
+
+    def _meta_path(self, url):
+        return os.path.join(self.meta_dir, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest)
+
+    def _write_json(self, path, data):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def lookup(self, url):
+        """Return (meta, body) for a cached URL, or (None, None)"""
+        try:
+            with open(self._meta_path(url), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(self._object_path(meta['body']), 'rb') as f:
+                return meta, f.read()
+        except (OSError, ValueError, KeyError):
+            return None, None
+
+    def store(self, url, body, etag=None, last_modified=None):
+        digest = hashlib.sha256(body).hexdigest()
+        now = time.time()
+        with self.lock:
+            path = self._object_path(digest)
+            if not os.path.exists(path):
+                with open(path + '.tmp', 'wb') as f:
+                    f.write(body)
+                os.replace(path + '.tmp', path)
+                self.total_bytes += len(body)
+            self.used.pop(url, None)
+            self._write_json(self._meta_path(url), {
+                'url': url,
+                'body': digest,
+                'etag': etag,
+                'last_modified': last_modified,
+                'fetched_at': now,
+                'used_at': now,
+            })
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def touch(self, url, meta, refreshed=False):
+        """Note an access of url; a revalidated entry is written right away with its new fetched_at"""
+        now = time.time()
+        with self.lock:
+            if not refreshed:
+                self.used[url] = now
+                return
+            self.used.pop(url, None)
+            meta['used_at'] = meta['fetched_at'] = now
+            self._write_json(self._meta_path(url), meta)
+
+    def flush(self):
+        """Write the access times kept in memory to the meta files"""
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        for url, used_at in self.used.items():
+            path = self._meta_path(url)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            meta['used_at'] = max(used_at, meta.get('used_at', 0))
+            self._write_json(path, meta)
+        self.used = {}
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes (called with the lock held)"""
+        self._flush()
+        entries = []
+        for name in os.listdir(self.meta_dir):
+            try:
+                with open(os.path.join(self.meta_dir, name), 'r', encoding='utf-8') as f:
+                    entries.append((json.load(f), name))
+            except (OSError, ValueError):
+                continue
+        entries.sort(key=lambda e: e[0].get('used_at', 0))
+
+        refs = {}
+        for meta, _ in entries:
+            refs[meta.get('body')] = refs.get(meta.get('body'), 0) + 1
+
+        # Bodies no URL points to anymore (replaced by a newer body of their
+        # URL) go first, the total is recounted from what is left
+        self.total_bytes = 0
+        for name in os.listdir(self.objects_dir):
+            path = self._object_path(name)
+            if name.endswith('.tmp'):
+                continue
+            if name not in refs:
+                os.remove(path)
+            else:
+                self.total_bytes += os.path.getsize(path)
+
+        for meta, name in entries:
+            if self.total_bytes <= self.max_bytes * 0.9:
+                break
+            os.remove(os.path.join(self.meta_dir, name))
+            digest = meta.get('body')
+            refs[digest] -= 1
+            path = self._object_path(digest)
+            if refs[digest] == 0 and os.path.exists(path):
+                self.total_bytes -= os.path.getsize(path)
+                os.remove(path)
+
+    def count(self, result):
+        if self.metrics:
+            self.metrics.inc('cache_requests_total', result=result)
+
+    def fetch(self, url, request, fresh=False):
+        """
+        Return the body of url, from cache when possible.
+
+        Args:
+            url: Page URL
+            request: Callable request(url, headers) returning a requests.Response
+            fresh: Revalidate the entry even when it is younger than ttl
+        """
+        meta, body = self.lookup(url)
+
+        if self.offline:
+            if body is None:
+                self.count('miss')
+                raise CacheMiss(f"not in cache: {url}")
+            self.count('hit')
+            return body
+
+        if body is not None and not fresh and time.time() - meta.get('fetched_at', 0) < self.ttl:
+            self.touch(url, meta)
+            self.count('hit')
+            return body
+
+        headers = {}
+        if body is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        resp = request(url, headers)
+        if resp.status_code == 304 and body is not None:
+            self.touch(url, meta, refreshed=True)
+            self.count('revalidated')
+            return body
+
+        self.count('miss')
+        resp.raise_for_status()
+        self.store(url, resp.content, resp.headers.get('ETag'), resp.headers.get('Last-Modified'))
+        return resp.content
+
+
+def add_cache_arguments(parser):
+    """Register the cache command line options shared by the scrapers"""
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help="directory of the HTML cache (default: scraper/.http_cache)")
+    parser.add_argument('--cache-ttl', type=float, default=0,
+                        help="seconds a cached page is served without asking the wiki whether it changed "
+                             "(default: 0, every page is revalidated)")
+    parser.add_argument('--cache-max-mb', type=int, default=512,
+                        help="size limit of the cache in MB (default: 512)")
+    parser.add_argument('--no-cache', action='store_true', help="always download pages")
+    parser.add_argument('--from-cache', action='store_true',
+                        help="offline mode, only read pages already in the cache")
+
+
+def cache_from_args(args):
+    if args.no_cache:
+        return None
+    return HTTPCache(
+        cache_dir=args.cache_dir,
+        ttl=args.cache_ttl,
+        max_bytes=args.cache_max_mb * 1024 * 1024,
+        offline=args.from_cache,
+    )
@@ -1,10 +1,84 @@
+import collections
+import glob
+import gzip
+import io
+import itertools
 import json
 import re
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
 import os
 
+import rdf_thrift
+from record_stream import read_records
+
+# Output formats: name -> (label, extension)
+FORMATS = {
+    'turtle': ('Turtle', '.ttl'),
+    'ntriples': ('N-Triples', '.nt'),
+    'nquads': ('N-Quads', '.nq'),
+    'thrift': ('RDF Thrift', '.trdf.gz'),
+}
+BINARY_FORMATS = {'thrift'}
+DEFAULT_GRAPH = 'http://ghibliwiki.org/graph/ghibli'
+
+# Sections in output order: name -> (Turtle heading, record items method,
+# left out of the Turtle file when it has no records)
+SECTIONS = {
+    'films': ('FILMS', 'film_items', True),
+    'series': ('TV SERIES', 'series_items', True),
+    'shorts': ('SHORT FILMS', 'short_items', True),
+    'characters': ('CHARACTERS', 'character_items', False),
+    'directors': ('DIRECTORS', 'director_items', False),
+    'genres': ('GENRES', 'genre_items', False),
+    'studios': ('STUDIOS', 'studio_items', False),
+}
+# Turtle records of these sections end with "... ." instead of "...  ."
+TERSE_SECTIONS = {'genres', 'studios'}
+
+# Records per batch handed to a serializer process
+BATCH_SIZE = 256
+
+RDF_TYPE = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#type'
+XSD = 'http://www.w3.org/2001/XMLSchema#'
+_INTEGER = re.compile(r'[+-]?\d+')
+_DECIMAL = re.compile(r'[+-]?\d*\.\d+')
+_ESCAPE = re.compile(r'\\(.)')
+
+
+class TurtleWriter:
+    """
+    Writes Turtle lines to an open file as they are produced, so the whole
+    document never has to be held in memory. Lines are separated by a
+    newline, like "\n".join() of every section would do.
+    """
+    
+    BUFFER_SIZE = 1024 * 1024
+    
+    def __init__(self, f):
+        self.f = f
+        self.separator = ""
+    
+    def write(self, line):
+        self.f.write(self.separator + line)
+        self.separator = "\n"
+    
+    def write_lines(self, lines):
+        for line in lines:
+            self.write(line)
+
+
+def open_output(path, binary=False):
+    """Output file of convert_all, gzip compressed when path ends with .gz (Jena reads those as is)"""
+    if path.endswith('.gz'):
+        f = io.BufferedWriter(gzip.GzipFile(path, 'wb', compresslevel=6), TurtleWriter.BUFFER_SIZE)
+    else:
+        f = open(path, 'wb', buffering=TurtleWriter.BUFFER_SIZE)
+    return f if binary else io.TextIOWrapper(f, encoding='utf-8')
+
+
 class GhibliRDFConverter:
-    def __init__(self, films_json=None, series_json=None, shorts_json=None):
+    def __init__(self, films_json=None, series_json=None, shorts_json=None, stream=False):
         """
         Initialize converter with paths to JSON files
         
@@ -12,28 +86,34 @@ class GhibliRDFConverter:
             films_json: Path to films JSON file (default: ghibli_data.json)
             series_json: Path to series JSON file (default: series.json)
             shorts_json: Path to shorts JSON file (default: shorts.json)
+            stream: Read the records from disk one at a time while converting
+                instead of loading the JSON files, for datasets too large
+                to hold in memory
         """
         self.films_data = {}
         self.series_data = {}
         self.shorts_data = {}
-        
-        # Load films data
-        if films_json and os.path.exists(films_json):
-            print(f"Loading films from: {films_json}")
-            with open(films_json, 'r', encoding='utf-8') as f:
-                self.films_data = json.load(f)
-        
-        # Load series data
-        if series_json and os.path.exists(series_json):
-            print(f"Loading series from: {series_json}")
-            with open(series_json, 'r', encoding='utf-8') as f:
-                self.series_data = json.load(f)
-        
-        # Load shorts data
-        if shorts_json and os.path.exists(shorts_json):
-            print(f"Loading shorts from: {shorts_json}")
-            with open(shorts_json, 'r', encoding='utf-8') as f:
-                self.shorts_data = json.load(f)
+        self.stream = stream
+        self.paths = {}
+        self.thrift_cache = {}
+        
+        for name, path in (('films', films_json), ('series', series_json), ('shorts', shorts_json)):
+            if not path:
+                continue
+            if stream:
+                # Also accepts the .jsonl streams of a crawl still running
+                if os.path.exists(path) or glob.glob(glob.escape(os.path.splitext(path)[0]) + '.*.jsonl'):
+                    print(f"Streaming {name} from: {path}")
+                    self.paths[name] = path
+            elif os.path.exists(path):
+                print(f"Loading {name} from: {path}")
+                with open(path, 'r', encoding='utf-8') as f:
+                    setattr(self, f"{name}_data", json.load(f))
+        
+        # One pass over the input for everything the records point to across
+        # datasets (titles, merged appearances, directed works), so cross
+        # references resolve without scanning the catalogue
+        self.build_index()
         
         self.namespaces = {
             'ghibli': 'http://ghibliwiki.org/ontology#',
@@ -50,6 +130,69 @@ class GhibliRDFConverter:
             'owl': 'http://www.w3.org/2002/07/owl#'
         }
     
+    def records(self, dataset, kind):
+        """Records of one kind ('movies', 'characters', ...) of the films, series or shorts data"""
+        if self.stream:
+            return read_records(self.paths[dataset], kind) if dataset in self.paths else iter(())
+        return iter(getattr(self, f"{dataset}_data").get(kind, []))
+    
+    def build_index(self):
+        """
+        Collect what the converters look up across records and datasets:
+        
+        - title_index: title -> namespace prefix of every film, short and
+          series. A title found in several lists resolves to series first,
+          then short, then movie, the same order the converters always used.
+        - series_appearances: character id -> appears_in lists of the series
+          characters, merged into the character of the same id
+        - director_works: director id -> (name, directed titles), films
+          directors first
+        - genres, studios and the record counts
+        """
+        self.title_index = {}
+        self.series_appearances = {}
+        self.director_works = {}
+        self.genres = set()
+        self.studios = set()
+        self.counts = dict.fromkeys(['movies', 'film_characters', 'directors', 'series', 'series_characters',
+                                     'shorts'], 0)
+        
+        def add_works(name, works):
+            director_id = self.sanitize_uri(name)
+            if director_id not in self.director_works:
+                self.director_works[director_id] = (name, {})
+            # Works in the order they are first seen, so the output is the same every run
+            self.director_works[director_id][1].update(dict.fromkeys(works))
+        
+        for movie in self.records('films', 'movies'):
+            self.counts['movies'] += 1
+            self.title_index[movie['title']] = 'movie'
+            self.genres.update(movie.get('genres', []))
+        self.counts['film_characters'] = sum(1 for _ in self.records('films', 'characters'))
+        for director in self.records('films', 'directors'):
+            self.counts['directors'] += 1
+            add_works(director['name'], director.get('notable_works', []))
+        
+        for series in self.records('series', 'series'):
+            self.counts['series'] += 1
+            self.title_index[series['title']] = 'series'
+            if series.get('director'):
+                add_works(series['director'], [series['title']])
+            if series.get('studio'):
+                self.studios.add(series['studio'])
+        for short in self.records('shorts', 'shorts'):
+            self.counts['shorts'] += 1
+            if self.title_index.get(short['title']) != 'series':
+                self.title_index[short['title']] = 'short'
+            if short.get('director'):
+                add_works(short['director'], [short['title']])
+            if short.get('studio'):
+                self.studios.add(short['studio'])
+        
+        for char in self.records('series', 'characters'):
+            self.counts['series_characters'] += 1
+            self.series_appearances.setdefault(self.sanitize_uri(char['name']), []).append(char.get('appears_in', []))
+    
     def sanitize_uri(self, text):
         """Convert text ke URI-safe format"""
         if not text:
@@ -83,460 +226,521 @@ class GhibliRDFConverter:
         lines.append("")
         return "\n".join(lines)
     
+    def section_lines(self, name):
+        """Turtle lines of one section ('films', 'characters', ...), one record at a time"""
+        for chunk in self.section_jobs(name, 'turtle', batch_size=1):
+            if isinstance(chunk, str):
+                yield chunk
+            else:
+                yield from self.batch_lines('turtle', *chunk)
+    
     def convert_films(self):
         """Convert films data ke RDF"""
-        movies = self.films_data.get('movies', [])
-        if not movies:
-            return ""
-        
-        lines = ["# =============================="]
-        lines.append("# FILMS")
-        lines.append("# ==============================\n")
-        
-        for movie in movies:
-            movie_id = self.sanitize_uri(movie['title'])
-            movie_uri = f"movie:{movie_id}"
-            
-            lines.append(f"{movie_uri} a ghibli:Film ;")
-            lines.append(f'    ghibli:title "{self.escape_literal(movie["title"])}" ;')
-            
-            if movie.get('release_year'):
-                lines.append(f'    ghibli:releaseYear {movie["release_year"]} ;')
-            
-            if movie.get('director'):
-                director_id = self.sanitize_uri(movie['director'])
-                lines.append(f'    ghibli:hasDirector director:{director_id} ;')
-            
-            if movie.get('duration'):
-                duration = self.escape_literal(movie['duration'])
-                lines.append(f'    ghibli:duration "{duration}" ;')
-            
-            if movie.get('description'):
-                desc = self.escape_literal(movie['description'])
-                lines.append(f'    ghibli:description "{desc}" ;')
-            
-            if movie.get('synopsis'):
-                synopsis = self.escape_literal(movie['synopsis'])
-                lines.append(f'    ghibli:synopsis "{synopsis}" ;')
-            
-            if movie.get('poster_url'):
-                lines.append(f'    ghibli:posterURL <{movie["poster_url"]}> ;')
-            
-            # Add genres
-            if movie.get('genres'):
-                for genre in movie['genres']:
-                    genre_id = self.sanitize_uri(genre)
-                    lines.append(f'    ghibli:hasGenre genre:{genre_id} ;')
-            
-            # Add characters
-            if movie.get('characters'):
-                for char in movie['characters']:
-                    char_name = char.get('name') if isinstance(char, dict) else char
-                    if char_name:
-                        char_id = self.sanitize_uri(char_name)
-                        lines.append(f'    ghibli:hasCharacter char:{char_id} ;')
-            
-            # Remove last semicolon and add period
-            lines[-1] = lines[-1].rstrip(';') + ' .'
-            lines.append("")
-        
-        return "\n".join(lines)
+        return "\n".join(self.section_lines('films'))
     
     def convert_series(self):
         """Convert series data ke RDF"""
-        series_list = self.series_data.get('series', [])
-        if not series_list:
-            return ""
-        
-        lines = ["# =============================="]
-        lines.append("# TV SERIES")
-        lines.append("# ==============================\n")
-        
-        for series in series_list:
-            series_id = self.sanitize_uri(series['title'])
-            series_uri = f"series:{series_id}"
-            
-            lines.append(f"{series_uri} a ghibli:Series ;")
-            lines.append(f'    ghibli:title "{self.escape_literal(series["title"])}" ;')
-            
-            if series.get('release_year'):
-                lines.append(f'    ghibli:releaseYear {series["release_year"]} ;')
-            
-            if series.get('release_date'):
-                date = self.escape_literal(series['release_date'])
-                lines.append(f'    ghibli:releaseDate "{date}" ;')
-            
-            if series.get('director'):
-                director_id = self.sanitize_uri(series['director'])
-                lines.append(f'    ghibli:hasDirector director:{director_id} ;')
-            
-            if series.get('episodes'):
-                lines.append(f'    ghibli:numberOfEpisodes {series["episodes"]} ;')
-            
-            if series.get('running_time'):
-                runtime = self.escape_literal(series['running_time'])
-                lines.append(f'    ghibli:runningTime "{runtime}" ;')
-            
-            if series.get('studio'):
-                studio_id = self.sanitize_uri(series['studio'])
-                lines.append(f'    ghibli:producedBy studio:{studio_id} ;')
-            
-            if series.get('description'):
-                desc = self.escape_literal(series['description'])
-                lines.append(f'    ghibli:description "{desc}" ;')
-            
-            if series.get('plot'):
-                plot = self.escape_literal(series['plot'])
-                lines.append(f'    ghibli:plot "{plot}" ;')
-            
-            if series.get('poster_url'):
-                lines.append(f'    ghibli:posterURL <{series["poster_url"]}> ;')
-            
-            # Add characters
-            if series.get('characters'):
-                for char in series['characters']:
-                    char_name = char.get('name') if isinstance(char, dict) else char
-                    if char_name:
-                        char_id = self.sanitize_uri(char_name)
-                        lines.append(f'    ghibli:hasCharacter char:{char_id} ;')
-            
-            # Remove last semicolon and add period
-            lines[-1] = lines[-1].rstrip(';') + ' .'
-            lines.append("")
-        
-        return "\n".join(lines)
+        return "\n".join(self.section_lines('series'))
     
     def convert_shorts(self):
         """Convert shorts data ke RDF"""
-        shorts = self.shorts_data.get('shorts', [])
-        if not shorts:
-            return ""
-        
-        lines = ["# =============================="]
-        lines.append("# SHORT FILMS")
-        lines.append("# ==============================\n")
-        
-        for short in shorts:
-            short_id = self.sanitize_uri(short['title'])
-            short_uri = f"short:{short_id}"
-            
-            lines.append(f"{short_uri} a ghibli:ShortFilm ;")
-            lines.append(f'    ghibli:title "{self.escape_literal(short["title"])}" ;')
-            
-            if short.get('release_year'):
-                lines.append(f'    ghibli:releaseYear {short["release_year"]} ;')
-            
-            if short.get('release_date'):
-                date = self.escape_literal(short['release_date'])
-                lines.append(f'    ghibli:releaseDate "{date}" ;')
-            
-            if short.get('director'):
-                director_id = self.sanitize_uri(short['director'])
-                lines.append(f'    ghibli:hasDirector director:{director_id} ;')
-            
-            if short.get('duration'):
-                duration = self.escape_literal(short['duration'])
-                lines.append(f'    ghibli:duration "{duration}" ;')
-            
-            if short.get('studio'):
-                studio_id = self.sanitize_uri(short['studio'])
-                lines.append(f'    ghibli:producedBy studio:{studio_id} ;')
-            
-            if short.get('description'):
-                desc = self.escape_literal(short['description'])
-                lines.append(f'    ghibli:description "{desc}" ;')
-            
-            if short.get('plot'):
-                plot = self.escape_literal(short['plot'])
-                lines.append(f'    ghibli:plot "{plot}" ;')
-            
-            if short.get('poster_url'):
-                lines.append(f'    ghibli:posterURL <{short["poster_url"]}> ;')
-            
-            # Remove last semicolon and add period
-            lines[-1] = lines[-1].rstrip(';') + ' .'
-            lines.append("")
-        
-        return "\n".join(lines)
+        return "\n".join(self.section_lines('shorts'))
     
     def convert_characters(self):
         """Convert all characters data ke RDF"""
-        lines = ["# =============================="]
-        lines.append("# CHARACTERS")
-        lines.append("# ==============================\n")
-        
-        # Collect all characters from all sources
-        all_characters = {}
-        
-        # From films
-        for char in self.films_data.get('characters', []):
-            char_id = self.sanitize_uri(char['name'])
-            if char_id not in all_characters:
-                all_characters[char_id] = char
-        
-        # From series
-        for char in self.series_data.get('characters', []):
-            char_id = self.sanitize_uri(char['name'])
-            if char_id not in all_characters:
-                all_characters[char_id] = char
-            else:
-                # Merge appears_in
-                existing_appears = set(all_characters[char_id].get('appears_in', []))
-                new_appears = set(char.get('appears_in', []))
-                all_characters[char_id]['appears_in'] = list(existing_appears | new_appears)
-        
-        # Generate RDF for each character
-        for char_id, char in all_characters.items():
-            char_uri = f"char:{char_id}"
-            
-            lines.append(f"{char_uri} a ghibli:Character ;")
-            lines.append(f'    ghibli:name "{self.escape_literal(char["name"])}" ;')
-            
-            if char.get('age'):
-                age = self.escape_literal(char['age'])
-                lines.append(f'    ghibli:age "{age}" ;')
-            
-            if char.get('gender'):
-                gender = self.escape_literal(char['gender'])
-                lines.append(f'    ghibli:gender "{gender}" ;')
-            
-            if char.get('description'):
-                desc = self.escape_literal(char['description'])
-                lines.append(f'    ghibli:description "{desc}" ;')
-            
-            if char.get('image_url'):
-                lines.append(f'    ghibli:imageURL <{char["image_url"]}> ;')
-            
-            # Add appearsIn relations
-            for title in char.get('appears_in', []):
-                # Determine if it's a film, series, or unknown
-                title_id = self.sanitize_uri(title)
-                
-                # Check if it's in series
-                is_series = any(s['title'] == title for s in self.series_data.get('series', []))
-                # Check if it's in films
-                is_film = any(m['title'] == title for m in self.films_data.get('movies', []))
-                
-                if is_series:
-                    lines.append(f'    ghibli:appearsIn series:{title_id} ;')
-                elif is_film:
-                    lines.append(f'    ghibli:appearsIn movie:{title_id} ;')
-                else:
-                    # Default to movie namespace
-                    lines.append(f'    ghibli:appearsIn movie:{title_id} ;')
-            
-            # Remove last semicolon and add period
-            lines[-1] = lines[-1].rstrip(';') + ' .'
-            lines.append("")
-        
-        return "\n".join(lines)
+        return "\n".join(self.section_lines('characters'))
     
     def convert_directors(self):
         """Convert all directors data ke RDF"""
-        lines = ["# =============================="]
-        lines.append("# DIRECTORS")
-        lines.append("# ==============================\n")
-        
-        # Collect all unique directors
-        all_directors = {}
-        
-        # From films - with full detail data
-        for director in self.films_data.get('directors', []):
-            director_id = self.sanitize_uri(director['name'])
-            if director_id not in all_directors:
-                all_directors[director_id] = {
-                    'name': director['name'],
-                    'born': director.get('born'),
-                    'birth_year': director.get('birth_year'),
-                    'nationality': director.get('nationality'),
-                    'description': director.get('description'),
-                    'history': director.get('history'),
-                    'url': director.get('url'),
-                    'works': set()
-                }
-            all_directors[director_id]['works'].update(director.get('notable_works', []))
-        
-        # From series
-        for series in self.series_data.get('series', []):
-            if series.get('director'):
-                director_id = self.sanitize_uri(series['director'])
-                if director_id not in all_directors:
-                    all_directors[director_id] = {
-                        'name': series['director'],
-                        'works': set()
-                    }
-                all_directors[director_id]['works'].add(series['title'])
-        
-        # From shorts
-        for short in self.shorts_data.get('shorts', []):
-            if short.get('director'):
-                director_id = self.sanitize_uri(short['director'])
-                if director_id not in all_directors:
-                    all_directors[director_id] = {
-                        'name': short['director'],
-                        'works': set()
-                    }
-                all_directors[director_id]['works'].add(short['title'])
-        
-        # Generate RDF
-        for director_id, director_info in all_directors.items():
-            director_uri = f"director:{director_id}"
-            
-            lines.append(f"{director_uri} a ghibli:Director ;")
-            lines.append(f'    ghibli:name "{self.escape_literal(director_info["name"])}" ;')
-            
-            # Add detailed information if available
-            if director_info.get('born'):
-                born = self.escape_literal(director_info['born'])
-                lines.append(f'    ghibli:born "{born}" ;')
-            
-            if director_info.get('birth_year'):
-                lines.append(f'    ghibli:birthYear {director_info["birth_year"]} ;')
-            
-            if director_info.get('nationality'):
-                nationality = self.escape_literal(director_info['nationality'])
-                lines.append(f'    ghibli:nationality "{nationality}" ;')
-            
-            if director_info.get('description'):
-                desc = self.escape_literal(director_info['description'])
-                lines.append(f'    ghibli:description "{desc}" ;')
-            
-            if director_info.get('history'):
-                history = self.escape_literal(director_info['history'])
-                lines.append(f'    ghibli:history "{history}" ;')
-            
-            if director_info.get('url'):
-                lines.append(f'    ghibli:wikiURL <{director_info["url"]}> ;')
-            
-            # Add directed works
-            for work in director_info['works']:
-                work_id = self.sanitize_uri(work)
-                
-                # Determine work type
-                is_series = any(s['title'] == work for s in self.series_data.get('series', []))
-                is_short = any(s['title'] == work for s in self.shorts_data.get('shorts', []))
-                
-                if is_series:
-                    lines.append(f'    ghibli:directs series:{work_id} ;')
-                elif is_short:
-                    lines.append(f'    ghibli:directs short:{work_id} ;')
-                else:
-                    lines.append(f'    ghibli:directs movie:{work_id} ;')
-            
-            # Remove last semicolon and add period
-            lines[-1] = lines[-1].rstrip(';') + ' .'
-            lines.append("")
-        
-        return "\n".join(lines)
+        return "\n".join(self.section_lines('directors'))
     
     def convert_genres(self):
         """Convert all genres ke RDF"""
-        lines = ["# =============================="]
-        lines.append("# GENRES")
-        lines.append("# ==============================\n")
-        
-        # Collect unique genres from films
-        genres = set()
-        for movie in self.films_data.get('movies', []):
-            for genre in movie.get('genres', []):
-                genres.add(genre)
-        
-        for genre in sorted(genres):
-            genre_id = self.sanitize_uri(genre)
-            genre_uri = f"genre:{genre_id}"
-            
-            lines.append(f"{genre_uri} a ghibli:Genre ;")
-            lines.append(f'    ghibli:name "{self.escape_literal(genre)}" .')
-            lines.append("")
-        
-        return "\n".join(lines)
+        return "\n".join(self.section_lines('genres'))
     
     def convert_studios(self):
         """Convert all studios ke RDF"""
-        lines = ["# =============================="]
-        lines.append("# STUDIOS")
-        lines.append("# ==============================\n")
+        return "\n".join(self.section_lines('studios'))
+    
+    # ------------------------------------------------------------------
+    # Records: (subject, type, [(predicate, object)]) in Turtle terms
+    # ------------------------------------------------------------------
+    
+    def film_items(self):
+        for movie in self.records('films', 'movies'):
+            yield 'film_record', (movie,)
+    
+    def film_record(self, movie):
+        movie_id = self.sanitize_uri(movie['title'])
+        pairs = [('ghibli:title', f'"{self.escape_literal(movie["title"])}"')]
         
-        # Collect unique studios
-        studios = set()
+        if movie.get('release_year'):
+            pairs.append(('ghibli:releaseYear', f'{movie["release_year"]}'))
         
-        for series in self.series_data.get('series', []):
-            if series.get('studio'):
-                studios.add(series['studio'])
+        if movie.get('director'):
+            director_id = self.sanitize_uri(movie['director'])
+            pairs.append(('ghibli:hasDirector', f'director:{director_id}'))
         
-        for short in self.shorts_data.get('shorts', []):
-            if short.get('studio'):
-                studios.add(short['studio'])
+        if movie.get('duration'):
+            duration = self.escape_literal(movie['duration'])
+            pairs.append(('ghibli:duration', f'"{duration}"'))
         
-        for studio in sorted(studios):
-            studio_id = self.sanitize_uri(studio)
-            studio_uri = f"studio:{studio_id}"
-            
-            lines.append(f"{studio_uri} a ghibli:Studio ;")
-            lines.append(f'    ghibli:name "{self.escape_literal(studio)}" .')
-            lines.append("")
+        if movie.get('description'):
+            desc = self.escape_literal(movie['description'])
+            pairs.append(('ghibli:description', f'"{desc}"'))
         
-        return "\n".join(lines)
+        if movie.get('synopsis'):
+            synopsis = self.escape_literal(movie['synopsis'])
+            pairs.append(('ghibli:synopsis', f'"{synopsis}"'))
+        
+        if movie.get('poster_url'):
+            pairs.append(('ghibli:posterURL', f'<{movie["poster_url"]}>'))
+        
+        # Add genres
+        if movie.get('genres'):
+            for genre in movie['genres']:
+                genre_id = self.sanitize_uri(genre)
+                pairs.append(('ghibli:hasGenre', f'genre:{genre_id}'))
+        
+        # Add characters
+        if movie.get('characters'):
+            for char in movie['characters']:
+                char_name = char.get('name') if isinstance(char, dict) else char
+                if char_name:
+                    char_id = self.sanitize_uri(char_name)
+                    pairs.append(('ghibli:hasCharacter', f'char:{char_id}'))
+        
+        return f"movie:{movie_id}", 'ghibli:Film', pairs
     
-    def convert_all(self, output_file='ghibli-dataset.ttl'):
-        """Convert semua data ke RDF Turtle"""
-        print("\n Converting JSON files to RDF Turtle...")
+    def series_items(self):
+        for series in self.records('series', 'series'):
+            yield 'series_record', (series,)
+    
+    def series_record(self, series):
+        series_id = self.sanitize_uri(series['title'])
+        pairs = [('ghibli:title', f'"{self.escape_literal(series["title"])}"')]
+        
+        if series.get('release_year'):
+            pairs.append(('ghibli:releaseYear', f'{series["release_year"]}'))
+        
+        if series.get('release_date'):
+            date = self.escape_literal(series['release_date'])
+            pairs.append(('ghibli:releaseDate', f'"{date}"'))
+        
+        if series.get('director'):
+            director_id = self.sanitize_uri(series['director'])
+            pairs.append(('ghibli:hasDirector', f'director:{director_id}'))
+        
+        if series.get('episodes'):
+            pairs.append(('ghibli:numberOfEpisodes', f'{series["episodes"]}'))
         
-        rdf_content = []
+        if series.get('running_time'):
+            runtime = self.escape_literal(series['running_time'])
+            pairs.append(('ghibli:runningTime', f'"{runtime}"'))
         
-        # Add prefixes
-        rdf_content.append(self.write_prefixes())
+        if series.get('studio'):
+            studio_id = self.sanitize_uri(series['studio'])
+            pairs.append(('ghibli:producedBy', f'studio:{studio_id}'))
         
-        # Add films
-        films_rdf = self.convert_films()
-        if films_rdf:
-            rdf_content.append(films_rdf)
+        if series.get('description'):
+            desc = self.escape_literal(series['description'])
+            pairs.append(('ghibli:description', f'"{desc}"'))
         
-        # Add series
-        series_rdf = self.convert_series()
-        if series_rdf:
-            rdf_content.append(series_rdf)
+        if series.get('plot'):
+            plot = self.escape_literal(series['plot'])
+            pairs.append(('ghibli:plot', f'"{plot}"'))
         
-        # Add shorts
-        shorts_rdf = self.convert_shorts()
-        if shorts_rdf:
-            rdf_content.append(shorts_rdf)
+        if series.get('poster_url'):
+            pairs.append(('ghibli:posterURL', f'<{series["poster_url"]}>'))
         
         # Add characters
-        chars_rdf = self.convert_characters()
-        if chars_rdf:
-            rdf_content.append(chars_rdf)
+        if series.get('characters'):
+            for char in series['characters']:
+                char_name = char.get('name') if isinstance(char, dict) else char
+                if char_name:
+                    char_id = self.sanitize_uri(char_name)
+                    pairs.append(('ghibli:hasCharacter', f'char:{char_id}'))
+        
+        return f"series:{series_id}", 'ghibli:Series', pairs
+    
+    def short_items(self):
+        for short in self.records('shorts', 'shorts'):
+            yield 'short_record', (short,)
+    
+    def short_record(self, short):
+        short_id = self.sanitize_uri(short['title'])
+        pairs = [('ghibli:title', f'"{self.escape_literal(short["title"])}"')]
         
-        # Add directors
-        directors_rdf = self.convert_directors()
-        if directors_rdf:
-            rdf_content.append(directors_rdf)
+        if short.get('release_year'):
+            pairs.append(('ghibli:releaseYear', f'{short["release_year"]}'))
         
-        # Add genres
-        genres_rdf = self.convert_genres()
-        if genres_rdf:
-            rdf_content.append(genres_rdf)
+        if short.get('release_date'):
+            date = self.escape_literal(short['release_date'])
+            pairs.append(('ghibli:releaseDate', f'"{date}"'))
+        
+        if short.get('director'):
+            director_id = self.sanitize_uri(short['director'])
+            pairs.append(('ghibli:hasDirector', f'director:{director_id}'))
+        
+        if short.get('duration'):
+            duration = self.escape_literal(short['duration'])
+            pairs.append(('ghibli:duration', f'"{duration}"'))
+        
+        if short.get('studio'):
+            studio_id = self.sanitize_uri(short['studio'])
+            pairs.append(('ghibli:producedBy', f'studio:{studio_id}'))
+        
+        if short.get('description'):
+            desc = self.escape_literal(short['description'])
+            pairs.append(('ghibli:description', f'"{desc}"'))
+        
+        if short.get('plot'):
+            plot = self.escape_literal(short['plot'])
+            pairs.append(('ghibli:plot', f'"{plot}"'))
+        
+        if short.get('poster_url'):
+            pairs.append(('ghibli:posterURL', f'<{short["poster_url"]}>'))
+        
+        return f"short:{short_id}", 'ghibli:ShortFilm', pairs
+    
+    def character_items(self):
+        """
+        Film characters first, then the series characters not in a film.
+        The first record of a name wins, the appearances of the series
+        characters of that name are merged into it.
+        """
+        emitted = set()
+        for char in self.records('films', 'characters'):
+            char_id = self.sanitize_uri(char['name'])
+            if char_id not in emitted:
+                emitted.add(char_id)
+                yield 'character_record', (char_id, char, self.merged_appearances(
+                    char, self.series_appearances.get(char_id, [])))
+        
+        for char in self.records('series', 'characters'):
+            char_id = self.sanitize_uri(char['name'])
+            if char_id not in emitted:
+                emitted.add(char_id)
+                # Its own appears_in is the first of the series appearances
+                yield 'character_record', (char_id, char, self.merged_appearances(
+                    char, self.series_appearances[char_id][1:]))
+    
+    def merged_appearances(self, char, others):
+        appears_in = char.get('appears_in', [])
+        for other in others:
+            appears_in = list(set(appears_in) | set(other))
+        return appears_in
+    
+    def character_record(self, char_id, char, appears_in):
+        pairs = [('ghibli:name', f'"{self.escape_literal(char["name"])}"')]
         
-        # Add studios
-        studios_rdf = self.convert_studios()
-        if studios_rdf:
-            rdf_content.append(studios_rdf)
+        if char.get('age'):
+            age = self.escape_literal(char['age'])
+            pairs.append(('ghibli:age', f'"{age}"'))
         
-        # Write to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("\n".join(rdf_content))
+        if char.get('gender'):
+            gender = self.escape_literal(char['gender'])
+            pairs.append(('ghibli:gender', f'"{gender}"'))
         
-        print(f" RDF dataset saved to {output_file}")
+        if char.get('description'):
+            desc = self.escape_literal(char['description'])
+            pairs.append(('ghibli:description', f'"{desc}"'))
+        
+        if char.get('image_url'):
+            pairs.append(('ghibli:imageURL', f'<{char["image_url"]}>'))
+        
+        # Add appearsIn relations
+        for title in appears_in:
+            # Series, otherwise film (default to movie namespace)
+            title_id = self.sanitize_uri(title)
+            prefix = 'series' if self.title_index.get(title) == 'series' else 'movie'
+            pairs.append(('ghibli:appearsIn', f'{prefix}:{title_id}'))
+        
+        return f"char:{char_id}", 'ghibli:Character', pairs
+    
+    def director_items(self):
+        """Films directors first, with their full detail data, then the directors only known from the series and shorts"""
+        emitted = set()
+        film_directors = self.records('films', 'directors')
+        other_directors = ({'name': name} for name, _ in self.director_works.values())
+        for director_info in itertools.chain(film_directors, other_directors):
+            director_id = self.sanitize_uri(director_info['name'])
+            if director_id not in emitted:
+                emitted.add(director_id)
+                yield 'director_record', (director_id, director_info, list(self.director_works[director_id][1]))
+    
+    def director_record(self, director_id, director_info, works):
+        pairs = [('ghibli:name', f'"{self.escape_literal(director_info["name"])}"')]
+        
+        # Add detailed information if available
+        if director_info.get('born'):
+            born = self.escape_literal(director_info['born'])
+            pairs.append(('ghibli:born', f'"{born}"'))
+        
+        if director_info.get('birth_year'):
+            pairs.append(('ghibli:birthYear', f'{director_info["birth_year"]}'))
+        
+        if director_info.get('nationality'):
+            nationality = self.escape_literal(director_info['nationality'])
+            pairs.append(('ghibli:nationality', f'"{nationality}"'))
+        
+        if director_info.get('description'):
+            desc = self.escape_literal(director_info['description'])
+            pairs.append(('ghibli:description', f'"{desc}"'))
+        
+        if director_info.get('history'):
+            history = self.escape_literal(director_info['history'])
+            pairs.append(('ghibli:history', f'"{history}"'))
+        
+        if director_info.get('url'):
+            pairs.append(('ghibli:wikiURL', f'<{director_info["url"]}>'))
+        
+        # Add directed works
+        for work in works:
+            work_id = self.sanitize_uri(work)
+            
+            # Determine work type, unknown titles are movies
+            prefix = self.title_index.get(work, 'movie')
+            pairs.append(('ghibli:directs', f'{prefix}:{work_id}'))
+        
+        return f"director:{director_id}", 'ghibli:Director', pairs
+    
+    def genre_items(self):
+        for genre in sorted(self.genres):
+            yield 'named_record', ('genre', 'ghibli:Genre', genre)
+    
+    def studio_items(self):
+        for studio in sorted(self.studios):
+            yield 'named_record', ('studio', 'ghibli:Studio', studio)
+    
+    def named_record(self, prefix, rdf_type, name):
+        """Genre or studio: only a name"""
+        return f"{prefix}:{self.sanitize_uri(name)}", rdf_type, [('ghibli:name', f'"{self.escape_literal(name)}"')]
+    
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+    
+    def turtle_lines(self, record, terse=False):
+        """Turtle lines of one record, followed by an empty line"""
+        subject, rdf_type, pairs = record
+        lines = [f"{subject} a {rdf_type} ;"]
+        lines.extend(f"    {predicate} {obj} ;" for predicate, obj in pairs)
+        
+        # Remove last semicolon and add period
+        if terse:
+            lines[-1] = lines[-1][:-2] + ' .'
+        else:
+            lines[-1] = lines[-1].rstrip(';') + ' .'
+        lines.append("")
+        return lines
+    
+    def nt_term(self, term):
+        """A Turtle term of the records as an N-Triples term"""
+        if term.startswith(('"', '<')):
+            return term
+        if _INTEGER.fullmatch(term):
+            return f'"{term}"^^<{XSD}integer>'
+        if _DECIMAL.fullmatch(term):
+            return f'"{term}"^^<{XSD}decimal>'
+        prefix, sep, local = term.partition(':')
+        if sep and prefix in self.namespaces:
+            return f"<{self.namespaces[prefix]}{local}>"
+        return f'"{self.escape_literal(term)}"'
+    
+    def ntriples_lines(self, record, graph=None):
+        """One N-Triples line (N-Quads with graph) per statement of a record"""
+        subject, rdf_type, pairs = record
+        subject = self.nt_term(subject)
+        end = f" <{graph}> .\n" if graph else " .\n"
+        lines = [f"{subject} <{RDF_TYPE}> {self.nt_term(rdf_type)}{end}"]
+        lines.extend(f"{subject} {self.nt_term(predicate)} {self.nt_term(obj)}{end}" for predicate, obj in pairs)
+        return lines
+    
+    def thrift_term(self, term):
+        """A Turtle term of the records as an encoded RDF Thrift term"""
+        if term.startswith('"'):
+            # Undo escape_literal, Thrift strings are raw
+            lex = _ESCAPE.sub(lambda m: {'n': '\n', 'r': '\r'}.get(m.group(1), m.group(1)), term[1:-1])
+            return rdf_thrift.literal(lex)
+        if term.startswith('<'):
+            return rdf_thrift.iri(term[1:-1])
+        if _INTEGER.fullmatch(term) and rdf_thrift.I64_MIN <= int(term) <= rdf_thrift.I64_MAX:
+            return rdf_thrift.integer(int(term))
+        if _INTEGER.fullmatch(term) or _DECIMAL.fullmatch(term):
+            return rdf_thrift.literal(term, XSD + ('integer' if _INTEGER.fullmatch(term) else 'decimal'))
+        prefix, sep, local = term.partition(':')
+        if sep and prefix in self.namespaces:
+            return rdf_thrift.prefix_name(prefix, local)
+        return rdf_thrift.literal(term)
+    
+    def thrift_rows(self, record):
+        """One RDF Thrift triple row per statement of a record"""
+        subject, rdf_type, pairs = record
+        subject = self.thrift_term(subject)
+        # Predicates and types are a handful of terms, encoded once
+        cache = self.thrift_cache
+        for term in ('rdf:type', rdf_type):
+            if term not in cache:
+                cache[term] = self.thrift_term(term)
+        rows = [rdf_thrift.triple_row(subject, cache['rdf:type'], cache[rdf_type])]
+        for predicate, obj in pairs:
+            if predicate not in cache:
+                cache[predicate] = self.thrift_term(predicate)
+            rows.append(rdf_thrift.triple_row(subject, cache[predicate], self.thrift_term(obj)))
+        return rows
+    
+    def thrift_prefixes(self):
+        """Prefix declaration rows, the namespace table every RDF Thrift file starts with"""
+        return b"".join(rdf_thrift.prefix_row(prefix, uri) for prefix, uri in self.namespaces.items())
+    
+    def batch_lines(self, fmt, section, items, graph=None):
+        """Serialized lines (RDF Thrift rows) of a batch of (record builder, arguments) of one section"""
+        lines = []
+        for builder, args in items:
+            record = getattr(self, builder)(*args)
+            if fmt == 'turtle':
+                lines.extend(self.turtle_lines(record, section in TERSE_SECTIONS))
+            elif fmt == 'thrift':
+                lines.extend(self.thrift_rows(record))
+            else:
+                lines.extend(self.ntriples_lines(record, graph if fmt == 'nquads' else None))
+        return lines
+    
+    def serialize_batch(self, fmt, section, items, graph=None):
+        """A batch as one chunk of text (bytes for RDF Thrift), Turtle lines joined with newlines"""
+        lines = self.batch_lines(fmt, section, items, graph)
+        if fmt in BINARY_FORMATS:
+            return b"".join(lines)
+        return "\n".join(lines) if fmt == 'turtle' else "".join(lines)
+    
+    def section_jobs(self, name, fmt, batch_size=None):
+        """Header text (Turtle only) and (section, items) batches of one section, in output order"""
+        heading, items, skip_empty = SECTIONS[name]
+        items = getattr(self, items)()
+        batch = list(itertools.islice(items, batch_size or BATCH_SIZE))
+        if not batch and skip_empty:
+            return
+        if fmt == 'turtle':
+            yield "# =============================="
+            yield f"# {heading}"
+            yield "# ==============================\n"
+        while batch:
+            yield name, batch
+            batch = list(itertools.islice(items, batch_size or BATCH_SIZE))
+    
+    def index_state(self):
+        """What the record builders need from the index, sent once to every worker process"""
+        return self.title_index
+    
+    def chunks(self, fmt, graph=None, workers=0):
+        """
+        The whole output as text chunks, in order: every header (Turtle
+        prefixes and headings, RDF Thrift prefix rows) and every batch of
+        records. With workers, batches are serialized in that many
+        processes, at most two per worker wait at a time so records read
+        from disk do not pile up.
+        """
+        jobs = itertools.chain(*(self.section_jobs(name, fmt) for name in SECTIONS))
+        if fmt == 'turtle':
+            jobs = itertools.chain([self.write_prefixes()], jobs)
+        elif fmt == 'thrift':
+            jobs = itertools.chain([self.thrift_prefixes()], jobs)
+        
+        if not workers:
+            for job in jobs:
+                yield self.serialize_batch(fmt, *job, graph=graph) if isinstance(job, tuple) else job
+            return
+        
+        pending = collections.deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.index_state(),)) as pool:
+            for job in jobs:
+                if isinstance(job, tuple):
+                    future = pool.submit(_serialize_batch, fmt, *job, graph)
+                else:
+                    future = Future()
+                    future.set_result(job)
+                pending.append(future)
+                while len(pending) > 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    def convert_all(self, output_file='ghibli-dataset.ttl', format='turtle', workers=0, shards=1, graph=DEFAULT_GRAPH):
+        """
+        Convert semua data ke RDF
+        
+        Args:
+            output_file: Output path, gzip compressed when it ends with .gz
+            format: 'turtle', 'ntriples', 'nquads' (every statement in graph)
+                or 'thrift' (binary RDF Thrift, see rdf_thrift.py)
+            workers: Serialize the records in this many processes, 0 in this one
+            shards: Not for Turtle, split the output over this many
+                files (ghibli-dataset.part-000.nt, ...) that can be
+                concatenated in any order
+            graph: Graph IRI of the N-Quads statements
+        
+        Returns the output path, or the list of shard paths
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown RDF format {format!r}, expected one of {', '.join(FORMATS)}")
+        if shards < 1 or workers < 0:
+            raise ValueError(f"Need shards >= 1 and workers >= 0, got shards={shards}, workers={workers}")
+        if shards > 1 and format == 'turtle':
+            raise ValueError("Turtle output cannot be sharded, use ntriples, nquads or thrift")
+        print(f"\n Converting JSON files to RDF {FORMATS[format][0]}...")
+        
+        if shards > 1:
+            root, gz = (output_file[:-3], '.gz') if output_file.endswith('.gz') else (output_file, '')
+            root, ext = os.path.splitext(root)
+            paths = [f"{root}.part-{i:03d}{ext}{gz}" for i in range(shards)]
+        else:
+            paths = [output_file]
+        
+        # Stream every chunk straight into the file(s), round robin over the shards
+        files = [open_output(path, format in BINARY_FORMATS) for path in paths]
+        try:
+            writer = TurtleWriter(files[0])
+            for i, chunk in enumerate(self.chunks(format, graph, workers)):
+                if format == 'turtle':
+                    writer.write(chunk)
+                elif format == 'thrift' and i == 0:
+                    # Every shard starts with the prefix table
+                    for f in files:
+                        f.write(chunk)
+                else:
+                    files[i % shards].write(chunk)
+        finally:
+            for f in files:
+                f.close()
+        
+        print(f" RDF dataset saved to {', '.join(paths)}")
         
         # Print stats
         print("\n Conversion Summary:")
-        print(f"  Films: {len(self.films_data.get('movies', []))}")
-        print(f"  Series: {len(self.series_data.get('series', []))}")
-        print(f"  Shorts: {len(self.shorts_data.get('shorts', []))}")
-        print(f"  Total Characters: {len(self.films_data.get('characters', [])) + len(self.series_data.get('characters', []))}")
-        print(f"  Directors: {len(self.films_data.get('directors', []))}")
+        print(f"  Films: {self.counts['movies']}")
+        print(f"  Series: {self.counts['series']}")
+        print(f"  Shorts: {self.counts['shorts']}")
+        print(f"  Total Characters: {self.counts['film_characters'] + self.counts['series_characters']}")
+        print(f"  Directors: {self.counts['directors']}")
         
-        return output_file
+        return paths if shards > 1 else output_file
+
+
+# Worker processes of convert_all(workers=N): one converter without input,
+# holding the index of the run
+_worker = None
+
+
+def _init_worker(title_index):
+    global _worker
+    _worker = GhibliRDFConverter()
+    _worker.title_index = title_index
+
+
+def _serialize_batch(fmt, section, items, graph):
+    return _worker.serialize_batch(fmt, section, items, graph)
 
 
 # ============================================
@@ -544,13 +748,39 @@ class GhibliRDFConverter:
 # ============================================
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Convert the scraped JSON files to RDF")
+    parser.add_argument('--films', default='data/films.json', help="films JSON (default: data/films.json)")
+    parser.add_argument('--series', default='data/series.json', help="series JSON (default: data/series.json)")
+    parser.add_argument('--shorts', default='data/shorts.json', help="shorts JSON (default: data/shorts.json)")
+    parser.add_argument('--output', default=None,
+                        help="output file, .gz compresses it (default: data/ghibli-dataset.ttl, .nt, .nq or .trdf.gz)")
+    parser.add_argument('--format', default='turtle', choices=list(FORMATS), help="RDF format (default: turtle)")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="serialize records in N worker processes, 0 serializes in this one (default: 0)")
+    parser.add_argument('--shards', type=int, default=1,
+                        help="ntriples/nquads/thrift: split the output over N files that can be concatenated (default: 1)")
+    parser.add_argument('--graph', default=DEFAULT_GRAPH, help=f"N-Quads graph IRI (default: {DEFAULT_GRAPH})")
+    parser.add_argument('--stream', action='store_true',
+                        help="read the records one at a time instead of loading the JSON files, for large datasets")
+    args = parser.parse_args()
+    if args.shards < 1:
+        parser.error("--shards must be at least 1")
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    if args.shards > 1 and args.format == 'turtle':
+        parser.error("--shards needs --format ntriples, nquads or thrift")
+    
     # Convert all JSON files to RDF
     converter = GhibliRDFConverter(
-        films_json='data/films.json',      # Film data
-        series_json='data/series.json',           # Series data
-        shorts_json='data/shorts.json'            # Shorts data
+        films_json=args.films,      # Film data
+        series_json=args.series,           # Series data
+        shorts_json=args.shorts,            # Shorts data
+        stream=args.stream
     )
     
-    converter.convert_all('data/ghibli-dataset.ttl')
+    output = args.output or 'data/ghibli-dataset' + FORMATS[args.format][1]
+    converter.convert_all(output, format=args.format, workers=args.workers, shards=args.shards, graph=args.graph)
     
-    print("\n🎉 Conversion complete!")
\ No newline at end of file
+    print("\n🎉 Conversion complete!")
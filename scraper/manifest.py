@@ -0,0 +1,106 @@
+import copy
+import json
+import os
+import threading
+
+
+class RevisionManifest:
+    """
+    Maps page URL -> revision id/timestamp -> extracted record, saved next to
+    the JSON output (films.json -> films.manifest.json).
+
+    On an incremental run the current revision ids are asked from api.php in
+    batches; pages whose revision did not change are served from the
+    manifest and only the changed ones are fetched and extracted again.
+    """
+
+    def __init__(self, path, api):
+        """
+        Args:
+            path: Manifest file
+            api: MediaWikiSource used to look up current revision ids
+        """
+        self.path = path
+        self.api = api
+        self.entries = {}
+        self.touched = set()
+        # Pages seen in an earlier run whose revision changed since
+        self.stale = set()
+        self.reused = 0
+        self.refreshed = 0
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('pages', {})
+
+    @staticmethod
+    def path_for(json_path):
+        root, _ = os.path.splitext(json_path)
+        return root + '.manifest.json'
+
+    def current_revision(self, url):
+        title = self.api.title_from_url(url)
+        if not title:
+            return None
+        info = self.api.page_info(title)
+        if info.get('missing'):
+            return None
+        return info.get('revid'), info.get('timestamp')
+
+    def lookup(self, url):
+        """Stored record of url if its page has not changed since, else None"""
+        with self.lock:
+            entry = self.entries.get(url)
+        if entry is None:
+            return None
+        try:
+            revision = self.current_revision(url)
+        except Exception as e:
+            print(f"[ERROR] revision lookup {url}: {e}")
+            return None
+        if revision is None or revision[0] != entry.get('revid'):
+            with self.lock:
+                self.stale.add(url)
+            return None
+        with self.lock:
+            self.touched.add(url)
+            self.reused += 1
+        return copy.deepcopy(entry['record'])
+
+    def store(self, url, record):
+        """Remember the record extracted from the current revision of url"""
+        try:
+            revision = self.current_revision(url)
+        except Exception as e:
+            print(f"[ERROR] revision lookup {url}: {e}")
+            revision = None
+        if revision is None:
+            return
+        with self.lock:
+            self.entries[url] = {
+                'revid': revision[0],
+                'timestamp': revision[1],
+                'record': copy.deepcopy(record),
+            }
+            self.touched.add(url)
+            self.refreshed += 1
+
+    def save(self):
+        """
+        Write the entries used in this run (pages no longer linked are
+        dropped). A changed page that could not be fetched keeps its old
+        entry, so the next run sees the change again and retries it.
+        """
+        with self.lock:
+            pages = {url: self.entries[url] for url in sorted(self.touched | self.stale) if url in self.entries}
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'pages': pages}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        print(f"[+] Saved manifest => {self.path} ({self.reused} unchanged, {self.refreshed} re-extracted)")
+
+
+def add_incremental_argument(parser):
+    """Register the --incremental command line option shared by the scrapers"""
+    parser.add_argument('--incremental', action='store_true',
+                        help="only re-extract pages whose wiki revision changed since the last run")
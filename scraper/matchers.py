@@ -0,0 +1,14 @@
+import re
+
+# ====================================================
+# Pattern yang dipakai extractor, dikompilasi sekali saja
+# ====================================================
+YEAR = re.compile(r'(19|20)\d{2}')
+NUMBER = re.compile(r'(\d+)')
+EPISODE_COUNT = re.compile(r'(\d+)\s*episode', re.IGNORECASE)
+GENRE_SEPARATORS = re.compile(r'[,/;]')
+
+# "directed by Hayao Miyazaki." / "a film by Isao Takahata,"
+FILM_DIRECTED_BY = re.compile(r'directed by ([A-Z][a-zA-Z\s]+?)(?:\.|,|\sand\s)', re.IGNORECASE)
+FILM_BY = re.compile(r'(?:a |the )?film by ([A-Z][a-zA-Z\s]+?)(?:\.|,|\sand\s)', re.IGNORECASE)
+SERIES_DIRECTED_BY = re.compile(r'directed by ([A-Z][a-zA-Z\s]+?)(?:\sand\s|,|\.|$)', re.IGNORECASE)
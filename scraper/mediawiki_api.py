@@ -0,0 +1,186 @@
+import html
+import json
+import threading
+from urllib.parse import quote, unquote, urlencode, urlparse
+
+# MediaWiki accepts at most 50 titles per query for normal accounts
+BATCH_SIZE = 50
+
+
+class PageMissing(Exception):
+    """Raised when the wiki has no page for a title"""
+
+
+class MediaWikiSource:
+    """
+    Serves wiki pages from api.php instead of the rendered HTML site.
+
+    Category pages come from list=categorymembers. Article metadata (revision
+    id, timestamp, categories, pageprops) is read with batched
+    prop=revisions|pageprops|categories queries of up to 50 titles, with
+    redirects resolved in the same call, and the article HTML from
+    action=parse on that exact revision. get_html returns HTML shaped like
+    the rendered page, so the existing extractors work unchanged.
+    """
+
+    def __init__(self, base_url, fetch):
+        """
+        Args:
+            base_url: Wiki root, e.g. https://ghibli.fandom.com
+            fetch: Callable fetch(url, fresh=False) returning the response
+                body as bytes, fresh=True must not serve it from a cache
+        """
+        self.base_url = base_url
+        self.api_url = base_url.rstrip('/') + '/api.php'
+        self.fetch = fetch
+        self.pages = {}
+        self.lock = threading.Lock()
+
+    def call(self, **params):
+        params.update({'format': 'json', 'formatversion': 2})
+        # Queries answer with the current revisions and members, a cached
+        # answer would hide edits; parse output of a fixed oldid never changes
+        body = self.fetch(f"{self.api_url}?{urlencode(params)}", fresh=params.get('action') == 'query')
+        data = json.loads(body)
+        if 'error' in data:
+            raise RuntimeError(f"api.php error: {data['error'].get('info', data['error'])}")
+        return data
+
+    def title_from_url(self, url):
+        path = urlparse(url).path
+        if '/wiki/' not in path:
+            return None
+        return unquote(path.split('/wiki/', 1)[1]).replace('_', ' ')
+
+    def path_from_title(self, title):
+        return f"/wiki/{quote(title.replace(' ', '_'), safe=':/(),')}"
+
+    def category_members(self, category):
+        """Titles of the articles (namespace 0) in a category"""
+        titles = []
+        params = {
+            'action': 'query',
+            'list': 'categorymembers',
+            'cmtitle': category,
+            'cmnamespace': 0,
+            'cmlimit': 'max',
+        }
+        while True:
+            data = self.call(**params)
+            titles.extend(m['title'] for m in data.get('query', {}).get('categorymembers', []))
+            if 'continue' not in data:
+                return titles
+            params.update(data['continue'])
+
+    def query_pages(self, titles):
+        """
+        Revision id, timestamp, categories and pageprops for titles, fetched
+        in batches of 50. Returns requested title -> info (redirects and
+        title normalization already followed).
+        """
+        result = {}
+        titles = list(dict.fromkeys(titles))
+        for i in range(0, len(titles), BATCH_SIZE):
+            batch = titles[i:i + BATCH_SIZE]
+            params = {
+                'action': 'query',
+                'prop': 'revisions|pageprops|categories',
+                'rvprop': 'ids|timestamp',
+                'clprop': 'hidden',
+                'cllimit': 'max',
+                'redirects': 1,
+                'titles': '|'.join(batch),
+            }
+            pages = {}
+            aliases = {}
+            while True:
+                data = self.call(**params)
+                query = data.get('query', {})
+                for entry in query.get('normalized', []) + query.get('redirects', []):
+                    aliases[entry['from']] = entry['to']
+                for page in query.get('pages', []):
+                    info = pages.setdefault(page['title'], {
+                        'title': page['title'],
+                        'missing': bool(page.get('missing') or page.get('invalid')),
+                        'revid': None,
+                        'timestamp': None,
+                        'categories': [],
+                        'pageprops': {},
+                    })
+                    if page.get('revisions'):
+                        info['revid'] = page['revisions'][0]['revid']
+                        info['timestamp'] = page['revisions'][0]['timestamp']
+                    info['pageprops'].update(page.get('pageprops', {}))
+                    info['categories'].extend(
+                        c['title'].split(':', 1)[-1] for c in page.get('categories', [])
+                        if not c.get('hidden')
+                    )
+                # Only categories can continue when revisions are limited to ids
+                if 'continue' not in data:
+                    break
+                params.update(data['continue'])
+
+            for title in batch:
+                canonical = title
+                seen = set()
+                while canonical in aliases and canonical not in seen:
+                    seen.add(canonical)
+                    canonical = aliases[canonical]
+                result[title] = pages.get(canonical, {'title': canonical, 'missing': True})
+        return result
+
+    def prefetch(self, urls):
+        """Resolve many page URLs with batched queries before they are fetched"""
+        titles = []
+        for url in urls:
+            title = self.title_from_url(url)
+            if title and not title.startswith('Category:') and title not in self.pages:
+                titles.append(title)
+        if titles:
+            infos = self.query_pages(titles)
+            with self.lock:
+                self.pages.update(infos)
+
+    def page_info(self, title):
+        with self.lock:
+            info = self.pages.get(title)
+        if info is None:
+            info = self.query_pages([title])[title]
+            with self.lock:
+                self.pages[title] = info
+        return info
+
+    def get_html(self, url):
+        """HTML for a wiki URL, shaped like the rendered page"""
+        title = self.title_from_url(url)
+        if not title:
+            raise PageMissing(f"not a wiki page: {url}")
+
+        if title.startswith('Category:'):
+            links = "".join(
+                f'<a class="category-page__member-link" href="{html.escape(self.path_from_title(t))}">'
+                f'{html.escape(t)}</a>\n'
+                for t in self.category_members(title)
+            )
+            return f"<html><body>{links}</body></html>".encode('utf-8')
+
+        info = self.page_info(title)
+        if info.get('missing') or not info.get('revid'):
+            raise PageMissing(f"no such page: {title}")
+
+        data = self.call(action='parse', oldid=info['revid'], prop='text', disablelimitreport=1)
+        text = data['parse']['text']
+        catlinks = "".join(
+            f'<a href="{html.escape(self.path_from_title("Category:" + c))}">{html.escape(c.replace("_", " "))}</a>'
+            for c in info.get('categories', [])
+        )
+        return (
+            '<html><head><meta charset="utf-8"></head><body>'
+            f'{text}<div id="mw-normal-catlinks">{catlinks}</div></body></html>'
+        ).encode('utf-8')
+
+
+def add_source_argument(parser):
+    """Register the --source command line option shared by the scrapers"""
+    parser.add_argument('--source', default='html', choices=['html', 'api'],
+                        help="read rendered wiki pages (html) or the MediaWiki api.php (api)")
@@ -0,0 +1,209 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the histogram buckets, from extractor to slow fetch
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PROMETHEUS_PREFIX = 'ghibli_scraper_'
+
+
+class Histogram:
+    """Bucketed distribution of observed values, Prometheus style"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def merge(self, other):
+        """Add the observations of a Histogram.snapshot()"""
+        self.count += other['count']
+        self.sum += other['sum']
+        for i, n in enumerate(other['buckets']):
+            self.counts[i] += n
+        for attr, pick in (('min', min), ('max', max)):
+            if other[attr] is not None:
+                value = getattr(self, attr)
+                setattr(self, attr, other[attr] if value is None else pick(value, other[attr]))
+
+    def snapshot(self):
+        return {'count': self.count, 'sum': self.sum, 'min': self.min, 'max': self.max,
+                'buckets': list(self.counts)}
+
+
+class Metrics:
+    """
+    Counters and histograms of one scrape run, shared by everything that
+    talks to the wiki (usually through the Fetcher). Series are keyed by name
+    and labels, e.g. inc('http_responses_total', status='200').
+
+    snapshot()/merge() move metrics between processes (see ParsePool);
+    report() is the JSON run report and write_prometheus() the textfile.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.started = time.time()
+        self.lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe the seconds spent in the with block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter(self, name, **labels):
+        """Sum of a counter over every series matching labels"""
+        with self.lock:
+            return sum(
+                value for (key_name, key_labels), value in self.counters.items()
+                if key_name == name and all(item in key_labels for item in labels.items())
+            )
+
+    def snapshot(self):
+        """Plain picklable copy of every series"""
+        with self.lock:
+            return {
+                'counters': [(name, labels, value) for (name, labels), value in self.counters.items()],
+                'histograms': [(name, labels, h.snapshot()) for (name, labels), h in self.histograms.items()],
+            }
+
+    def merge(self, snapshot):
+        """Add a snapshot() taken somewhere else (another process) to these metrics"""
+        with self.lock:
+            for name, labels, value in snapshot['counters']:
+                key = (name, labels)
+                self.counters[key] = self.counters.get(key, 0) + value
+            for name, labels, data in snapshot['histograms']:
+                key = (name, labels)
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram()
+                histogram.merge(data)
+
+    # ====================================================
+    # Output
+    # ====================================================
+    def report(self):
+        """JSON run report: summary numbers, then every series"""
+        cache_total = self.counter('cache_requests_total')
+        cache_hits = cache_total - self.counter('cache_requests_total', result='miss')
+        finished = time.time()
+        snapshot = self.snapshot()
+        return {
+            'started_at': self.started,
+            'finished_at': finished,
+            'duration_seconds': finished - self.started,
+            'summary': {
+                'requests': self.counter('http_responses_total'),
+                'bytes_downloaded': self.counter('fetch_bytes_total'),
+                'retries': self.counter('fetch_retries_total'),
+                'failed_fetches': self.counter('fetch_failures_total'),
+                'cache_hit_ratio': cache_hits / cache_total if cache_total else None,
+            },
+            'counters': [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for name, labels, value in sorted(snapshot['counters'])
+            ],
+            'histograms': [
+                dict(data, name=name, labels=dict(labels), le=list(BUCKETS),
+                     mean=data['sum'] / data['count'] if data['count'] else None)
+                for name, labels, data in sorted(snapshot['histograms'], key=lambda h: (h[0], h[1]))
+            ],
+        }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        print(f"[+] Saved run report => {path}")
+
+    def prometheus_lines(self):
+        snapshot = self.snapshot()
+        lines = []
+        typed = set()
+
+        def escape(value):
+            return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        def label_text(labels, extra=()):
+            items = list(labels) + list(extra)
+            if not items:
+                return ''
+            return '{' + ','.join(f'{k}="{escape(v)}"' for k, v in items) + '}'
+
+        for name, labels, value in sorted(snapshot['counters']):
+            metric = PROMETHEUS_PREFIX + name
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{label_text(labels)} {value}")
+        for name, labels, data in sorted(snapshot['histograms'], key=lambda h: (h[0], h[1])):
+            metric = PROMETHEUS_PREFIX + name
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, n in zip(BUCKETS, data['buckets']):
+                cumulative += n
+                lines.append(f"{metric}_bucket{label_text(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{metric}_bucket{label_text(labels, [('le', '+Inf')])} {data['count']}")
+            lines.append(f"{metric}_sum{label_text(labels)} {data['sum']}")
+            lines.append(f"{metric}_count{label_text(labels)} {data['count']}")
+        return lines
+
+    def write_prometheus(self, path):
+        """Textfile for the node_exporter textfile collector, replaced atomically"""
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write("\n".join(self.prometheus_lines()) + "\n")
+        os.replace(tmp, path)
+        print(f"[+] Saved Prometheus metrics => {path}")
+
+
+def add_metrics_arguments(parser):
+    """Register the --metrics and --prometheus command line options shared by the scrapers"""
+    parser.add_argument('--metrics', default=None, metavar='PATH',
+                        help="write a JSON run report (timings, bytes, cache hits) to PATH")
+    parser.add_argument('--prometheus', default=None, metavar='PATH',
+                        help="write the metrics as a Prometheus textfile to PATH")
+
+
+def write_metrics(metrics, args):
+    """Write the outputs asked for on the command line"""
+    if args.metrics:
+        metrics.write_json(args.metrics)
+    if args.prometheus:
+        metrics.write_prometheus(args.prometheus)
@@ -0,0 +1,109 @@
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from metrics import Metrics
+
+# Scraper instances of this worker process, one per (class, base_url, parser, full_parse)
+_scrapers = {}
+
+
+def _scraper_for(key):
+    scraper = _scrapers.get(key)
+    if scraper is None:
+        cls, base_url, parser, full_parse = key
+        scraper = cls(parser=parser, full_parse=full_parse, base_url=base_url)
+        _scrapers[key] = scraper
+    return scraper
+
+
+def _parse(key, method, content, args):
+    """
+    Worker side: parse raw bytes and run one extractor of the scraper on them.
+    Returns the result and the metrics (parse/extract timings) of this page.
+    """
+    scraper = _scraper_for(key)
+    scraper.metrics = Metrics()
+    result = getattr(scraper, method)(scraper.page_from_content(content), *args)
+    return result, scraper.metrics.snapshot()
+
+
+class ParsePool:
+    """
+    Process pool that turns raw page bytes into extracted dicts, so parsing
+    and get_text run on every core instead of behind the GIL of the fetching
+    threads. Fetch threads hand their bytes over with submit() and go on
+    fetching while the page is parsed; at most `max_pending` pages wait in
+    the pool, further fetchers block until a worker is free (backpressure),
+    so raw pages never pile up in memory.
+
+    One pool can be shared by several scrapers of the same run. Extractors
+    are given by method name and must return picklable values.
+    """
+
+    def __init__(self, workers=None, max_pending=None):
+        """
+        Args:
+            workers: Parser processes, default one per core
+            max_pending: Pages queued or being parsed at once, default 2 per worker
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.slots = threading.BoundedSemaphore(self.max_pending)
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor
+
+    def submit(self, scraper, method, content, *args):
+        """
+        Future of scraper.method(page, *args) for the page in content, run in
+        a worker process. Blocks only while max_pending pages are in the pool.
+        """
+        key = (type(scraper), scraper.base_url, scraper.parser, scraper.full_parse)
+        executor = self.start()
+        self.slots.acquire()
+        try:
+            parsed = executor.submit(_parse, key, method, content, args)
+        except Exception:
+            self.slots.release()
+            raise
+        result = Future()
+
+        def done(parsed):
+            self.slots.release()
+            try:
+                value, metrics = parsed.result()
+            except Exception as e:
+                result.set_exception(e)
+                return
+            scraper.metrics.merge(metrics)
+            result.set_result(value)
+
+        parsed.add_done_callback(done)
+        return result
+
+    def parse(self, scraper, method, content, *args):
+        """submit() and wait for the result"""
+        return self.submit(scraper, method, content, *args).result()
+
+    def close(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+
+
+def add_parse_workers_argument(parser):
+    """Register the --parse-workers command line option shared by the scrapers"""
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="parse pages in N worker processes, 0 parses in the fetching threads (default: 0)")
+
+
+def parse_pool_from_args(args):
+    """ParsePool for the parsed command line, or None"""
+    return ParsePool(args.parse_workers) if args.parse_workers > 0 else None
@@ -0,0 +1,98 @@
+import importlib.util
+import re
+
+from bs4 import BeautifulSoup
+
+# BeautifulSoup tree builder per backend and the module it needs
+PARSER_BACKENDS = {
+    'html.parser': None,
+    'lxml': 'lxml',
+    'html5lib': 'html5lib',
+}
+
+DEFAULT_PARSER = 'html.parser'
+
+# The only parts of a fandom page the extractors read: infobox, article body,
+# category bar and the member links of category pages
+TARGET_REGIONS = [
+    (b'aside', rb'class=["\'][^"\']*\bportable-infobox\b'),
+    (b'div', rb'class=["\'][^"\']*\bmw-parser-output\b'),
+    (b'div', rb'id=["\']mw-normal-catlinks["\']'),
+    (b'a', rb'class=["\'][^"\']*\bcategory-page__member-link\b'),
+]
+_REGION_PATTERNS = [
+    (re.compile(rb'<' + name + rb'\b[^>]*?' + attr + rb'[^>]*>', re.I),
+     re.compile(rb'<(/?)' + name + rb'\b', re.I))
+    for name, attr in TARGET_REGIONS
+]
+_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.I)
+
+
+def available_backends():
+    """Backends whose parser library is installed"""
+    return [
+        name for name, module in PARSER_BACKENDS.items()
+        if module is None or importlib.util.find_spec(module) is not None
+    ]
+
+
+def _element_end(content, start, tag_pattern):
+    """Offset just after the tag closing the element opened at start"""
+    depth = 0
+    for match in tag_pattern.finditer(content, start):
+        if match.group(1):
+            depth -= 1
+            if depth == 0:
+                end = content.find(b'>', match.end())
+                return len(content) if end == -1 else end + 1
+        else:
+            depth += 1
+    return len(content)
+
+
+def slice_regions(content):
+    """
+    Cut the target regions out of raw HTML bytes so the parser never builds
+    the navigation, ads and scripts around them. Regions nested in another
+    region (the infobox sits inside mw-parser-output) are kept only once.
+    Returns None when the page has none of the regions.
+    """
+    spans = []
+    for open_pattern, tag_pattern in _REGION_PATTERNS:
+        for match in open_pattern.finditer(content):
+            spans.append((match.start(), _element_end(content, match.start(), tag_pattern)))
+    if not spans:
+        return None
+
+    spans.sort()
+    regions = []
+    last_end = -1
+    for start, end in spans:
+        if start < last_end:
+            continue
+        regions.append(content[start:end])
+        last_end = end
+
+    charset = _CHARSET.search(content[:4096])
+    head = b'<html><head><meta charset="' + (charset.group(1) if charset else b'utf-8') + b'"></head><body>'
+    return head + b'\n'.join(regions) + b'</body></html>'
+
+
+def make_soup(content, backend=DEFAULT_PARSER, targeted=False):
+    """
+    Parse raw HTML with the selected backend. With targeted=True only the
+    infobox, article body and category regions are parsed.
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"unknown parser backend: {backend}")
+    if targeted and isinstance(content, bytes):
+        content = slice_regions(content) or content
+    return BeautifulSoup(content, backend)
+
+
+def add_parser_argument(parser):
+    """Register the --parser command line option shared by the scrapers"""
+    parser.add_argument('--parser', default=DEFAULT_PARSER, choices=list(PARSER_BACKENDS),
+                        help=f"HTML parser backend (default: {DEFAULT_PARSER}, lxml is fastest)")
+    parser.add_argument('--full-parse', action='store_true',
+                        help="parse whole pages instead of only infobox, content and categories")
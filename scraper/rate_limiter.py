@@ -0,0 +1,33 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket shared by every thread that talks to the same host"""
+
+    def __init__(self, rate=2.0, burst=1):
+        """
+        Args:
+            rate: Tokens added per second (average requests per second)
+            burst: Maximum tokens that can be saved up for a burst
+        """
+        if not rate > 0:
+            raise ValueError(f"rate must be more than 0 requests per second, got {rate}")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until one request may be sent"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,168 @@
+"""
+RDF Thrift (Apache Jena's binary RDF, https://jena.apache.org/documentation/io/rdf-binary.html)
+without a Thrift dependency.
+
+The file is a sequence of RDF_StreamRow structs in Thrift's compact
+protocol: prefix declarations first, then one row per triple or quad. IRIs
+under a declared prefix are written as (prefix, local name) pairs, so the
+namespace table is stored once, and integers are written as varints. Jena
+and Fuseki load it with RIOT's "RDF Thrift" reader (.trdf, .trdf.gz when
+compressed), no text parsing involved:
+
+    tdb2.tdbloader --loc DB data/ghibli-dataset.trdf.gz
+    fuseki-server --file data/ghibli-dataset.trdf.gz /ghibli-dataset
+
+Only the subset of the schema the converter needs is written. read_rows()
+decodes any compact protocol struct and is there to check the output.
+"""
+import struct
+
+# Compact protocol type ids
+BINARY = 8
+I64 = 6
+DOUBLE = 7
+STRUCT = 12
+STOP = b'\x00'
+
+# Field ids of RDF_StreamRow and RDF_Term
+ROW_PREFIX, ROW_TRIPLE, ROW_QUAD = 1, 2, 3
+TERM_IRI, TERM_BNODE, TERM_LITERAL, TERM_PREFIX_NAME = 1, 2, 3, 4
+TERM_INTEGER, TERM_DOUBLE = 10, 11
+
+I64_MIN, I64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def varint(n):
+    if n < 0x80:
+        return bytes((n,))
+    out = bytearray()
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def zigzag(n):
+    return (n << 1) ^ (n >> 63)
+
+
+def field(delta, type_id):
+    """Short form field header, delta from the previous field id (1-15)"""
+    return bytes([(delta << 4) | type_id])
+
+
+# Headers of the fields written, precomputed: rows and terms are built by
+# concatenating them
+_STRING = field(1, BINARY)
+_STRING_SKIP = field(2, BINARY)
+_NESTED = field(1, STRUCT)
+_IRI = field(TERM_IRI, STRUCT)
+_LITERAL = field(TERM_LITERAL, STRUCT)
+_PREFIX_NAME = field(TERM_PREFIX_NAME, STRUCT)
+_INTEGER = field(TERM_INTEGER, I64)
+_PREFIX_ROW = field(ROW_PREFIX, STRUCT)
+_TRIPLE_ROW = field(ROW_TRIPLE, STRUCT)
+_QUAD_ROW = field(ROW_QUAD, STRUCT)
+_END = STOP + STOP
+
+
+def string(text):
+    data = text.encode('utf-8')
+    return varint(len(data)) + data
+
+
+def iri(value):
+    return _IRI + _STRING + string(value) + _END
+
+
+def prefix_name(prefix, local):
+    return _PREFIX_NAME + _STRING + string(prefix) + _STRING + string(local) + _END
+
+
+def literal(lex, datatype=None, lang=None):
+    """RDF_Literal: lex (1), langtag (2), datatype (3)"""
+    body = _STRING + string(lex)
+    if lang is not None:
+        body += _STRING + string(lang)
+    if datatype is not None:
+        body += (_STRING if lang is not None else _STRING_SKIP) + string(datatype)
+    return _LITERAL + body + _END
+
+
+def integer(n):
+    return _INTEGER + varint(zigzag(n)) + STOP
+
+
+def prefix_row(prefix, uri):
+    return _PREFIX_ROW + _STRING + string(prefix) + _STRING + string(uri) + _END
+
+
+def triple_row(s, p, o):
+    """Row of three encoded terms"""
+    return _TRIPLE_ROW + _NESTED + s + _NESTED + p + _NESTED + o + _END
+
+
+def quad_row(s, p, o, g):
+    return _QUAD_ROW + _NESTED + s + _NESTED + p + _NESTED + o + _NESTED + g + _END
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def byte(self):
+        b = self.data[self.pos]
+        self.pos += 1
+        return b
+
+    def varint(self):
+        shift = result = 0
+        while True:
+            b = self.byte()
+            result |= (b & 0x7F) << shift
+            if not b & 0x80:
+                return result
+            shift += 7
+
+    def value(self, type_id):
+        if type_id in (1, 2):  # booleans carry their value in the type
+            return type_id == 1
+        if type_id == 3:
+            return self.byte()
+        if type_id in (4, 5, 6):
+            n = self.varint()
+            return (n >> 1) ^ -(n & 1)
+        if type_id == DOUBLE:
+            self.pos += 8
+            return struct.unpack('<d', self.data[self.pos - 8:self.pos])[0]
+        if type_id == BINARY:
+            size = self.varint()
+            self.pos += size
+            return self.data[self.pos - size:self.pos].decode('utf-8')
+        if type_id == STRUCT:
+            return self.struct()
+        raise ValueError(f"Unsupported compact protocol type {type_id} at offset {self.pos}")
+
+    def struct(self):
+        fields = {}
+        last = 0
+        while True:
+            header = self.byte()
+            if header == 0:
+                return fields
+            delta, type_id = header >> 4, header & 0x0F
+            if delta:
+                last += delta
+            else:
+                n = self.varint()
+                last = (n >> 1) ^ -(n & 1)
+            fields[last] = self.value(type_id)
+
+
+def read_rows(data):
+    """Every RDF_StreamRow of an RDF Thrift file's bytes, as nested {field id: value} dicts"""
+    reader = _Reader(data)
+    while reader.pos < len(data):
+        yield reader.struct()
@@ -0,0 +1,217 @@
+import json
+import os
+import re
+import threading
+
+
+def stream_path(json_path, kind):
+    """The .jsonl stream of kind next to a JSON output (films.json -> films.movies.jsonl)"""
+    root, _ = os.path.splitext(json_path)
+    return f"{root}.{kind}.jsonl"
+
+
+class RecordStream:
+    """
+    Writes every finished record as one compact JSON line, one file per kind
+    next to the JSON output (films.json -> films.movies.jsonl,
+    films.characters.jsonl, ...). Lines are flushed as they are written, so
+    other tools can read the streams while the crawl is still running.
+    Fields only known once the crawl is over (e.g. the final character
+    entries of a movie) are written as patches (films.movies.patch.jsonl).
+    merge() builds the final JSON from the streams line by line, applying
+    the patches.
+    """
+
+    def __init__(self, json_path):
+        self.json_path = json_path
+        self.files = {}
+        self.counts = {}
+        self.patch_keys = {}
+        self.lock = threading.Lock()
+
+    def path_for(self, kind):
+        return stream_path(self.json_path, kind)
+
+    def open(self, kind):
+        """Start (or truncate) the stream of kind, so it exists even when empty"""
+        with self.lock:
+            if kind not in self.files:
+                self.files[kind] = open(self.path_for(kind), 'w', encoding='utf-8')
+                self.counts[kind] = 0
+            return self.files[kind]
+
+    def emit(self, kind, record):
+        """Append one finished record to the stream of kind"""
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        f = self.open(kind)
+        with self.lock:
+            f.write(line + '\n')
+            f.flush()
+            self.counts[kind] += 1
+
+    def patch(self, kind, fields, key='url'):
+        """Fields to merge into the record of kind emitted earlier with the same fields[key]"""
+        self.patch_keys[kind] = key
+        self.emit(kind + '.patch', fields)
+
+    def load_patches(self, kind):
+        """Record key -> patched fields of kind, only for patches written by this stream"""
+        patches = {}
+        if kind not in self.patch_keys:
+            return patches
+        key = self.patch_keys[kind]
+        with open(self.path_for(kind + '.patch'), 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    fields = json.loads(line)
+                    patches.setdefault(fields[key], {}).update(fields)
+        return patches
+
+    def close(self):
+        with self.lock:
+            for f in self.files.values():
+                f.close()
+
+    def merge(self, kinds):
+        """Write the compact JSON output {kind: [records]} from the streams"""
+        self.close()
+        tmp = self.json_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as out:
+            out.write('{')
+            for i, kind in enumerate(kinds):
+                out.write(('' if i == 0 else ',') + json.dumps(kind) + ':[')
+                path = self.path_for(kind)
+                patches = self.load_patches(kind)
+                if os.path.exists(path):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        first = True
+                        for line in f:
+                            line = line.strip()
+                            if not line:
+                                continue
+                            if patches:
+                                record = json.loads(line)
+                                fields = patches.pop(record.get(self.patch_keys[kind]), None)
+                                if fields:
+                                    record.update(fields)
+                                    line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+                            out.write(line if first else ',' + line)
+                            first = False
+                out.write(']')
+            out.write('}\n')
+        os.replace(tmp, self.json_path)
+        print(f"[+] Merged streams => {self.json_path} ({', '.join(f'{self.counts.get(k, 0)} {k}' for k in kinds)})")
+        return self.json_path
+
+
+class JSONArrayReader:
+    """
+    Reads the items of the top-level arrays of a JSON object file
+    ({"movies": [...], "characters": [...]}) one at a time, decoding from a
+    small text buffer, so the file never has to fit in memory as a whole.
+    Values that are not arrays are decoded and skipped.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    _WHITESPACE = re.compile(r'\s*')
+    _NUMBER_CHARS = '0123456789.eE+-'
+
+    def __init__(self, path):
+        self.path = path
+        self.decoder = json.JSONDecoder()
+
+    def items(self, keys=None):
+        """(key, item) of every array item in file order, only for keys if given"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.f = f
+            self.buffer = ''
+            self.pos = 0
+            self.eof = False
+            self.expect('{')
+            if self.peek() == '}':
+                return
+            while True:
+                key = self.value()
+                self.expect(':')
+                if self.peek() == '[':
+                    self.pos += 1
+                    if self.peek() == ']':
+                        self.pos += 1
+                    else:
+                        while True:
+                            item = self.value()
+                            if keys is None or key in keys:
+                                yield key, item
+                            if self.expect(',', ']') == ']':
+                                break
+                else:
+                    self.value()
+                if self.expect(',', '}') == '}':
+                    return
+
+    def fill(self):
+        """Read the next chunk, dropping what has been decoded already"""
+        chunk = self.f.read(self.CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next character after whitespace, without consuming it"""
+        while True:
+            self.pos = self._WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError(f"Unexpected end of {self.path}")
+
+    def expect(self, *chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"Expected {' or '.join(chars)} at offset {self.pos} of {self.path}, found {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next JSON value, reading more until it is complete"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number may continue in the next chunk ("4." -> "4.5")
+                if self.eof or (end < len(self.buffer) and self.buffer[end] not in self._NUMBER_CHARS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def read_records(json_path, kind):
+    """
+    Records of kind in a scraper output, one at a time. Read from the JSON
+    itself, or from the .jsonl stream of kind while the JSON has not been
+    merged yet (crawl still running with --stream).
+    """
+    if os.path.exists(json_path):
+        for _, record in JSONArrayReader(json_path).items((kind,)):
+            yield record
+        return
+    path = stream_path(json_path, kind)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def add_stream_argument(parser):
+    """Register the --stream command line option shared by the scrapers"""
+    parser.add_argument('--stream', action='store_true',
+                        help="write records to .jsonl streams as they finish and merge them into a compact JSON")
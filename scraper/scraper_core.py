@@ -0,0 +1,447 @@
+import argparse
+import threading
+
+import requests
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urljoin
+
+from crawl_frontier import CrawlFrontier
+from fetcher import Fetcher
+from manifest import RevisionManifest
+from mediawiki_api import MediaWikiSource
+from parser_backends import DEFAULT_PARSER, make_soup
+from rate_limiter import RateLimiter
+from wiki_page import WikiPage
+
+BASE_URL = "https://ghibli.fandom.com"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Referer': 'https://google.com'
+}
+
+# Lines that list voice actors instead of describing the character
+VOICE_KEYWORDS = ['(Japanese)', '(English)', '(Disney)', 'voiced by', 'voice actor']
+
+
+# ====================================================
+# Field spec: satu entry per field di output JSON
+# ====================================================
+class Field:
+    """
+    One output field of an entity and how to read it from a WikiPage.
+    `name` may be a tuple when one extractor fills several fields; extract()
+    then returns a dict with those keys.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def extract(self, scraper, page):
+        raise NotImplementedError
+
+
+class Method(Field):
+    """Field computed by a method of the scraper, method(page)"""
+
+    def __init__(self, name, method):
+        super().__init__(name)
+        self.method = method
+
+    def extract(self, scraper, page):
+        return getattr(scraper, self.method)(page)
+
+
+class InfoboxValue(Field):
+    """Value of the first infobox item whose label contains a keyword"""
+
+    def __init__(self, name, keywords, prefer_link=True):
+        super().__init__(name)
+        self.keywords = keywords
+        self.prefer_link = prefer_link
+
+    def extract(self, scraper, page):
+        return page.infobox_value(self.keywords, prefer_link=self.prefer_link)
+
+
+class InfoboxImage(Field):
+    """Poster/picture of the infobox"""
+
+    def extract(self, scraper, page):
+        return page.infobox_image
+
+
+class FirstParagraph(Field):
+    """First top-level paragraph longer than min_length, cut to limit"""
+
+    def __init__(self, name, min_length=100, limit=800):
+        super().__init__(name)
+        self.min_length = min_length
+        self.limit = limit
+
+    def extract(self, scraper, page):
+        for text in page.paragraphs:
+            if len(text) > self.min_length:
+                return text[:self.limit]
+        return None
+
+
+class SectionText(Field):
+    """Paragraphs of the first matching section (see WikiPage.find_section), joined and cut to limit"""
+
+    def __init__(self, name, ids=None, keywords=None, min_length=40, limit=2000):
+        super().__init__(name)
+        self.ids = ids
+        self.keywords = keywords
+        self.min_length = min_length
+        self.limit = limit
+
+    def extract(self, scraper, page):
+        section = page.find_section(ids=self.ids, keywords=self.keywords)
+        if section is None:
+            return None
+        parts = page.section_paragraphs(section, min_length=self.min_length)
+        if parts:
+            return " ".join(parts)[:self.limit]
+        return None
+
+
+class WikiScraper:
+    """
+    Fetch -> parse -> extract pipeline shared by the film, series and short
+    scrapers: pooled session and rate limit through one Fetcher (cache,
+    retries), api.php or HTML source, targeted parsing, revision manifest,
+    crawl frontier and a thread pool. Subclasses describe their entity with
+    FIELDS, a list of Field specs read by extract_fields(), and the pages
+    they crawl with VISITORS (see crawl()).
+    """
+
+    FIELDS = []
+    # Page type -> method visiting a batch of frontier links, visit(links, depth)
+    VISITORS = {}
+    VOICE_KEYWORDS = VOICE_KEYWORDS
+
+    def __init__(self, concurrency=1, rate=2.0, cache=None, parser=DEFAULT_PARSER, full_parse=False,
+                 source='html', manifest_path=None, stream=None, frontier=None, fetcher=None, parse_pool=None,
+                 base_url=BASE_URL):
+        """
+        Args:
+            concurrency: Number of pages fetched at the same time
+            rate: Requests per second allowed toward ghibli.fandom.com
+            cache: Optional HTTPCache used instead of downloading every page
+            parser: HTML parser backend, see parser_backends.PARSER_BACKENDS
+            full_parse: Parse whole pages instead of only the regions the
+                extractors read (for comparing output)
+            source: 'html' for rendered pages, 'api' for the MediaWiki api.php
+            manifest_path: Enables incremental mode, pages whose revision is
+                unchanged since the last run are read from this manifest
+            stream: Optional RecordStream, finished records are written to it
+                instead of being kept in memory
+            frontier: CrawlFrontier deciding which pages are visited and in
+                what order, default is one without budgets
+            fetcher: Fetcher shared with other scrapers of the same run,
+                replaces session, rate and cache
+            parse_pool: Optional ParsePool, pages are then parsed and
+                extracted in worker processes instead of the fetching threads
+            base_url: Wiki root, another host serving the same pages (e.g.
+                the benchmark stub server) can be used instead
+        """
+        self.base_url = base_url
+        self.headers = dict(HEADERS)
+        self.concurrency = max(1, int(concurrency))
+        if fetcher is None:
+            fetcher = make_fetcher(rate, cache, pool_size=self.concurrency)
+        # A shared fetcher brings its own pooled session, rate limit and cache
+        self.fetcher = fetcher
+        self.session = fetcher.session
+        self.rate_limiter = fetcher.rate_limiter
+        self.cache = fetcher.cache
+        self.metrics = fetcher.metrics
+        self.parser = parser
+        self.full_parse = full_parse
+        self.api = MediaWikiSource(self.base_url, self.fetch_content) if source == 'api' else None
+        self.manifest = None
+        if manifest_path:
+            revisions = self.api or MediaWikiSource(self.base_url, self.fetch_content)
+            self.manifest = RevisionManifest(manifest_path, revisions)
+        self.stream = stream
+        self.frontier = frontier if frontier is not None else CrawlFrontier()
+        self.parse_pool = parse_pool
+        self.failed = {}
+        self.failed_lock = threading.Lock()
+
+    # ====================================================
+    # Fetch & parse
+    # ====================================================
+    def fetch_content(self, url, fresh=False):
+        """Raw body of url, through the shared fetch layer (cache, retries)"""
+        try:
+            return self.fetcher.fetch(url, fresh)
+        except Exception:
+            # The fetcher may serve other crawls too, keep this one's failures for its report
+            error = self.fetcher.failure(url)
+            if error is not None:
+                with self.failed_lock:
+                    self.failed[url] = error
+            raise
+
+    def failed_report(self):
+        """URLs this crawl could not fetch"""
+        with self.failed_lock:
+            return [{'url': url, 'error': error} for url, error in sorted(self.failed.items())]
+
+    def fetch_page(self, url, fresh=False):
+        """
+        Raw HTML of the article at url, from api.php or the rendered page.
+        fresh revalidates a cached rendered page; api.php pages are always
+        parsed from the current revision id.
+        """
+        if self.api:
+            return self.api.get_html(url)
+        return self.fetch_content(url, fresh)
+
+    def get_soup(self, url):
+        try:
+            content = self.fetch_page(url)
+            with self.metrics.timer('parse_seconds'):
+                return make_soup(content, self.parser, targeted=not self.full_parse)
+        except Exception as e:
+            print(f"[ERROR] fetching {url}: {e}")
+            return None
+
+    def page_from_content(self, content):
+        """WikiPage of raw HTML bytes"""
+        with self.metrics.timer('parse_seconds'):
+            return WikiPage(make_soup(content, self.parser, targeted=not self.full_parse))
+
+    def parse_page(self, url, method, *args, fresh=False):
+        """
+        Fetch url and return self.method(page, *args), None when the page
+        could not be fetched. With a parse pool the bytes go to a worker
+        process, so `method` is a name and its result must be picklable.
+        fresh bypasses a cached copy (see fetch_page).
+        """
+        try:
+            content = self.fetch_page(url, fresh)
+            if not self.parse_pool:
+                page = self.page_from_content(content)
+        except Exception as e:
+            print(f"[ERROR] fetching {url}: {e}")
+            return None
+        if self.parse_pool:
+            return self.parse_pool.parse(self, method, content, *args)
+        return getattr(self, method)(page, *args)
+
+    def submit_page(self, url, method, *args):
+        """
+        (future of scrape_page(url, method, *args), True when the record came
+        from the manifest). The page is fetched here and parsed in the parse
+        pool, the calling thread does not wait for it.
+        """
+        future = Future()
+        if self.manifest:
+            record = self.manifest.lookup(url)
+            if record is not None:
+                future.set_result(record)
+                return future, True
+        try:
+            content = self.fetch_page(url, self.fresh_for_manifest())
+        except Exception as e:
+            print(f"[ERROR] fetching {url}: {e}")
+            future.set_result(None)
+            return future, False
+        return self.parse_pool.submit(self, method, content, *args), False
+
+    def scrape_pages(self, method, calls):
+        """
+        scrape_page(url, method, *args) for every (url, *args) tuple of calls,
+        yielded in call order as soon as each record and the ones before it
+        are ready, so a caller can journal a record while later pages are
+        still being fetched. With a parse pool the fetching threads hand each
+        page to a worker and go on with the next URL.
+        """
+        calls = list(calls)
+        if not self.parse_pool:
+            yield from self.iter_concurrent(lambda call: self.scrape_page(call[0], method, *call[1:]), calls)
+            return
+
+        pending = self.iter_concurrent(lambda call: self.submit_page(call[0], method, *call[1:]), calls)
+        for call, (future, reused) in zip(calls, pending):
+            record = future.result()
+            if record is not None and self.manifest and not reused:
+                self.manifest.store(call[0], record)
+            yield record
+
+    def crawl(self):
+        """
+        Visit the frontier until it is empty. Pages come level by level in
+        frontier order (see CrawlFrontier.pop_level), each batch goes to the
+        VISITORS method of its page type, which fetches the pages in
+        parallel and pushes the links it finds one level deeper.
+        """
+        while True:
+            level = self.frontier.pop_level()
+            if level is None:
+                return
+            kind, depth, links = level
+            getattr(self, self.VISITORS[kind])(links, depth)
+
+    def admitted_links(self, kind, links):
+        """The links the frontier let through as pages of kind, in order"""
+        return [link for link in links or [] if self.frontier.admitted(kind, link['url'])]
+
+    def prefetch(self, urls):
+        """Batch-resolve titles and revision ids of pages about to be visited"""
+        source = self.api or (self.manifest.api if self.manifest else None)
+        if source:
+            source.prefetch(urls)
+
+    def iter_concurrent(self, func, items):
+        """func over items with the worker pool, results yielded in input order as they are ready"""
+        items = list(items)
+        if self.concurrency <= 1 or len(items) <= 1:
+            for item in items:
+                yield func(item)
+            return
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            yield from pool.map(func, items)
+
+    def map_concurrent(self, func, items):
+        """Run func over items with the worker pool, keeping input order"""
+        return list(self.iter_concurrent(func, items))
+
+    # ====================================================
+    # List pages
+    # ====================================================
+    def category_links(self, soup):
+        """Article links of a category page"""
+        links = []
+        for a in soup.select('a.category-page__member-link'):
+            href = a.get('href')
+            title = a.get_text(strip=True)
+            if href and '/wiki/' in href and ':' not in href:
+                links.append({'title': title, 'url': urljoin(self.base_url, href)})
+        return links
+
+    def section_links(self, soup, heading_keywords):
+        """Article links between an h2/h3 containing one of heading_keywords and the next h2/h3"""
+        links = []
+        content = soup.find('div', {'class': 'mw-parser-output'})
+        if not content:
+            return links
+        for heading in content.find_all(['h2', 'h3']):
+            heading_text = heading.get_text(strip=True).lower()
+            if not any(keyword in heading_text for keyword in heading_keywords):
+                continue
+            current = heading.find_next_sibling()
+            while current and current.name not in ['h2', 'h3']:
+                for a in current.find_all('a', href=True):
+                    href = a['href']
+                    title = a.get_text(strip=True)
+                    if href.startswith('/wiki/') and ':' not in href and len(title) > 2:
+                        links.append({'title': title, 'url': urljoin(self.base_url, href)})
+                current = current.find_next_sibling()
+        return links
+
+    def unique_links(self, links):
+        """Links without repeated URLs, first occurrence kept"""
+        seen = set()
+        unique = []
+        for item in links:
+            if item['url'] not in seen:
+                seen.add(item['url'])
+                unique.append(item)
+        return unique
+
+    # ====================================================
+    # Extract
+    # ====================================================
+    def extract_from_infobox(self, page, label_keywords):
+        """Extract value from infobox by label keywords, link text first"""
+        return page.infobox_value(label_keywords, prefer_link=True)
+
+    def extract_fields(self, page):
+        """Every field of FIELDS, in spec order"""
+        fields = {}
+        for field in self.FIELDS:
+            label = '+'.join(field.name) if isinstance(field.name, tuple) else field.name
+            with self.metrics.timer('extract_seconds', field=label):
+                value = field.extract(self, page)
+            if isinstance(field.name, tuple):
+                for name in field.name:
+                    fields[name] = value[name]
+            else:
+                fields[field.name] = value
+        return fields
+
+    def scrape_page(self, url, method, *args):
+        """self.method(page, *args) for the page at url, from the manifest if its revision is unchanged"""
+        if self.manifest:
+            record = self.manifest.lookup(url)
+            if record is not None:
+                return record
+
+        record = self.parse_page(url, method, *args, fresh=self.fresh_for_manifest())
+        if record is None:
+            return None
+        if self.manifest:
+            self.manifest.store(url, record)
+        return record
+
+    def fresh_for_manifest(self):
+        """
+        True when a page not served from the manifest (never seen, or changed
+        since) must skip the HTTP cache: its record is stored under the
+        current revision id, so it must not be extracted from an older copy.
+        """
+        return self.manifest is not None
+
+    def extract_character_description(self, page):
+        """Pick the first paragraph that is not a voice actor list"""
+        for text in page.paragraphs:
+            # Skip paragraf pendek
+            if len(text) < 50:
+                continue
+
+            # Skip jika hanya berisi voice actor (banyak tanda kurung dan comma)
+            # Pattern: "Name1 (Language), Name2 (Language), Name3 (Language)"
+            parentheses_count = text.count('(')
+            comma_count = text.count(',')
+            if parentheses_count >= 2 and comma_count >= 2 and len(text) < 200:
+                continue
+
+            # Jika mengandung kata kunci voice actor -> skip
+            if any(keyword in text for keyword in self.VOICE_KEYWORDS) and len(text) < 200:
+                continue
+
+            # Ini kemungkinan besar deskripsi karakter yang benar
+            return text[:600]
+
+        return None
+
+
+def request_rate(text):
+    """--rate value, requests per second above 0 (argparse reports anything else with parser.error)"""
+    rate = float(text)
+    if not rate > 0:
+        raise argparse.ArgumentTypeError(f"must be more than 0, got {text}")
+    return rate
+
+
+def make_fetcher(rate=2.0, cache=None, pool_size=1):
+    """Fetcher over a keep-alive session with connections for pool_size threads fetching at once"""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, pool_size))
+    session.mount('https://', adapter)
+    return Fetcher(session, RateLimiter(rate=rate), cache)
+
+
+def add_crawl_arguments(parser):
+    """Register the --concurrency and --rate command line options shared by the scrapers"""
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help="number of pages fetched in parallel (default: 1)")
+    parser.add_argument('--rate', type=request_rate, default=2.0,
+                        help="max requests per second toward the wiki (default: 2.0)")
@@ -0,0 +1,129 @@
+from functools import cached_property
+
+
+class WikiPage:
+    """
+    A fandom wiki page parsed once and indexed for the extractors.
+
+    The infobox is read into an ordered list of (label, value element, value
+    text), the article body into a heading -> section map, and paragraph
+    texts are computed lazily the first time they are used.
+    """
+
+    def __init__(self, soup):
+        self.soup = soup
+        self.infobox_el = soup.find('aside', {'class': 'portable-infobox'})
+        self.content = soup.find('div', {'class': 'mw-parser-output'})
+
+        self.infobox_items = []
+        if self.infobox_el:
+            for item in self.infobox_el.select('.pi-item'):
+                label = item.find(class_='pi-data-label')
+                val = item.find(class_='pi-data-value')
+                if label and val:
+                    label_text = label.get_text(strip=True).lower()
+                    value_text = val.get_text(" ", strip=True)
+                    self.infobox_items.append((label_text, val, value_text))
+
+    @cached_property
+    def infobox_image(self):
+        if not self.infobox_el:
+            return None
+        img = self.infobox_el.find('img')
+        return img['src'] if img and img.get('src') else None
+
+    def infobox_lookup(self, label_keywords):
+        """Return (value element, value text) of the first label containing a keyword"""
+        for label_text, val, value_text in self.infobox_items:
+            if any(keyword in label_text for keyword in label_keywords):
+                return val, value_text
+        return None, None
+
+    def infobox_value(self, label_keywords, prefer_link=False):
+        """Value of the first matching infobox item, optionally the text of its first link"""
+        val, value_text = self.infobox_lookup(label_keywords)
+        if val is None:
+            return None
+        if prefer_link:
+            link = val.find('a')
+            if link:
+                return link.get_text(strip=True)
+        return value_text
+
+    def infobox_values(self, label_keywords):
+        """Texts of every infobox item whose label contains a keyword"""
+        return [
+            value_text for label_text, _, value_text in self.infobox_items
+            if any(keyword in label_text for keyword in label_keywords)
+        ]
+
+    @cached_property
+    def paragraphs(self):
+        """Texts of the top-level paragraphs of the article"""
+        if not self.content:
+            return []
+        return [p.get_text(" ", strip=True) for p in self.content.find_all('p', recursive=False)]
+
+    @cached_property
+    def headings(self):
+        """(headline id, lowercased headline text, h2) for every h2 with a headline"""
+        if not self.content:
+            return []
+        result = []
+        for h2 in self.content.find_all('h2'):
+            span = h2.find('span', class_='mw-headline')
+            if span:
+                result.append((span.get('id') or '', span.get_text(strip=True).lower(), h2))
+        return result
+
+    @cached_property
+    def sections(self):
+        """Heading id -> tags between that h2 and the next h2/h1"""
+        sections = {}
+        for heading_id, _, h2 in self.headings:
+            if heading_id in sections:
+                continue
+            elements = []
+            current = h2.find_next_sibling()
+            while current and current.name not in ['h2', 'h1']:
+                elements.append(current)
+                current = current.find_next_sibling()
+            sections[heading_id] = elements
+        return sections
+
+    def find_section(self, ids=None, keywords=None, title_keywords=None):
+        """
+        Tags of the first section whose heading id is in ids, whose id or title
+        contains one of keywords, or whose title contains one of title_keywords.
+        Returns None when there is no match.
+        """
+        for heading_id, heading_text, _ in self.headings:
+            if ids is not None and heading_id in ids:
+                return self.sections[heading_id]
+            if keywords is not None and any(
+                keyword in heading_id.lower() or keyword in heading_text for keyword in keywords
+            ):
+                return self.sections[heading_id]
+            if title_keywords is not None and any(keyword in heading_text for keyword in title_keywords):
+                return self.sections[heading_id]
+        return None
+
+    def section_paragraphs(self, elements, min_length=0, limit=None):
+        """Texts of the paragraphs of a section longer than min_length"""
+        parts = []
+        for el in elements or []:
+            if limit is not None and len(parts) >= limit:
+                break
+            if el.name == 'p':
+                text = el.get_text(" ", strip=True)
+                if len(text) > min_length:
+                    parts.append(text)
+        return parts
+
+    @cached_property
+    def categories(self):
+        """Texts of the links in the category bar"""
+        catlinks = self.soup.find('div', {'id': 'mw-normal-catlinks'})
+        if not catlinks:
+            return []
+        return [link.get_text(strip=True) for link in catlinks.find_all('a')]
@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, 'data')
+sys.path.insert(0, os.path.join(ROOT, 'scraper'))
+
+from json_to_rdf import FORMATS, GhibliRDFConverter  # noqa: E402
+
+
+@pytest.fixture
+def convert(tmp_path):
+    """convert(format, **options) -> output path(s) of the data/ JSON files in that RDF format"""
+    def run(fmt, name='ghibli-dataset', **options):
+        converter = GhibliRDFConverter(*(os.path.join(DATA_DIR, f) for f in ('films.json', 'series.json', 'shorts.json')))
+        return converter.convert_all(str(tmp_path / (name + FORMATS[fmt][1])), format=fmt, **options)
+    return run
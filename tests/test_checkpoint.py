@@ -0,0 +1,62 @@
+import json
+
+from checkpoint import CrawlCheckpoint
+
+LINKS = [{'title': name, 'url': f'https://wiki/{name}'} for name in ('Totoro', 'Ponyo', 'Kiki')]
+
+
+def frontier_file(checkpoint):
+    with open(checkpoint.frontier_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_resume_serves_finished_units(tmp_path):
+    out = str(tmp_path / 'films.json')
+    checkpoint = CrawlCheckpoint(out)
+    checkpoint.set_links(LINKS)
+    checkpoint.record('movie', LINKS[0]['url'], {'fields': {'year': 1988}})
+    checkpoint.record('character', 'https://wiki/Mei', {'description': 'Mei'})
+    checkpoint.journal.close()
+
+    resumed = CrawlCheckpoint(out, resume=True)
+    assert resumed.links == LINKS
+    assert resumed.get('movie', LINKS[0]['url']) == {'fields': {'year': 1988}}
+    assert resumed.get('character', 'https://wiki/Mei') == {'description': 'Mei'}
+    assert resumed.get('movie', LINKS[1]['url']) is None
+    assert resumed.pending == {LINKS[1]['url'], LINKS[2]['url']}
+
+
+def test_cut_off_last_line_is_skipped(tmp_path):
+    out = str(tmp_path / 'films.json')
+    checkpoint = CrawlCheckpoint(out)
+    checkpoint.record('movie', LINKS[0]['url'], {'fields': {}})
+    checkpoint.journal.write('{"kind": "movie", "ke')
+    checkpoint.journal.close()
+    assert CrawlCheckpoint(out, resume=True).units == {('movie', LINKS[0]['url']): {'fields': {}}}
+
+
+def test_frontier_file_is_rewritten_on_an_interval(tmp_path):
+    checkpoint = CrawlCheckpoint(str(tmp_path / 'films.json'))
+    checkpoint.FRONTIER_INTERVAL = 3600
+    checkpoint.set_links(LINKS)
+    checkpoint.record('movie', LINKS[0]['url'], {'fields': {}})
+    # Not rewritten yet, resuming recomputes pending from the journal
+    assert frontier_file(checkpoint)['pending'] == [link['url'] for link in LINKS]
+
+    checkpoint.FRONTIER_INTERVAL = 0
+    checkpoint.record('movie', LINKS[2]['url'], {'fields': {}})
+    assert frontier_file(checkpoint) == {'links': LINKS, 'pending': [LINKS[1]['url']]}
+
+
+def test_new_run_and_finish_clear_the_files(tmp_path):
+    out = str(tmp_path / 'films.json')
+    checkpoint = CrawlCheckpoint(out)
+    checkpoint.set_links(LINKS)
+    checkpoint.record('movie', LINKS[0]['url'], {'fields': {}})
+    checkpoint.journal.close()
+
+    fresh = CrawlCheckpoint(out)
+    assert fresh.get('movie', LINKS[0]['url']) is None
+    fresh.finish()
+    assert not tmp_path.joinpath('films.checkpoint.jsonl').exists()
+    assert not tmp_path.joinpath('films.frontier.json').exists()
@@ -0,0 +1,69 @@
+import pytest
+
+from crawl_frontier import CrawlFrontier, parse_budget
+
+
+def link(name):
+    return {'title': name, 'url': f'https://wiki/wiki/{name}'}
+
+
+def drain(frontier):
+    levels = []
+    while True:
+        level = frontier.pop_level()
+        if level is None:
+            return levels
+        kind, depth, links = level
+        levels.append((kind, depth, [l['title'] for l in links]))
+
+
+def test_pops_by_depth_then_type_then_push_order():
+    frontier = CrawlFrontier()
+    frontier.push('director', link('Miyazaki'), depth=2)
+    frontier.push('movie', link('Totoro'))
+    frontier.push('character', link('Mei'), depth=2)
+    frontier.push('movie', link('Ponyo'))
+    frontier.push('character', link('Satsuki'), depth=2)
+    assert drain(frontier) == [
+        ('movie', 1, ['Totoro', 'Ponyo']),
+        ('character', 2, ['Mei', 'Satsuki']),
+        ('director', 2, ['Miyazaki']),
+    ]
+
+
+def test_pop_returns_one_page():
+    frontier = CrawlFrontier()
+    frontier.push('character', link('Mei'), depth=2)
+    frontier.push('movie', link('Totoro'))
+    assert frontier.pop() == ('movie', 1, link('Totoro'))
+    assert frontier.pop() == ('character', 2, link('Mei'))
+    assert frontier.pop() is None
+
+
+def test_urls_are_queued_once_per_type_by_canonical_url():
+    frontier = CrawlFrontier()
+    assert frontier.push('character', {'title': 'Kiki', 'url': "https://wiki/wiki/Kiki's_Cat"}, depth=2)
+    assert not frontier.push('character', {'title': 'Kiki', 'url': 'https://wiki/wiki/Kiki%27s_Cat#Bio'}, depth=2)
+    assert frontier.push('movie', {'title': 'Kiki', 'url': "https://wiki/wiki/Kiki's_Cat"})
+    assert [(kind, len(links)) for kind, _, links in drain(frontier)] == [('movie', 1), ('character', 1)]
+    assert frontier.admitted('character', 'https://wiki/wiki/Kiki%27s_Cat')
+
+
+def test_budgets_go_to_the_pages_popped_first():
+    frontier = CrawlFrontier(max_pages=3, budgets={'character': 1})
+    for name in ('Totoro', 'Ponyo'):
+        frontier.push('movie', link(name))
+    frontier.push('director', link('Miyazaki'), depth=2)
+    frontier.push('character', link('Mei'), depth=2)
+    frontier.push('character', link('Sosuke'), depth=2)
+    assert drain(frontier) == [('movie', 1, ['Totoro', 'Ponyo']), ('character', 2, ['Mei'])]
+    assert not frontier.admitted('character', link('Sosuke')['url'])
+    assert not frontier.admitted('director', link('Miyazaki')['url'])
+    assert frontier.summary() == "3 pages admitted (1 character, 2 movie), 2 over budget"
+
+
+def test_parse_budget():
+    assert parse_budget('character=200') == ('character', 200)
+    for text in ('staff=3', 'character', 'character=-1'):
+        with pytest.raises(ValueError):
+            parse_budget(text)
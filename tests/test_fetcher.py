@@ -0,0 +1,131 @@
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from fetcher import CircuitBreaker, FetchError, Fetcher
+from rate_limiter import RateLimiter
+
+
+class Response:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+
+class Session:
+    """Answers every GET with the next response of the list (the last one repeats)"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls += 1
+        return self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+
+class Clock:
+    """time.monotonic/time.sleep of the fetcher module, only moving when something sleeps"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr('fetcher.time', SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep,
+                                                        perf_counter=time.perf_counter, time=time.time))
+    return clock
+
+
+def make_fetcher(session, **kwargs):
+    return Fetcher(session, RateLimiter(rate=1e9), **kwargs)
+
+
+def test_retry_after_seconds_are_waited(clock):
+    session = Session(Response(429, headers={'Retry-After': '7'}), Response(200, b'ok'))
+    fetcher = make_fetcher(session)
+    assert fetcher.fetch('https://wiki/a') == b'ok'
+    assert clock.sleeps == [7.0]
+    assert fetcher.metrics.counter('fetch_retries_total') == 1
+
+
+def test_retry_after_is_capped_by_max_backoff(clock):
+    session = Session(Response(503, headers={'Retry-After': '3600'}), Response(200, b'ok'))
+    assert make_fetcher(session, max_backoff=60.0).fetch('https://wiki/a') == b'ok'
+    assert clock.sleeps == [60.0]
+
+
+def test_retry_after_http_date():
+    fetcher = make_fetcher(Session(Response(200)))
+    delay = fetcher.retry_after(Response(429, headers={'Retry-After': formatdate(time.time() + 30, usegmt=True)}))
+    assert 25 <= delay <= 30
+    assert fetcher.retry_after(Response(429, headers={'Retry-After': 'soon'})) is None
+
+
+def test_failures_are_reported_but_missing_pages_are_not(clock):
+    fetcher = make_fetcher(Session(Response(500)), retries=2)
+    with pytest.raises(FetchError):
+        fetcher.fetch('https://wiki/down')
+    missing = make_fetcher(Session(Response(404)))
+    with pytest.raises(requests.HTTPError):
+        missing.fetch('https://wiki/missing')
+    assert [f['url'] for f in fetcher.failed_report()] == ['https://wiki/down']
+    assert fetcher.failure('https://wiki/down').startswith('gave up after 3 attempts')
+    assert missing.failed_report() == []
+
+
+def test_circuit_breaker_pauses_host_after_threshold(clock):
+    breaker = CircuitBreaker(threshold=2, cooldown=30.0)
+    breaker.failure('wiki')
+    breaker.wait('wiki')
+    assert clock.sleeps == []
+    breaker.failure('wiki')
+    breaker.wait('wiki')
+    assert clock.sleeps == [30.0]
+    # Other hosts are not paused
+    breaker.wait('other')
+    assert clock.sleeps == [30.0]
+
+
+def test_circuit_breaker_success_resets_the_count(clock):
+    breaker = CircuitBreaker(threshold=2, cooldown=30.0)
+    breaker.failure('wiki')
+    breaker.success('wiki')
+    breaker.failure('wiki')
+    breaker.wait('wiki')
+    assert clock.sleeps == []
+
+
+def test_fetcher_waits_for_the_open_circuit(clock, monkeypatch):
+    monkeypatch.setattr('fetcher.random.uniform', lambda low, high: 0.0)
+    session = Session(Response(502), Response(502), Response(200, b'ok'))
+    fetcher = make_fetcher(session, breaker=CircuitBreaker(threshold=2, cooldown=30.0))
+    assert fetcher.fetch('https://wiki/a') == b'ok'
+    assert session.calls == 3
+    assert 30.0 in clock.sleeps
+
+
+def test_shared_urls_are_fetched_once():
+    session = Session(Response(200, b'list'))
+    fetcher = make_fetcher(session)
+    fetcher.share(['https://wiki/list'])
+    assert fetcher.fetch('https://wiki/list') == fetcher.fetch('https://wiki/list') == b'list'
+    assert session.calls == 1
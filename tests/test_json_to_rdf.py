@@ -0,0 +1,31 @@
+import glob
+import os
+
+GOLDEN_TURTLE = os.path.join(os.path.dirname(__file__), 'golden', 'ghibli-dataset.ttl')
+
+
+def read_lines(*paths):
+    lines = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            lines.extend(f)
+    return lines
+
+
+def test_turtle_output_unchanged(convert):
+    # The timestamp line is the only one that changes between runs
+    lines = [line for line in read_lines(convert('turtle')) if not line.startswith('# Generated:')]
+    assert lines == read_lines(GOLDEN_TURTLE)
+
+
+def test_sharded_ntriples_equal_single_file(convert):
+    single = read_lines(convert('ntriples', name='single'))
+    shards = convert('ntriples', name='sharded', shards=3)
+    assert len(shards) == 3
+    assert sorted(glob.glob(os.path.join(os.path.dirname(shards[0]), 'sharded.part-*.nt'))) == shards
+    assert sorted(read_lines(*shards)) == sorted(single)
+
+
+def test_worker_processes_keep_the_output(convert):
+    single = read_lines(convert('ntriples', name='single'))
+    assert read_lines(convert('ntriples', name='workers', workers=2)) == single
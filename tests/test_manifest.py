@@ -0,0 +1,67 @@
+import json
+
+from manifest import RevisionManifest
+
+
+class Revisions:
+    """MediaWikiSource stand-in: page title -> revision id"""
+
+    def __init__(self, **revids):
+        self.revids = revids
+
+    def title_from_url(self, url):
+        return url.rsplit('/', 1)[-1]
+
+    def page_info(self, title):
+        if title not in self.revids:
+            return {'missing': True}
+        return {'revid': self.revids[title], 'timestamp': '2024-01-01T00:00:00Z'}
+
+
+def test_unchanged_pages_are_served_from_the_manifest(tmp_path):
+    path = str(tmp_path / 'films.manifest.json')
+    manifest = RevisionManifest(path, Revisions(Totoro=1))
+    manifest.store('https://wiki/Totoro', {'fields': {'year': 1988}})
+    manifest.save()
+
+    again = RevisionManifest(path, Revisions(Totoro=1))
+    record = again.lookup('https://wiki/Totoro')
+    assert record == {'fields': {'year': 1988}}
+    # Callers get a copy, the stored record stays as extracted
+    record['fields']['year'] = 0
+    assert again.lookup('https://wiki/Totoro') == {'fields': {'year': 1988}}
+    assert again.reused == 2
+
+
+def test_changed_pages_are_extracted_again(tmp_path):
+    path = str(tmp_path / 'films.manifest.json')
+    manifest = RevisionManifest(path, Revisions(Totoro=1))
+    manifest.store('https://wiki/Totoro', {'fields': {}})
+    manifest.save()
+
+    again = RevisionManifest(path, Revisions(Totoro=2))
+    assert again.lookup('https://wiki/Totoro') is None
+    assert again.lookup('https://wiki/Unknown') is None
+    # The refetch failed: the old entry is kept so the next run retries it
+    again.save()
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['pages']['https://wiki/Totoro']['revid'] == 1
+
+
+def test_save_drops_pages_not_used_in_the_run(tmp_path):
+    path = str(tmp_path / 'films.manifest.json')
+    manifest = RevisionManifest(path, Revisions(Totoro=1, Ponyo=1))
+    manifest.store('https://wiki/Totoro', {'fields': {}})
+    manifest.store('https://wiki/Ponyo', {'fields': {}})
+    manifest.store('https://wiki/Missing', {'fields': {}})
+    manifest.save()
+
+    again = RevisionManifest(path, Revisions(Totoro=1, Ponyo=1))
+    assert again.lookup('https://wiki/Ponyo') is not None
+    again.save()
+    with open(path, encoding='utf-8') as f:
+        assert list(json.load(f)['pages']) == ['https://wiki/Ponyo']
+
+
+def test_path_for():
+    assert RevisionManifest.path_for('../data/films.json') == '../data/films.manifest.json'
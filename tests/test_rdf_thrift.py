@@ -0,0 +1,68 @@
+import gzip
+import re
+
+import rdf_thrift
+
+NT_LINE = re.compile(r'^<([^>]*)> <([^>]*)> (.*) \.$')
+NT_LITERAL = re.compile(r'^"(.*)"(?:\^\^<([^>]*)>)?$')
+NT_ESCAPE = re.compile(r'\\(.)')
+XSD_INTEGER = 'http://www.w3.org/2001/XMLSchema#integer'
+
+
+def nt_triples(path):
+    """(s, p, o) of every N-Triples line, literals as (lex, datatype)"""
+    triples = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            s, p, o = NT_LINE.match(line.rstrip('\n')).groups()
+            if o.startswith('<'):
+                o = o[1:-1]
+            else:
+                lex, datatype = NT_LITERAL.match(o).groups()
+                o = (NT_ESCAPE.sub(lambda m: {'n': '\n', 'r': '\r'}.get(m.group(1), m.group(1)), lex), datatype)
+            triples.append((s, p, o))
+    return sorted(triples, key=repr)
+
+
+def thrift_triples(path):
+    """(s, p, o) of every triple row, prefixed names expanded with the prefix rows"""
+    with gzip.open(path, 'rb') as f:
+        rows = list(rdf_thrift.read_rows(f.read()))
+    prefixes = {}
+
+    def term(value):
+        if rdf_thrift.TERM_IRI in value:
+            return value[rdf_thrift.TERM_IRI][1]
+        if rdf_thrift.TERM_PREFIX_NAME in value:
+            name = value[rdf_thrift.TERM_PREFIX_NAME]
+            return prefixes[name[1]] + name[2]
+        if rdf_thrift.TERM_INTEGER in value:
+            return (str(value[rdf_thrift.TERM_INTEGER]), XSD_INTEGER)
+        literal = value[rdf_thrift.TERM_LITERAL]
+        return (literal[1], literal.get(3))
+
+    triples = []
+    for row in rows:
+        if rdf_thrift.ROW_PREFIX in row:
+            prefixes[row[rdf_thrift.ROW_PREFIX][1]] = row[rdf_thrift.ROW_PREFIX][2]
+        else:
+            triple = row[rdf_thrift.ROW_TRIPLE]
+            triples.append((term(triple[1]), term(triple[2]), term(triple[3])))
+    return sorted(triples, key=repr)
+
+
+def test_thrift_round_trip_matches_ntriples(convert):
+    ntriples = nt_triples(convert('ntriples'))
+    assert ntriples
+    assert thrift_triples(convert('thrift')) == ntriples
+
+
+def test_read_rows_decodes_every_term_kind():
+    data = rdf_thrift.prefix_row('ex', 'http://example.org/') + rdf_thrift.triple_row(
+        rdf_thrift.prefix_name('ex', 'a'), rdf_thrift.iri('http://example.org/p'), rdf_thrift.integer(-42))
+    data += rdf_thrift.triple_row(rdf_thrift.iri('http://example.org/a'), rdf_thrift.iri('http://example.org/q'),
+                                  rdf_thrift.literal('Totoro\n"x"', 'http://example.org/dt'))
+    rows = list(rdf_thrift.read_rows(data))
+    assert rows[0] == {1: {1: 'ex', 2: 'http://example.org/'}}
+    assert rows[1] == {2: {1: {4: {1: 'ex', 2: 'a'}}, 2: {1: {1: 'http://example.org/p'}}, 3: {10: -42}}}
+    assert rows[2][2][3] == {3: {1: 'Totoro\n"x"', 3: 'http://example.org/dt'}}
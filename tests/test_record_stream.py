@@ -0,0 +1,65 @@
+import json
+
+from record_stream import JSONArrayReader, RecordStream, read_records
+
+
+def test_merge_builds_the_json_from_the_streams(tmp_path):
+    out = str(tmp_path / 'shorts.json')
+    stream = RecordStream(out)
+    stream.open('failed_urls')
+    stream.emit('shorts', {'title': 'Mei and the Kittenbus', 'year': 2002})
+    stream.emit('shorts', {'title': 'Koro', 'year': 2002})
+    stream.merge(['shorts', 'failed_urls'])
+    with open(out, encoding='utf-8') as f:
+        assert json.load(f) == {
+            'shorts': [{'title': 'Mei and the Kittenbus', 'year': 2002}, {'title': 'Koro', 'year': 2002}],
+            'failed_urls': [],
+        }
+
+
+def test_patches_are_applied_by_key(tmp_path):
+    out = str(tmp_path / 'films.json')
+    stream = RecordStream(out)
+    stream.emit('movies', {'title': 'Totoro', 'url': 'u1', 'characters': [{'name': 'Mei', 'url': 'c1'}]})
+    stream.emit('movies', {'title': 'Ponyo', 'url': 'u2', 'characters': []})
+    stream.patch('movies', {'url': 'u1', 'characters': [{'name': 'Mei', 'url': 'c1', 'appears_in': ['Totoro']}]})
+    stream.merge(['movies'])
+    with open(out, encoding='utf-8') as f:
+        movies = json.load(f)['movies']
+    assert movies == [
+        {'title': 'Totoro', 'url': 'u1', 'characters': [{'name': 'Mei', 'url': 'c1', 'appears_in': ['Totoro']}]},
+        {'title': 'Ponyo', 'url': 'u2', 'characters': []},
+    ]
+
+
+def test_patches_of_an_earlier_run_are_ignored(tmp_path):
+    out = str(tmp_path / 'films.json')
+    tmp_path.joinpath('films.movies.patch.jsonl').write_text('{"url":"u1","title":"Stale"}\n', encoding='utf-8')
+    stream = RecordStream(out)
+    stream.emit('movies', {'title': 'Totoro', 'url': 'u1'})
+    stream.merge(['movies'])
+    with open(out, encoding='utf-8') as f:
+        assert json.load(f) == {'movies': [{'title': 'Totoro', 'url': 'u1'}]}
+
+
+def test_read_records_from_stream_then_json(tmp_path):
+    out = str(tmp_path / 'series.json')
+    stream = RecordStream(out)
+    stream.emit('series', {'title': 'Ronja'})
+    # Crawl still running: read from the .jsonl stream
+    assert list(read_records(out, 'series')) == [{'title': 'Ronja'}]
+    stream.merge(['series', 'characters'])
+    assert list(read_records(out, 'series')) == [{'title': 'Ronja'}]
+    assert list(read_records(out, 'characters')) == []
+
+
+def test_array_reader_across_chunk_boundaries(tmp_path, monkeypatch):
+    path = tmp_path / 'films.json'
+    data = {'movies': [{'title': 'Totoro', 'year': 1988, 'rating': 4.25}, {'title': 'Kiki'}],
+            'count': 2, 'characters': [], 'directors': [{'name': 'Miyazaki', 'works': [1, 2.5]}]}
+    path.write_text(json.dumps(data, indent=1), encoding='utf-8')
+    monkeypatch.setattr(JSONArrayReader, 'CHUNK_SIZE', 3)
+    items = list(JSONArrayReader(str(path)).items())
+    assert items == [('movies', data['movies'][0]), ('movies', data['movies'][1]),
+                     ('directors', data['directors'][0])]
+    assert list(JSONArrayReader(str(path)).items(('directors',))) == [('directors', data['directors'][0])]